@@ -0,0 +1,49 @@
+"""Benchmarks the bulk builders against adding items one at a time.
+
+Usage:
+  python -m benchmarks.bench_bulk
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import timeit
+
+from imp.system_verilog.models import datatypes
+from imp.system_verilog.models import modules
+
+
+def main():
+  dtype = datatypes.IntType()
+  print(f"{'params':>8} {'loop (ms)':>10} {'bulk (ms)':>10} {'speedup':>8}")
+  for n in (1_000, 10_000, 50_000):
+    names = [f"p{i}" for i in range(n)]
+    values = list(range(n))
+
+    def loop():
+      m = modules.Module(module_name="loop")
+      for name, value in zip(names, values):
+        m.localparam(name=name, dtype=dtype, value=value)
+
+    def bulk():
+      m = modules.Module(module_name="bulk")
+      m.localparams(names, dtype, values)
+
+    loop_ms = min(timeit.repeat(loop, number=1, repeat=5)) * 1e3
+    bulk_ms = min(timeit.repeat(bulk, number=1, repeat=5)) * 1e3
+    print(f"{n:>8} {loop_ms:>10.1f} {bulk_ms:>10.1f} {loop_ms / bulk_ms:>7.1f}x")
+
+
+if __name__ == '__main__':
+  main()
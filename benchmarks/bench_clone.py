@@ -0,0 +1,60 @@
+"""Benchmarks the memory of derived module variants against rebuilt ones.
+
+Usage:
+  python -m benchmarks.bench_clone
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import time
+import tracemalloc
+
+from benchmarks import workloads
+
+N_VARIANTS = 10_000
+N_PARAMS = 200
+
+
+def build(depth: int, name: str = "mem"):
+  return workloads.parameterized_memory(depth, 8, n_constants=N_PARAMS, name=name)
+
+
+def measure(fn):
+  tracemalloc.start()
+  start = time.perf_counter()
+  result = fn()
+  elapsed = time.perf_counter() - start
+  current, _ = tracemalloc.get_traced_memory()
+  tracemalloc.stop()
+  del result
+  return elapsed, current
+
+
+def main():
+  template = build(4)
+  variants = {
+      "rebuild": lambda: [build(i, f"mem{i}") for i in range(N_VARIANTS)],
+      "clone": lambda: [template.clone() for _ in range(N_VARIANTS)],
+      "derive": lambda: [template.derive(f"mem{i}", {"depth": i}) for i in range(N_VARIANTS)],
+  }
+  print(f"{N_VARIANTS} variants of a module with {N_PARAMS + 3} localparams")
+  print(f"{'':>8} {'time (s)':>9} {'MiB':>8} {'KiB/variant':>12}")
+  for name, fn in variants.items():
+    elapsed, size = measure(fn)
+    print(f"{name:>8} {elapsed:>9.2f} {size / 2**20:>8.1f} {size / 1024 / N_VARIANTS:>12.2f}")
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,62 @@
+"""Benchmarks the memory used per component for 1M ports.
+
+Usage:
+  python -m benchmarks.bench_components
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import gc
+import tracemalloc
+
+from imp.base.models import signals
+from imp.system_verilog.models import datatypes
+
+NUM_PORTS = 1_000_000
+
+
+class DictPort:
+  """A dict-backed port, laid out like signals.Port before using __slots__."""
+
+  def __init__(self, name, dtype, direction):
+    self.parent = None
+    self.name = name
+    self.dtype = dtype
+    self.direction = direction
+
+
+def bytes_per_item(cls, names, dtype) -> float:
+  gc.collect()
+  tracemalloc.start()
+  ports = [cls(name, dtype, signals.Direction.INPUT) for name in names]
+  current, _ = tracemalloc.get_traced_memory()
+  tracemalloc.stop()
+  # Exclude the list holding the ports.
+  return (current - ports.__sizeof__()) / len(ports)
+
+
+def main():
+  names = [f"p{i}" for i in range(NUM_PORTS)]
+  dtype = datatypes.IntType()
+
+  before = bytes_per_item(DictPort, names, dtype)
+  after = bytes_per_item(signals.Port, names, dtype)
+  print(f"ports:                 {NUM_PORTS}")
+  print(f"dict-backed (B/port):  {before:.0f}")
+  print(f"slots (B/port):        {after:.0f}")
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,59 @@
+"""Benchmarks Container.items and membership tests against the tree size.
+
+Usage:
+  python -m benchmarks.bench_container
+
+Also measures building and holding hierarchies of the same number of items
+at increasing depths, whose views are kept by the outermost container.
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import timeit
+import tracemalloc
+
+from benchmarks import workloads
+
+
+def main():
+  print(f"{'items':>8} {'build (s)':>10} {'items (us)':>11} {'in (us)':>9}")
+  for n in (1_000, 10_000, 100_000):
+    start = timeit.default_timer()
+    m, = workloads.blocked_module(n)
+    build = timeit.default_timer() - start
+
+    last = m.items[-1]
+    number = 10_000
+    items_us = timeit.timeit(lambda: m.items, number=number) / number * 1e6
+    in_us = timeit.timeit(lambda: last in m, number=number) / number * 1e6
+    print(f"{n:>8} {build:>10.3f} {items_us:>11.3f} {in_us:>9.3f}")
+
+  print()
+  print(f"{'depth':>8} {'width':>6} {'build (s)':>10} {'MiB':>6} {'items (us)':>11}")
+  for depth, width in ((1, 4_000), (10, 400), (100, 40), (1_000, 4)):
+    tracemalloc.start()
+    start = timeit.default_timer()
+    m, = workloads.deep_hierarchy(depth=depth, width=width)
+    build = timeit.default_timer() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    number = 10_000
+    items_us = timeit.timeit(lambda: m.items, number=number) / number * 1e6
+    print(f"{depth:>8} {width:>6} {build:>10.3f} {size / 2**20:>6.1f} {items_us:>11.3f}")
+
+
+if __name__ == '__main__':
+  main()
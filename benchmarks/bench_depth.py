@@ -0,0 +1,49 @@
+"""Benchmarks per-token tokenizer cost against the hierarchy depth.
+
+Usage:
+  python -m benchmarks.bench_depth
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import timeit
+
+from benchmarks import workloads
+from imp.system_verilog.writers import systemverilog_tokenizer
+
+NUM_COMMENTS = 20_000
+
+
+def main():
+  tokenizers = {
+    "recursive": systemverilog_tokenizer.SystemVerilogTokenizer(),
+    "iterative": systemverilog_tokenizer.IterativeSystemVerilogTokenizer(),
+  }
+
+  print(f"{'depth':>6} {'driver':>10} {'ns/token':>9}")
+  for depth in (1, 100, 500):
+    m, = workloads.nested_comments(depth, NUM_COMMENTS)
+    for name, tokenizer in tokenizers.items():
+      try:
+        num_tokens = sum(1 for _ in tokenizer.tokenize(m))
+        seconds = min(timeit.repeat(lambda: sum(1 for _ in tokenizer.tokenize(m)), number=1, repeat=3))
+      except RecursionError:
+        print(f"{depth:>6} {name:>10} RecursionError")
+        continue
+      print(f"{depth:>6} {name:>10} {seconds / num_tokens * 1e9:>9.0f}")
+
+
+if __name__ == '__main__':
+  main()
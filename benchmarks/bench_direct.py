@@ -0,0 +1,43 @@
+"""Benchmarks direct emission against formatting tokens.
+
+Usage:
+  python -m benchmarks.bench_direct
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import timeit
+
+from benchmarks import workloads
+from imp.system_verilog.writers import systemverilog_writer
+
+
+def main():
+  token_writer = systemverilog_writer.SystemVerilogWriter()
+  direct_writer = systemverilog_writer.SystemVerilogWriter(direct=True)
+
+  print(f"{'items':>8} {'tokens (ms)':>12} {'direct (ms)':>12} {'speedup':>8}")
+  for n in (1_000, 10_000, 100_000):
+    m, = workloads.sectioned_module(n, comment_each=True)
+    assert direct_writer.get_text_for(m) == token_writer.get_text_for(m)
+
+    number = 3
+    tokens_ms = timeit.timeit(lambda: token_writer.get_text_for(m), number=number) / number * 1e3
+    direct_ms = timeit.timeit(lambda: direct_writer.get_text_for(m), number=number) / number * 1e3
+    print(f"{n:>8} {tokens_ms:>12.1f} {direct_ms:>12.1f} {tokens_ms / direct_ms:>7.1f}x")
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,63 @@
+"""Benchmarks SystemVerilogTokenizer dispatch against the number of handlers.
+
+Usage:
+  python -m benchmarks.bench_dispatch
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import timeit
+
+from imp.base.models import comments
+from imp.base.models import component
+from imp.base.writers.model_tokenizer import tokenizer_for
+from imp.system_verilog.writers import systemverilog_tokenizer
+
+
+def make_handlers(n: int):
+  """Returns n tokenizer functions for unrelated component classes."""
+  handlers = []
+  for i in range(n):
+    cls = type(f"Unused{i}", (component.Component,), {})
+
+    @tokenizer_for(cls)
+    def handler(target, tokenize):
+      yield from ()
+
+    handlers.append(handler)
+  return handlers
+
+
+def main():
+  items = [comments.Comment(f"c{i}") for i in range(1_000)]
+
+  print(f"{'handlers':>8} {'ns/node':>8}")
+  for n in (0, 10, 100, 1_000):
+    # The Comment tokenizer has the lowest priority, so it is matched last.
+    tokenizer = systemverilog_tokenizer.SystemVerilogTokenizer(
+        tokenizer_functions=systemverilog_tokenizer._DEFAULT_TOKENIZER_FUNCTIONS + tuple(make_handlers(n)))
+
+    def run():
+      for item in items:
+        for _ in tokenizer.tokenize(item):
+          pass
+
+    number = 100
+    ns = timeit.timeit(run, number=number) / (number * len(items)) * 1e9
+    print(f"{n:>8} {ns:>8.1f}")
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,44 @@
+"""Benchmarks Formatter throughput in tokens per second.
+
+Usage:
+  python -m benchmarks.bench_formatter
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import timeit
+
+from benchmarks import workloads
+from imp.base.writers import formatter
+from imp.system_verilog.writers import systemverilog_tokenizer
+
+
+def main():
+  # 50k localparams, each in a section opened by a banner.
+  m, = workloads.sectioned_module(50_000, section=1)
+  all_tokens = list(systemverilog_tokenizer.SystemVerilogTokenizer().tokenize(m))
+  fmt = formatter.Formatter()
+
+  def run():
+    fmt.reset()
+    fmt.process_tokens(all_tokens)
+
+  seconds = min(timeit.repeat(run, number=1, repeat=5))
+  print(f"tokens:    {len(all_tokens)}")
+  print(f"tokens/s:  {len(all_tokens) / seconds:,.0f}")
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,47 @@
+"""Benchmarks the overhead of Instrumentation, and prints its summary.
+
+Usage:
+  python -m benchmarks.bench_instrumentation [trace.json]
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import sys
+import timeit
+
+from benchmarks import workloads
+from imp.base.writers import instrumentation
+from imp.system_verilog.writers import systemverilog_writer
+
+
+def main():
+  m, = workloads.sectioned_module(10_000, comment_each=True)
+  writer = systemverilog_writer.SystemVerilogWriter()
+  number = 3
+  disabled = timeit.timeit(lambda: writer.get_text_for(m), number=number) / number
+
+  inst = instrumentation.Instrumentation(trace=len(sys.argv) > 1)
+  writer.set_instrumentation(inst)
+  enabled = timeit.timeit(lambda: writer.get_text_for(m), number=number) / number
+
+  print(f"disabled: {disabled * 1e3:.1f} ms  enabled: {enabled * 1e3:.1f} ms")
+  print()
+  print(inst.summary())
+  if len(sys.argv) > 1:
+    inst.write_chrome_trace(sys.argv[1])
+
+
+if __name__ == '__main__':
+  main()
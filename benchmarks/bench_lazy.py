@@ -0,0 +1,71 @@
+"""Benchmarks lazily populated modules against fully built ones.
+
+Usage:
+  python -m benchmarks.bench_lazy
+
+Compares building a design of many modules and writing one of them, and
+writing all of them with and without releasing each module once written.
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import functools
+import time
+import tracemalloc
+
+from benchmarks import workloads
+from imp.system_verilog.writers import systemverilog_writer
+
+N_MODULES = 500
+N_PARAMS = 200
+
+eager_design = functools.partial(workloads.many_modules, N_MODULES, N_PARAMS)
+lazy_design = functools.partial(workloads.many_modules, N_MODULES, N_PARAMS, lazy=True)
+
+
+def measure(fn):
+  tracemalloc.start()
+  start = time.perf_counter()
+  fn()
+  elapsed = time.perf_counter() - start
+  _, peak = tracemalloc.get_traced_memory()
+  tracemalloc.stop()
+  return elapsed, peak
+
+
+def main():
+  writer = systemverilog_writer.SystemVerilogWriter()
+  releasing = systemverilog_writer.SystemVerilogWriter(release=True)
+
+  def write_all(design_fn, writer_):
+    for m in design_fn():
+      writer_.get_text_for(m)
+
+  runs = {
+      "write one, eager": lambda: writer.get_text_for(eager_design()[7]),
+      "write one, lazy": lambda: writer.get_text_for(lazy_design()[7]),
+      "write all, eager": lambda: write_all(eager_design, writer),
+      "write all, lazy": lambda: write_all(lazy_design, writer),
+      "write all, lazy+release": lambda: write_all(lazy_design, releasing),
+  }
+  print(f"{N_MODULES} modules with {N_PARAMS} localparams each")
+  print(f"{'':>24} {'time (s)':>9} {'peak MiB':>9}")
+  for name, fn in runs.items():
+    elapsed, peak = measure(fn)
+    print(f"{name:>24} {elapsed:>9.2f} {peak / 2**20:>9.1f}")
+
+
+if __name__ == '__main__':
+  main()
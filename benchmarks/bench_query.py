@@ -0,0 +1,42 @@
+"""Benchmarks Container.query against filtering iter_items.
+
+Usage:
+  python -m benchmarks.bench_query
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import timeit
+
+from benchmarks import workloads
+from imp.base.models import comments
+
+
+def main():
+  print(f"{'items':>8} {'iter_items (ms)':>16} {'query (ms)':>11}")
+  for n in (1_000, 10_000, 100_000):
+    m, = workloads.sectioned_module(n, comment_each=True)
+    m.query(comments.Banner)
+
+    number = 20
+    filtered = timeit.timeit(
+        lambda: list(m.iter_items(filter_fn=lambda i: isinstance(i, comments.Banner))),
+        number=number) / number * 1e3
+    queried = timeit.timeit(lambda: m.query(comments.Banner), number=number) / number * 1e3
+    print(f"{n:>8} {filtered:>16.3f} {queried:>11.4f}")
+
+
+if __name__ == '__main__':
+  main()
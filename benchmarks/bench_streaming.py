@@ -0,0 +1,50 @@
+"""Benchmarks peak memory of Writer.write_to against the output size.
+
+Usage:
+  python -m benchmarks.bench_streaming
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+import tracemalloc
+
+from benchmarks import workloads
+from imp.system_verilog.writers import systemverilog_writer
+
+
+def main():
+  writer = systemverilog_writer.SystemVerilogWriter()
+
+  print(f"{'items':>8} {'get_text_for (KiB)':>19} {'write_to (KiB)':>15}")
+  for n in (10_000, 100_000):
+    m, = workloads.sectioned_module(n)
+
+    tracemalloc.start()
+    writer.get_text_for(m)
+    _, text_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    with open(os.devnull, "w") as sink:
+      tracemalloc.start()
+      writer.write_to(m, sink)
+      _, stream_peak = tracemalloc.get_traced_memory()
+      tracemalloc.stop()
+
+    print(f"{n:>8} {text_peak / 1024:>19.0f} {stream_peak / 1024:>15.0f}")
+
+
+if __name__ == '__main__':
+  main()
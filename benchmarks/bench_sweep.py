@@ -0,0 +1,54 @@
+"""Benchmarks parameter sweeps against building and writing each variant.
+
+Usage:
+  python -m benchmarks.bench_sweep
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import timeit
+
+from benchmarks import workloads
+from imp.system_verilog.writers import sweep
+from imp.system_verilog.writers import systemverilog_writer
+
+# Localparams besides the swept ones, derived from them.
+N_DERIVED = 50
+
+
+def main():
+  writer = systemverilog_writer.SystemVerilogWriter()
+  print(f"{'variants':>8} {'rebuild (ms)':>12} {'sweep (ms)':>10} {'speedup':>8}")
+  for n in (100, 1_000, 10_000):
+    grid = {"depth": [4 + i % 64 for i in range(n)], "width": [8 + i // 64 for i in range(n)]}
+    points = list(zip(grid["depth"], grid["width"]))
+
+    def rebuild():
+      for d, w in points:
+        writer.get_text_for(workloads.parameterized_memory(d, w, N_DERIVED, name=f"mem_{d}x{w}"))
+
+    def swept():
+      variants = sweep.ParameterSweep(workloads.parameterized_memory(4, 8, N_DERIVED),
+                                      swept=["depth", "width"], folded=["bits"], writer=writer)
+      for _ in variants.texts(grid, name_format="mem_{depth}x{width}"):
+        pass
+
+    rebuild_ms = min(timeit.repeat(rebuild, number=1, repeat=3)) * 1e3
+    sweep_ms = min(timeit.repeat(swept, number=1, repeat=3)) * 1e3
+    print(f"{n:>8} {rebuild_ms:>12.1f} {sweep_ms:>10.1f} {rebuild_ms / sweep_ms:>7.1f}x")
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,66 @@
+"""Benchmarks formatting from Token streams against TokenBuffers.
+
+Usage:
+  python -m benchmarks.bench_token_buffer
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import pickle
+import timeit
+import tracemalloc
+
+from benchmarks import workloads
+from imp.system_verilog.writers import systemverilog_writer
+
+
+def peak_kib(fn) -> float:
+  tracemalloc.start()
+  result = fn()
+  _, peak = tracemalloc.get_traced_memory()
+  tracemalloc.stop()
+  del result
+  return peak / 1024
+
+
+def main():
+  writer = systemverilog_writer.SystemVerilogWriter()
+  m, = workloads.sectioned_module(10_000, comment_each=True)
+  buffer = writer.get_buffer_for(m)
+  assert writer.get_text_for(buffer) == writer.get_text_for(m)
+
+  number = 5
+  results = {
+      "tokens -> text": lambda: writer.get_text_for(m),
+      "tokens -> buffer -> text": lambda: writer.get_text_for(writer.get_buffer_for(m)),
+      "tokens -> buffer": lambda: writer.get_buffer_for(m),
+      "buffer -> text": lambda: writer.get_text_for(buffer),
+  }
+  print(f"{'path':<26} {'ms':>8}")
+  for name, fn in results.items():
+    ms = timeit.timeit(fn, number=number) / number * 1e3
+    print(f"{name:<26} {ms:>8.1f}")
+
+  tokens = list(writer.tokenizer.tokenize(m))
+  print()
+  print(f"{len(tokens)} tokens")
+  print(f"{'list of Tokens (KiB)':<26} {peak_kib(lambda: list(writer.tokenizer.tokenize(m))):>8.0f}")
+  print(f"{'TokenBuffer (KiB)':<26} {peak_kib(lambda: writer.get_buffer_for(m)):>8.0f}")
+  print(f"{'pickled Tokens (KiB)':<26} {len(pickle.dumps(tokens)) / 1024:>8.0f}")
+  print(f"{'pickled buffer (KiB)':<26} {len(pickle.dumps(buffer)) / 1024:>8.0f}")
+
+
+if __name__ == '__main__':
+  main()
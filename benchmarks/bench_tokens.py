@@ -0,0 +1,57 @@
+"""Benchmarks token allocations while tokenizing a module with 100k items.
+
+Usage:
+  python -m benchmarks.bench_tokens
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import timeit
+import tracemalloc
+
+from benchmarks import workloads
+from imp.system_verilog.writers import systemverilog_tokenizer
+
+
+def main():
+  # 50k localparams, each followed by a comment.
+  m, = workloads.sectioned_module(50_000, comment_each=True)
+  tokenizer = systemverilog_tokenizer.SystemVerilogTokenizer()
+
+  start = timeit.default_timer()
+  num_tokens = sum(1 for _ in tokenizer.tokenize(m))
+  elapsed = timeit.default_timer() - start
+
+  # Keep every token alive to measure what a fully materialized stream costs.
+  tracemalloc.start()
+  all_tokens = list(tokenizer.tokenize(m))
+  snapshot = tracemalloc.take_snapshot()
+  _, peak = tracemalloc.get_traced_memory()
+  tracemalloc.stop()
+
+  live_tokens = len({id(t) for t in all_tokens})
+  blocks = sum(stat.count for stat in snapshot.statistics("filename"))
+  print(f"tokens:            {num_tokens}")
+  print(f"distinct objects:  {live_tokens}")
+  print(f"allocated blocks:  {blocks}")
+  print(f"peak (MiB):        {peak / (1 << 20):.1f}")
+  print(f"tokens/s:          {num_tokens / elapsed:,.0f}")
+
+  info = tokenizer.cache_info()
+  print(f"memo hit rate:     {info.hits / max(1, info.hits + info.misses):.1%} ({info})")
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,47 @@
+"""Benchmarks SystemVerilogWriter.write_many against the number of workers.
+
+Usage:
+  python -m benchmarks.bench_write_many
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+import tempfile
+import timeit
+
+from benchmarks import workloads
+from imp.system_verilog.writers import systemverilog_writer
+
+NUM_MODULES = 1_000
+NUM_PARAMS = 500
+
+
+def main():
+  targets = workloads.many_modules(NUM_MODULES, NUM_PARAMS)
+  writer = systemverilog_writer.SystemVerilogWriter()
+  cpus = os.cpu_count() or 1
+
+  print(f"{'workers':>7} {'seconds':>8} {'speedup':>8}")
+  serial = None
+  for workers in sorted({1, 2, 4, cpus}):
+    with tempfile.TemporaryDirectory() as out_dir:
+      seconds = timeit.timeit(lambda: writer.write_many(targets, out_dir, workers=workers), number=1)
+    serial = serial or seconds
+    print(f"{workers:>7} {seconds:>8.2f} {serial / seconds:>8.2f}")
+
+
+if __name__ == '__main__':
+  main()
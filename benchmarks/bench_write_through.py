@@ -0,0 +1,67 @@
+"""Benchmarks building a module while writing it against building it first.
+
+Usage:
+  python -m benchmarks.bench_write_through
+
+Compares the peak memory and time of building a module and then writing it
+with `write_to`, and of building it inside `SystemVerilogWriter.stream`.
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+import time
+import tracemalloc
+
+from benchmarks import workloads
+from imp.system_verilog.models import modules
+from imp.system_verilog.writers import systemverilog_writer
+
+
+def measure(fn):
+  tracemalloc.start()
+  start = time.perf_counter()
+  fn()
+  elapsed = time.perf_counter() - start
+  _, peak = tracemalloc.get_traced_memory()
+  tracemalloc.stop()
+  return elapsed, peak
+
+
+def main():
+  for direct in (False, True):
+    writer = systemverilog_writer.SystemVerilogWriter(direct=direct)
+    print(f"direct={direct}")
+    print(f"{'items':>8} {'built (s)':>10} {'MiB':>7} {'streamed (s)':>13} {'MiB':>7}")
+    for n in (10_000, 100_000):
+      with open(os.devnull, "w") as sink:
+
+        def build_then_write():
+          m = modules.Module(module_name="top")
+          workloads.add_sections(m, n, section=100)
+          writer.write_to(m, sink)
+
+        def stream():
+          with writer.stream("top", sink) as m:
+            workloads.add_sections(m, n, section=100)
+
+        built_time, built_peak = measure(build_then_write)
+        streamed_time, streamed_peak = measure(stream)
+      print(f"{n:>8} {built_time:>10.2f} {built_peak / 2**20:>7.1f} "
+            f"{streamed_time:>13.2f} {streamed_peak / 2**20:>7.1f}")
+
+
+if __name__ == '__main__':
+  main()
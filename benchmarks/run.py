@@ -0,0 +1,178 @@
+"""Runs the benchmark suite, and compares the results against a baseline.
+
+Usage:
+  python -m benchmarks.run [--quick] [--output results.json]
+                           [--baseline benchmarks/baseline.json]
+                           [--threshold 0.25] [--metric-threshold peak_kib=0.1]
+
+For each workload in benchmarks/workloads.py, measures:
+  build_s: Time to build the modules.
+  tokenize_tokens_per_s: Tokenizer throughput.
+  format_tokens_per_s: Formatter throughput, from pre-tokenized input.
+  end_to_end_bytes_per_s: Text produced per second by SystemVerilogWriter.
+  peak_kib: Peak memory allocated while building and writing the modules.
+
+Times are the best of --repeat runs. A metric regresses when it is worse
+than the baseline by more than its threshold, as a fraction of the baseline,
+in which case the exit status is 1. Baselines are specific to a machine;
+regenerate them with --output benchmarks/baseline.json.
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+
+from benchmarks import workloads
+from imp.base.writers.formatter import Formatter
+from imp.system_verilog.writers import systemverilog_writer
+
+# Whether a larger value of each metric is better.
+HIGHER_IS_BETTER = {
+    "build_s": False,
+    "tokenize_tokens_per_s": True,
+    "format_tokens_per_s": True,
+    "end_to_end_bytes_per_s": True,
+    "peak_kib": False,
+}
+
+
+def best_time(fn, repeat: int) -> float:
+  return min(timeit.repeat(fn, number=1, repeat=repeat))
+
+
+def measure(build, repeat: int) -> dict:
+  """Returns the metrics for one workload."""
+  writer = systemverilog_writer.SystemVerilogWriter()
+  tokenizer = writer.tokenizer
+
+  build_s = best_time(build, repeat)
+  mods = build()
+
+  def tokenize():
+    return [token for m in mods for token in tokenizer.tokenize(m)]
+
+  token_lists = [list(tokenizer.tokenize(m)) for m in mods]
+  n_tokens = sum(len(t) for t in token_lists)
+  tokenize_s = best_time(tokenize, repeat)
+
+  def format_tokens():
+    for token_list in token_lists:
+      fmt = Formatter()
+      fmt.process_tokens(token_list)
+      fmt.text
+
+  format_s = best_time(format_tokens, repeat)
+
+  n_bytes = sum(len(writer.get_text_for(m).encode()) for m in mods)
+  end_to_end_s = best_time(lambda: [writer.get_text_for(m) for m in mods], repeat)
+
+  del mods, token_lists
+  tracemalloc.start()
+  texts = [writer.get_text_for(m) for m in build()]
+  _, peak = tracemalloc.get_traced_memory()
+  tracemalloc.stop()
+  del texts
+
+  return {
+      "build_s": build_s,
+      "tokenize_tokens_per_s": n_tokens / tokenize_s,
+      "format_tokens_per_s": n_tokens / format_s,
+      "end_to_end_bytes_per_s": n_bytes / end_to_end_s,
+      "peak_kib": peak / 1024,
+  }
+
+
+def compare(results: dict, baseline: dict, threshold: float, metric_thresholds: dict) -> list:
+  """Returns a description of each metric which regressed against the baseline."""
+  regressions = []
+  for name, metrics in results["workloads"].items():
+    base_metrics = baseline["workloads"].get(name, {})
+    for metric, value in metrics.items():
+      base = base_metrics.get(metric)
+      if not base:
+        continue
+      change = (value - base) / base
+      if HIGHER_IS_BETTER[metric]:
+        change = -change
+      if change > metric_thresholds.get(metric, threshold):
+        regressions.append(f"{name}.{metric}: {value:.4g} vs. baseline {base:.4g} ({change:+.0%} worse)")
+  return regressions
+
+
+def parse_metric_thresholds(values) -> dict:
+  thresholds = {}
+  for value in values:
+    metric, _, fraction = value.partition("=")
+    if metric not in HIGHER_IS_BETTER:
+      raise argparse.ArgumentTypeError(f"Unknown metric: {metric}")
+    thresholds[metric] = float(fraction)
+  return thresholds
+
+
+def main(argv=None) -> int:
+  parser = argparse.ArgumentParser(description="Runs the benchmark suite.")
+  parser.add_argument("--quick", action="store_true", help="Use the small variant of each workload.")
+  parser.add_argument("--repeat", type=int, default=5, help="Runs per timing, the best is kept.")
+  parser.add_argument("--workload", action="append", choices=sorted(workloads.WORKLOADS),
+                      help="Workloads to run, defaults to all of them.")
+  parser.add_argument("--output", help="Writes the results to this JSON file.")
+  parser.add_argument("--baseline", help="Compares the results against this JSON file.")
+  parser.add_argument("--threshold", type=float, default=0.25,
+                      help="Allowed regression of each metric, as a fraction of the baseline.")
+  parser.add_argument("--metric-threshold", action="append", default=[], metavar="METRIC=FRACTION",
+                      help="Allowed regression of a specific metric.")
+  args = parser.parse_args(argv)
+
+  metric_thresholds = parse_metric_thresholds(args.metric_threshold)
+  results = {
+      "python": platform.python_version(),
+      "machine": platform.machine(),
+      "quick": args.quick,
+      "workloads": {},
+  }
+  for name in args.workload or workloads.WORKLOADS:
+    full, quick = workloads.WORKLOADS[name]
+    metrics = results["workloads"][name] = measure(quick if args.quick else full, args.repeat)
+    print(name)
+    for metric, value in metrics.items():
+      print(f"  {metric:<24} {value:>14.4g}")
+
+  if args.output:
+    with open(args.output, "w", encoding="utf-8") as f:
+      json.dump(results, f, indent=2, sort_keys=True)
+      f.write("\n")
+
+  if args.baseline:
+    with open(args.baseline, encoding="utf-8") as f:
+      baseline = json.load(f)
+    if baseline.get("quick") != args.quick:
+      print("The baseline was run with different workload sizes.", file=sys.stderr)
+      return 2
+    regressions = compare(results, baseline, args.threshold, metric_thresholds)
+    for regression in regressions:
+      print(f"REGRESSION {regression}", file=sys.stderr)
+    if regressions:
+      return 1
+    print("No regressions against the baseline.")
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
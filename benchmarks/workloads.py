@@ -0,0 +1,170 @@
+"""Synthetic designs for the benchmark suite.
+
+Each workload function returns a list of modules. WORKLOADS lists the
+parametrized workloads run by benchmarks/run.py, in full and quick sizes.
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import functools
+
+from imp.base.models import comments
+from imp.base.models import container
+from imp.system_verilog.models import datatypes
+from imp.system_verilog.models import modules
+
+from typing import List
+
+
+def _add_params(module: modules.Module, n_params: int):
+  for j in range(n_params):
+    module.localparam(name=f"p{j}", dtype=datatypes.IntType(), value=j + 1)
+
+
+def many_modules(n_modules: int, n_params: int, lazy: bool = False) -> List[modules.Module]:
+  """N modules, each with M localparams.
+
+  With lazy, the modules are only populated when first used.
+  """
+  populate = functools.partial(_add_params, n_params=n_params)
+  result = []
+  for i in range(n_modules):
+    if lazy:
+      m = modules.Module(module_name=f"m{i}", builder=populate)
+    else:
+      m = modules.Module(module_name=f"m{i}")
+      populate(m)
+    result.append(m)
+  return result
+
+
+def deep_hierarchy(depth: int, width: int) -> List[modules.Module]:
+  """A module with alternately nested blocks and groups.
+
+  Each level holds `width` localparams and comments, and the next level.
+  """
+  m = modules.Module(module_name="deep")
+  parent = m
+  for level in range(depth):
+    child = parent._add_item(container.Block() if level % 2 else container.Group())
+    child._add_item(comments.Banner(f"level {level}"))
+    for i in range(width):
+      # Blocks and groups don't have a builder API, so the names are added to
+      # the module's namespace directly.
+      name = f"p{level}_{i}"
+      m.localparam(name=name, dtype=datatypes.IntType(), value=i)
+      child._add_item(comments.Comment(f"{name} is at level {level}"))
+    parent = child
+  return [m]
+
+
+def nested_comments(depth: int, n_comments: int) -> List[modules.Module]:
+  """A module with N comments at the bottom of `depth - 1` nested blocks."""
+  m = modules.Module(module_name=f"depth_{depth}")
+  blk = m
+  for _ in range(depth - 1):
+    blk = blk._add_item(container.Block())
+  for i in range(n_comments):
+    blk._add_item(comments.Comment(f"comment {i}"))
+  return [m]
+
+
+def blocked_module(n_params: int, block: int = 100) -> List[modules.Module]:
+  """A module with N localparams, and a comment for each in a block.
+
+  A new block is opened every `block` localparams.
+  """
+  m = modules.Module(module_name="blocked")
+  dtype = datatypes.IntType()
+  for i in range(n_params):
+    if i % block == 0:
+      blk = m.block()
+    m.localparam(name=f"p{i}", dtype=dtype, value=i)
+    blk._add_item(comments.Comment(f"c{i}"))
+  return [m]
+
+
+def add_sections(module: modules.Module, n_params: int, section: int, comment_each: bool = False):
+  """Adds localparams to a module, with a banner opening each section of them.
+
+  With comment_each, each localparam is followed by a comment.
+  """
+  dtype = datatypes.IntType()
+  for i in range(n_params):
+    if i % section == 0:
+      module.banner(f"Section {i // section}")
+    module.localparam(name=f"p{i}", dtype=dtype, value=i)
+    if comment_each:
+      module.comment(f"c{i}")
+
+
+def sectioned_module(n_params: int, section: int = 1_000, comment_each: bool = False
+                     ) -> List[modules.Module]:
+  """A module with N localparams in sections, see add_sections."""
+  m = modules.Module(module_name="sectioned")
+  add_sections(m, n_params, section, comment_each)
+  return [m]
+
+
+def parameterized_memory(depth: int, width: int, n_derived: int = 0, n_constants: int = 0,
+                         name: str = "mem") -> modules.Module:
+  """A module parameterized by its depth and width, e.g. a sweep template.
+
+  Besides the depth and width localparams, bits = depth * width, a chain of
+  N derived localparams, each computed from the previous one, and M
+  constant ones which don't depend on the others.
+  """
+  m = modules.Module(module_name=name)
+  dtype = datatypes.IntType()
+  d = m.localparam(name="depth", dtype=dtype, value=depth)
+  w = m.localparam(name="width", dtype=dtype, value=width)
+  prev = m.localparam(name="bits", dtype=dtype, value=d * w)
+  for i in range(n_derived):
+    prev = m.localparam(name=f"d{i}", dtype=dtype, value=prev + i)
+  m.localparams([f"c{i}" for i in range(n_constants)], dtype, list(range(n_constants)))
+  return m
+
+
+def comment_heavy(n_modules: int, n_comments: int) -> List[modules.Module]:
+  """Wide modules made mostly of comments, banners and block comments."""
+  result = []
+  for i in range(n_modules):
+    m = modules.Module(module_name=f"doc{i}")
+    for j in range(n_comments):
+      if j % 10 == 0:
+        m.banner(f"Section {j // 10}")
+      elif j % 10 == 5:
+        m.block_comment(f"Block comment {j}, which is a bit longer than the others.")
+      else:
+        m.comment(f"Comment {j}")
+    result.append(m)
+  return result
+
+
+# Workload names, mapped to their full and quick variants.
+WORKLOADS = {
+    "many_modules": (
+        functools.partial(many_modules, n_modules=100, n_params=200),
+        functools.partial(many_modules, n_modules=10, n_params=50),
+    ),
+    "deep_hierarchy": (
+        functools.partial(deep_hierarchy, depth=100, width=20),
+        functools.partial(deep_hierarchy, depth=20, width=5),
+    ),
+    "comment_heavy": (
+        functools.partial(comment_heavy, n_modules=10, n_comments=2_000),
+        functools.partial(comment_heavy, n_modules=2, n_comments=200),
+    ),
+}
@@ -20,6 +20,8 @@ from imp.base.models import component
 
 class Comment(component.Component):
   """Represents a single line comment."""
+  __slots__ = ("txt",)
+
   def __init__(self, txt: str):
     super().__init__()
     self.txt = txt
@@ -27,6 +29,8 @@ class Comment(component.Component):
 
 class Banner(Comment):
   """Represents a single line comment, bordered with additional text."""
+  __slots__ = ("border_char", "num")
+
   def __init__(self, txt, border_char="-", num=40):
     super().__init__(txt=txt)
     self.border_char = border_char
@@ -35,12 +39,15 @@ class Banner(Comment):
 
 class BlockComment(Comment):
   """Represents a block (multi-line) comment."""
+  __slots__ = ()
+
   def __init__(self, txt: str):
     super().__init__(txt=txt)
 
 
 class HasComments:
   """Mix-in class for adding a comments builder to a Container."""
+  __slots__ = ()
 
   def comment(self, txt: str) -> Comment:
     item = comments.Comment(txt=txt)
@@ -16,11 +16,51 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+from typing import Dict, Tuple
+
+# Slot names by component class, for pickling.
+_slots_by_type: Dict[type, Tuple[str, ...]] = {}
+
+
+def _slot_names(cls: type) -> Tuple[str, ...]:
+  try:
+    return _slots_by_type[cls]
+  except KeyError:
+    pass
+  names = []
+  for base in reversed(cls.__mro__):
+    slots = base.__dict__.get("__slots__", ())
+    names.extend(name for name in ([slots] if isinstance(slots, str) else slots)
+                 if name not in ("__dict__", "__weakref__"))
+  _slots_by_type[cls] = tuple(names)
+  return _slots_by_type[cls]
+
 class Component:
-  """Base class for any part of our component model."""
+  """Base class for any part of our component model.
+
+  Designs can contain millions of components, so subclasses declare their
+  attributes in __slots__ rather than using an instance dict. Mixins should
+  define empty __slots__ for the same reason.
+  """
+  __slots__ = ("parent",)
+
+  # Attributes left out of the component's fingerprint (see fingerprint.py),
+  # because they don't describe the component itself.
+  _fingerprint_exclude = ("parent",)
 
   def __init__(self):
     self.parent = None
 
   def set_parent(self, parent: 'Component'):
     self.parent = parent
+
+  def __getstate__(self):
+    # The same state as object.__getstate__ gives slotted objects from
+    # Python 3.11 on, which earlier versions don't have.
+    slots = {}
+    for name in _slot_names(type(self)):
+      try:
+        slots[name] = getattr(self, name)
+      except AttributeError:
+        pass
+    return getattr(self, "__dict__", None) or None, slots
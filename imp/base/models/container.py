@@ -16,14 +16,19 @@ limitations under the License.
 """
 
 import abc
+import collections
+import copy
+import heapq
 import typing
 
 from imp.base.models import component
-from typing import Any, Iterator, List, Mapping, Optional
+from imp.base.models import symbol_table
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Type, Union
 
 
 class ContainerBuilderMixin(abc.ABC):
   """Abstract base class for Container subclasses."""
+  __slots__ = ()
 
   @abc.abstractmethod
   def _add_item(self, item: component.Component):
@@ -32,6 +37,7 @@ class ContainerBuilderMixin(abc.ABC):
 
 class NamespaceBuilderMixin(ContainerBuilderMixin):
   """Abstract base class for namespaced containers."""
+  __slots__ = ()
 
   @abc.abstractmethod
   def _add_named_item(self, name: str, item: component.Component):
@@ -39,83 +45,735 @@ class NamespaceBuilderMixin(ContainerBuilderMixin):
 
 
 class Container(ContainerBuilderMixin, component.Component):
-  """Base class for SV constructs that contain other components."""
+  """Base class for SV constructs that contain other components.
+
+  Containers keep a flattened, pre-order view of their descendants and a set
+  of their ids. Both are maintained as items are added to the container or to
+  any of its descendants, so `items` and `in` don't walk the tree. Nested
+  containers drop their views when added to a parent, and only build them
+  again when read, so that each item is held by the views of the outermost
+  container rather than by those of all its ancestors.
+
+  The first `query` also builds an index of the positions of descendants in
+  the flat view by class, which is then maintained in the same way.
+
+  Clones share these lists and sets with the container they were cloned
+  from until either of them is modified, see `clone`.
+
+  Containers created with a builder are populated lazily: the builder is
+  called with the container when its items or names are first used, e.g.
+  by `iter_items`, `items`, `lookup` or a writer. `release` drops the items
+  again, until they are next used. The views of the ancestors of containers
+  which aren't populated are only built when needed, which populates them.
+  The builder must be picklable for the container to be pickled before it
+  is populated.
+  """
+  __slots__ = ("_items", "_flat_items", "_item_ids", "_type_index", "_shared", "_builder", "_populated")
+  _fingerprint_exclude = ("_flat_items", "_item_ids", "_type_index", "_shared", "_builder", "_populated")
+  # Attributes of nested containers which are pickled by the outermost one.
+  _subtree_state = ("_items",)
 
   parent: 'Container'
 
-  def __init__(self):
+  def __init__(self, builder: Optional[Callable[['Container'], Any]] = None):
+    super().__init__()
+    self._items = []
+    self._type_index = None
+    # Whether the lists, sets and mappings above may be shared with clones.
+    self._shared = False
+    self._builder = builder
+    self._populated = builder is None
+    if builder is None:
+      self._flat_items = []
+      self._item_ids = set()
+    else:
+      self._flat_items = None
+      self._item_ids = None
+
+  @property
+  def populated(self) -> bool:
+    """Whether the items of the container have been created."""
+    return self._populated
+
+  def populate(self):
+    """Calls the builder of a lazily populated container, if not done yet."""
+    if self._populated:
+      return
+    self._populated = True
+    try:
+      self._builder(self)
+    except BaseException:
+      self._clear()
+      self._populated = False
+      raise
+
+  def release(self):
+    """Drops the items of the lazily populated containers in this subtree.
+
+    They are populated again when next used. Containers which aren't lazily
+    populated are kept. Released items must no longer be used.
+    """
+    stack = [self]
+    while stack:
+      container = stack.pop()
+      if container._builder is not None:
+        if container._populated:
+          container._clear()
+          container._populated = False
+      else:
+        stack.extend(item for item in container._items if isinstance(item, Container))
+
+  def _clear(self):
+    """Removes all items from the container."""
+    # Shared lists are replaced rather than cleared.
     self._items = []
+    self._shared = False
+    self._drop_views()
+
+  def _drop_views(self):
+    """Drops the views of this container and its ancestors.
+
+    They are rebuilt from the items when needed, which populates lazily
+    populated containers.
+    """
+    container = self
+    while container is not None:
+      container._flat_items = None
+      container._item_ids = None
+      container._type_index = None
+      container = container.parent
 
   @property
-  def items(self) -> List[Iterator[component.Component]]:
-    """Returns all child items of the container."""
-    return list(self.iter_items(expand=True))
+  def items(self) -> List[component.Component]:
+    """Returns all child items of the container, in pre-order.
+
+    The returned list is shared with the container and must not be modified.
+    """
+    if self._flat_items is None:
+      self._flat_items = list(self.iter_items(expand=True))
+    return self._flat_items
 
   def _add_item(self, item: component.Component) -> component.Component:
     """Adds an item to the container and sets its parent."""
+    if not self._populated:
+      self.populate()
+    if self._shared:
+      self._unshare()
     self._items.append(item)
     item.set_parent(self)
+
+    added = [item]
+    # Only containers have items, and getattr is much faster than isinstance
+    # checks against abstract base classes.
+    if getattr(item, "_items", None) is not None:
+      subtree = item._nest()
+      if subtree is None:
+        # The item may not be populated, which the views can't reflect.
+        self._drop_views()
+        return item
+      added.extend(subtree)
+    self._items_added(added, at_end=True)
     return item
 
+  def _add_items(self, items: Iterable[component.Component]) -> List[component.Component]:
+    """Adds several items to the container, updating the views only once."""
+    items = list(items)
+    if not self._populated:
+      self.populate()
+    if self._shared:
+      self._unshare()
+    self._items.extend(items)
+    for item in items:
+      item.set_parent(self)
+
+    # Checking the distinct types is much faster than checking each item.
+    added = items
+    if any(issubclass(t, Container) for t in set(map(type, items))):
+      added = []
+      for item in items:
+        added.append(item)
+        if isinstance(item, Container):
+          subtree = item._nest()
+          if subtree is None:
+            # The item may not be populated, which the views can't reflect.
+            self._drop_views()
+            return items
+          added.extend(subtree)
+    if added:
+      self._items_added(added, at_end=True)
+    return items
+
+  def _nest(self) -> Optional[List[component.Component]]:
+    """Drops the views of a container which is added to a parent.
+
+    Returns:
+      The descendants of the container in pre-order, without populating
+      any, or None if not all of them are populated.
+    """
+    flat = self._flat_items
+    self._flat_items = None
+    self._item_ids = None
+    self._type_index = None
+    if flat is not None or not self._populated:
+      return flat
+
+    flat = []
+    # Walk with an explicit stack, as designs can be deep.
+    stack = [iter(self._items)]
+    while stack:
+      for item in stack[-1]:
+        flat.append(item)
+        if isinstance(item, Container):
+          if item._flat_items is not None:
+            flat.extend(item._flat_items)
+            continue
+          if not item._populated:
+            return None
+          stack.append(iter(item._items))
+          break
+      else:
+        stack.pop()
+    return flat
+
+  def _items_added(self, added: List[component.Component], at_end: bool):
+    """Updates the cached views after items were added to this subtree.
+
+    Args:
+      added: The new items (and their descendants), in pre-order.
+      at_end: True if the items were added at the end of this container's
+        pre-order sequence, in which case the flat view can be extended in
+        place. Otherwise it is invalidated and rebuilt on next access.
+    """
+    ids = [id(item) for item in added]
+    # Loop rather than recurse through the parents, as designs can be deep.
+    container = self
+    while True:
+      if container._shared:
+        container._unshare()
+      if container._flat_items is not None:
+        if at_end:
+          flat = container._flat_items
+          if container._type_index is not None:
+            index = container._type_index
+            for position, item in enumerate(added, len(flat)):
+              index.setdefault(type(item), []).append(position)
+          flat.extend(added)
+        else:
+          # The index holds positions in the flat view, so both are rebuilt.
+          container._flat_items = None
+          container._type_index = None
+      if container._item_ids is not None:
+        container._item_ids.update(ids)
+
+      # Parents are only ever set by a Container's _add_item.
+      parent = container.parent
+      if parent is None:
+        break
+      at_end = at_end and parent._items[-1] is container
+      container = parent
+
+  def clone(self) -> 'Container':
+    """Returns a copy of the container which shares its components.
+
+    Containers in the subtree are copied, while all other components are
+    shared between the copy and the original, and keep the parent they were
+    added to. The lists and mappings of items are shared as well, and are
+    only copied when either container is modified. A clone which is never
+    modified costs memory proportional to the number of containers in it,
+    and one which is modified proportional to the number of items of the
+    modified containers. Symbol tables holding named containers are copied
+    along with those containers.
+
+    Shared components must not be modified in place, as the change would
+    apply to all copies. They can be replaced with `_replace_items`.
+    """
+    originals = self._containers()
+    copies = {}
+    for original in originals:
+      original._shared = True
+      # Pickling support makes copy.copy drop the cached views, which can be
+      # shared as long as the copy doesn't hold copies of containers.
+      duplicate = copy.copy(original)
+      # Nested containers leave their items to the outermost one, see
+      # __getstate__.
+      for name in original._subtree_state:
+        setattr(duplicate, name, getattr(original, name))
+      duplicate._flat_items = original._flat_items
+      duplicate._item_ids = original._item_ids
+      duplicate._type_index = original._type_index
+      copies[id(original)] = duplicate
+    for original in originals:
+      copies[id(original)]._remap_clones(original, copies)
+    duplicate = copies[id(self)]
+    duplicate.parent = None
+    return duplicate
+
+  def _containers(self) -> List['Container']:
+    """Returns this container and the ones below it, parents first."""
+    containers = []
+    # Walk with an explicit stack, as designs can be deep.
+    stack = [self]
+    while stack:
+      container = stack.pop()
+      containers.append(container)
+      # Checking the distinct types is much faster than checking each item.
+      if any(issubclass(t, Container) for t in set(map(type, container._items))):
+        stack.extend(item for item in container._items if isinstance(item, Container))
+    return containers
+
+  def _remap_clones(self, original: 'Container', copies: Dict[int, 'Container']):
+    """Points a fresh clone to the clones of the containers it refers to."""
+    self.parent = copies.get(id(original.parent), original.parent)
+    if any(issubclass(t, Container) for t in set(map(type, self._items))):
+      self._items = [copies.get(id(item), item) for item in self._items]
+      # The views are rebuilt from the items when needed.
+      self._flat_items = None
+      self._item_ids = None
+      self._type_index = None
+
+  def _unshare(self):
+    """Copies the lists and sets which may be shared with clones."""
+    self._items = list(self._items)
+    if self._flat_items is not None:
+      self._flat_items = list(self._flat_items)
+    # The id set and index are larger, and are rebuilt when needed.
+    self._item_ids = None
+    self._type_index = None
+    self._shared = False
+
+  def _replace_items(self, replacements: Mapping[component.Component, component.Component]):
+    """Replaces items anywhere in the subtree with other components.
+
+    Replaced items must not be containers. The replacements take the place
+    and the parent of the items they replace.
+    """
+    by_id = {id(item): replacement for item, replacement in replacements.items()}
+    changed = []
+    for container in self._containers():
+      items = container._items
+      if by_id.keys().isdisjoint(map(id, items)):
+        continue
+      positions = [i for i, item in enumerate(items) if id(item) in by_id]
+      if container._shared:
+        container._unshare()
+      for i in positions:
+        replacement = by_id[id(container._items[i])]
+        container._items[i] = replacement
+        replacement.set_parent(container)
+      changed.append(container)
+
+    # The views of the changed containers and their ancestors hold the
+    # replaced items. Flat views are updated, the others are rebuilt when
+    # needed.
+    visited = set()
+    for container in changed:
+      while container is not None and id(container) not in visited:
+        visited.add(id(container))
+        if container._flat_items is not None:
+          container._flat_items = [by_id.get(id(item), item) for item in container._flat_items]
+        container._item_ids = None
+        container._type_index = None
+        container = container.parent
+
   def __contains__(self, item: component.Component):
     """Returns True if the item is part of this container."""
-    return item in self.items
+    if self._item_ids is None:
+      self._item_ids = set(map(id, self.items))
+    return id(item) in self._item_ids
+
+  def query(self, cls: Union[Type, Tuple[Type, ...]], expand=True) -> List[component.Component]:
+    """Returns the items which are instances of a class, in pre-order.
+
+    Args:
+      cls: A class, or a tuple of classes, as for isinstance.
+      expand: If True, returns matching descendants, otherwise only matching
+        direct children.
+    """
+    if not expand:
+      return [item for item in self.iter_items(expand=False) if isinstance(item, cls)]
+
+    items = self.items
+    if self._type_index is None:
+      index: Dict[type, List[int]] = {}
+      for position, item in enumerate(items):
+        index.setdefault(type(item), []).append(position)
+      self._type_index = index
+
+    matches = [positions for item_type, positions in self._type_index.items()
+               if issubclass(item_type, cls)]
+    if len(matches) == 1:
+      return [items[position] for position in matches[0]]
+    return [items[position] for position in heapq.merge(*matches)]
+
+  def __getstate__(self):
+    # The cached views are rebuilt on demand rather than pickled.
+    state, slots = super().__getstate__()
+    slots.update(_flat_items=None, _item_ids=None, _type_index=None)
+    if self.parent is not None:
+      for name in self._subtree_state:
+        slots.pop(name, None)
+      return state, slots
+
+    # Pickling nested containers through their parents recurses once per
+    # level, which fails for deep designs. Instead, the outermost container
+    # pickles the items of the others in a flat list, parents first, and
+    # before any other references into the hierarchy.
+    subtree = [(container, {name: getattr(container, name) for name in container._subtree_state})
+               for container in self._containers()[1:]]
+    return state, {"_subtree": subtree, **slots}
+
+  def __setstate__(self, state):
+    attributes, slots = state
+    if attributes:
+      self.__dict__.update(attributes)
+    subtree = slots.pop("_subtree", ())
+    for name, value in slots.items():
+      setattr(self, name, value)
+    for container, nested in subtree:
+      for name, value in nested.items():
+        setattr(container, name, value)
 
   def __iter__(self) -> Iterator[component.Component]:
-    """Iterate over the items stored in this container."""
-    for item in self._items:
-      if isinstance(item, Container):
-        yield from item
-      else:
+    """Iterate over the leaf items stored in this container."""
+    for item in self.iter_items(expand=True):
+      if not isinstance(item, Container):
         yield item
 
   def iter_items(self, expand=True, filter_fn=lambda i: True) -> Iterator[component.Component]:
-    """Iterates over the container's items, filtering them if needed."""
-    for item in self._items:
-      if filter_fn(item):
-        yield item
-
-      if isinstance(item, Container) and expand:
-        yield from item.iter_items(expand=expand, filter_fn=filter_fn)
+    """Iterates over the container's items, filtering them if needed.
+
+    Lazily populated containers are populated as they are reached.
+    """
+    if not self._populated:
+      self.populate()
+    if not expand:
+      yield from filter(filter_fn, self._items)
+      return
+
+    # Walk with an explicit stack of iterators, as designs can be deep.
+    stack = [iter(self._items)]
+    while stack:
+      for item in stack[-1]:
+        if filter_fn(item):
+          yield item
+        if isinstance(item, Container):
+          if not item._populated:
+            item.populate()
+          stack.append(iter(item._items))
+          break
+      else:
+        stack.pop()
 
 
 class NamespacedContainer(Container):
-  """Adds support for namespaced components within a Container."""
+  """Adds support for namespaced components within a Container.
+
+  Named items are also added to a symbol table by their dotted path, which
+  is kept by the outermost namespace. A namespace which is itself added as a
+  named item joins the enclosing namespace, and its symbols are moved to the
+  enclosing table under its name. Namespaces that aren't named, such as
+  unnamed blocks, keep their own table.
+
+  Looking up a name populates the lazily populated containers which may
+  declare it, i.e. the namespaces along its path and the containers in them
+  which aren't namespaces. Listing symbols populates the whole namespace.
+  """
+  __slots__ = ("_named_items", "_symbol_table", "_symbol_root", "_symbol_prefix")
+  # Named items are fingerprinted through the items declaring them.
+  _fingerprint_exclude = ("_named_items", "_symbol_table", "_symbol_root", "_symbol_prefix")
+  _subtree_state = ("_items", "_named_items")
   _named_items: Mapping[str, component.Component]
 
-  def __init__(self):
-    super().__init__()
+  def __init__(self, builder: Optional[Callable[['NamespacedContainer'], Any]] = None):
+    super().__init__(builder=builder)
     self._named_items = {}
+    self._symbol_table = symbol_table.SymbolTable()
+    # The namespace holding the symbol table, and the path of this namespace
+    # in it.
+    self._symbol_root = self
+    self._symbol_prefix = ""
 
   def _add_named_item(self, name: str, item: component.Component) -> component.Component:
+    if not self._populated:
+      self.populate()
     if name in self._named_items:
       raise KeyError(f"An item named {name} already exists in {self}")
+    root = self._symbol_root
+    if self._shared or root._shared:
+      self._unshare_namespace()
     self._named_items[name] = item
+
+    prefix = self._symbol_prefix
+    path = prefix + name
+    root._symbol_table.add(path, item, namespace=prefix[:-1])
+    # Only namespaces have a symbol root, and getattr is much faster than
+    # isinstance checks against abstract base classes.
+    if getattr(item, "_symbol_root", None) is item:
+      item._join_namespace(root, path + ".")
     return item
 
+  def _add_named_items(self, names: Sequence[str], items: Sequence[component.Component]):
+    """Adds several named items, or none of them if any name is taken."""
+    names = list(names)
+    items = list(items)
+    if len(names) != len(items):
+      raise ValueError(f"Got {len(names)} names for {len(items)} items")
+    if not self._populated:
+      self.populate()
+    named_items = self._named_items
+    if len(set(names)) != len(names) or not named_items.keys().isdisjoint(names):
+      counts = collections.Counter(names)
+      taken = sorted(name for name in counts if counts[name] > 1 or name in named_items)
+      raise KeyError(f"Items named {taken} already exist in {self}")
+
+    self._unshare_namespace()
+    named_items = self._named_items
+    root = self._symbol_root
+    prefix = self._symbol_prefix
+    paths = [prefix + name for name in names] if prefix else names
+    root._symbol_table.add_many(paths, items, namespace=prefix[:-1])
+    named_items.update(zip(names, items))
+    if any(issubclass(t, NamespacedContainer) for t in set(map(type, items))):
+      for path, item in zip(paths, items):
+        if isinstance(item, NamespacedContainer) and item._symbol_root is item:
+          item._join_namespace(root, path + ".")
+
+  def _unshare_namespace(self):
+    """Unshares this namespace and the one holding its symbol table."""
+    if self._shared:
+      self._unshare()
+    if self._symbol_root._shared:
+      self._symbol_root._unshare()
+
+  def _unshare(self):
+    super()._unshare()
+    # Like symbol tables, the names are layered on the shared ones, which are
+    # no longer changed.
+    named_items = self._named_items
+    maps = named_items.maps if isinstance(named_items, collections.ChainMap) else [named_items]
+    if len(maps) < symbol_table.SymbolTable.MAX_DEPTH:
+      self._named_items = collections.ChainMap({}, *maps)
+    else:
+      self._named_items = dict(named_items)
+    if self._symbol_table is not None:
+      self._symbol_table = self._symbol_table.copy()
+
+  def _remap_clones(self, original: 'Container', copies: Dict[int, 'Container']):
+    super()._remap_clones(original, copies)
+    # None if the symbol table is held outside the clone, see clone().
+    self._symbol_root = copies.get(id(original._symbol_root))
+
+  def clone(self) -> 'NamespacedContainer':
+    duplicate = super().clone()
+    namespaces = [item for item in duplicate._containers()[1:] if isinstance(item, NamespacedContainer)]
+    if duplicate._symbol_root is None:
+      # A namespace which joined an enclosing one gets its own table.
+      table = symbol_table.SymbolTable()
+      for path, item in self.symbols():
+        table.add(path, item)
+      start = len(self._symbol_prefix)
+      for namespace in [duplicate, *namespaces]:
+        if namespace._symbol_root is None:
+          namespace._symbol_root = duplicate
+          namespace._symbol_prefix = namespace._symbol_prefix[start:]
+      duplicate._symbol_table = table
+
+    # Named namespaces must be replaced by their clones in the table and in
+    # their parent namespace, which are visited first.
+    for namespace in namespaces:
+      if namespace._symbol_root is not namespace:
+        namespace._symbol_root._replace_symbol(namespace._symbol_prefix[:-1], namespace)
+    return duplicate
+
+  def _replace_symbol(self, path: str, item: component.Component):
+    """Replaces the item with a full path in this namespace's table."""
+    parent_path, _, name = path.rpartition(".")
+    parent = self._symbol_table.lookup(parent_path) if parent_path else self
+    for namespace in (self, parent):
+      if namespace._shared:
+        namespace._unshare()
+    self._symbol_table.replace(path, item)
+    parent._named_items[name] = item
+
+  def _replace_named_items(self, replacements: Mapping[component.Component, component.Component]):
+    """Replaces named items below this namespace, keeping their paths.
+
+    Replaced items must not be namespaces. Items declaring them, if any,
+    are replaced separately with `_replace_items`.
+    """
+    by_id = {id(item): replacement for item, replacement in replacements.items()}
+    prefix = self._symbol_prefix
+    matches = [(path, by_id[id(item)]) for path, item in self.symbols() if id(item) in by_id]
+    for path, replacement in matches:
+      self._symbol_root._replace_symbol(prefix + path, replacement)
+
+  def _clear(self):
+    super()._clear()
+    self._named_items = {}
+    if self._symbol_root is self:
+      self._symbol_table = symbol_table.SymbolTable()
+    else:
+      root = self._symbol_root
+      if root._shared:
+        root._unshare()
+      root._symbol_table.remove(self._symbol_prefix[:-1], members_only=True)
+
+  def _remove_named_items(self, names: Iterable[str]):
+    """Removes named items, and the symbols below them."""
+    self._unshare_namespace()
+    # Removals aren't layered on shared names.
+    self._named_items = dict(self._named_items)
+    table = self._symbol_root._symbol_table
+    for name in names:
+      del self._named_items[name]
+      table.remove(self._symbol_prefix + name)
+
+  def _populate_names(self) -> bool:
+    """Populates the containers which may declare names in this namespace.
+
+    Returns:
+      True if any container was populated.
+    """
+    populated = not self._populated
+    self.populate()
+    stack = [self]
+    while stack:
+      items = stack.pop()._items
+      # Checking the distinct types is much faster than checking each item.
+      if not any(issubclass(t, Container) for t in set(map(type, items))):
+        continue
+      for item in items:
+        if isinstance(item, Container) and not isinstance(item, NamespacedContainer):
+          if not item._populated:
+            item.populate()
+            populated = True
+          stack.append(item)
+    return populated
+
+  def _populate_path(self, path: str) -> bool:
+    """Populates the containers which may declare a dotted path."""
+    populated = False
+    namespace = self
+    for name in path.split("."):
+      populated |= namespace._populate_names()
+      namespace = namespace._named_items.get(name)
+      if not isinstance(namespace, NamespacedContainer):
+        break
+    return populated
+
+  def _join_namespace(self, root: 'NamespacedContainer', prefix: str):
+    """Moves this namespace's symbols to the table of an enclosing one."""
+    table = root._symbol_table
+    for path, item in self._symbol_table.items():
+      table.add(prefix + path, item)
+      if isinstance(item, NamespacedContainer) and item._symbol_root is self:
+        item._symbol_root = root
+        item._symbol_prefix = prefix + item._symbol_prefix
+    self._symbol_table = None
+    self._symbol_root = root
+    self._symbol_prefix = prefix
+
+  def lookup(self, path: str) -> component.Component:
+    """Returns the named item with a dotted path relative to this namespace.
+
+    Raises:
+      KeyError: if no item has the path.
+    """
+    try:
+      return self._symbol_root._symbol_table.lookup(self._symbol_prefix + path)
+    except KeyError:
+      if not self._populate_path(path):
+        raise
+    return self._symbol_root._symbol_table.lookup(self._symbol_prefix + path)
+
+  def _populate_all(self):
+    # Containers are fully populated when they have a flat view.
+    if self._flat_items is None:
+      self.items
+
+  def symbols(self, prefix: str = "") -> Iterator[symbol_table.Symbol]:
+    """Yields the (relative path, item) of the named items below this namespace.
+
+    Only items whose relative path starts with the prefix are included.
+    """
+    self._populate_all()
+    start = len(self._symbol_prefix)
+    for path, item in self._symbol_root._symbol_table.with_prefix(self._symbol_prefix + prefix):
+      yield path[start:], item
+
+  def find(self, pattern: str) -> List[symbol_table.Symbol]:
+    """Returns the (relative path, item) of the named items matching a glob pattern."""
+    self._populate_all()
+    start = len(self._symbol_prefix)
+    return [(path[start:], item) for path, item in
+            self._symbol_root._symbol_table.glob(self._symbol_prefix + pattern)]
+
   def __getattr__(self, name: str) -> Any:
-    if name == "_named_items":
-      object.__getattribute__(self, name)
-    if name in self._named_items:
-      return self._named_items[name]
-    object.__getattribute__(self, name)
+    # Only called when the normal attribute lookup fails. _named_items is
+    # excluded to avoid recursing while the instance is being initialized.
+    if name != "_named_items":
+      if name in self._named_items:
+        return self._named_items[name]
+      # Private attributes, e.g. those looked up by copy, don't populate.
+      if not name.startswith("_") and self._populate_names() and name in self._named_items:
+        return self._named_items[name]
+    raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
 
   def _validate_item(self):
     """Raises a ValueError if the item isn't allowed in the container."""
 
 
 class Block(NamespacedContainer):
+  __slots__ = ("name",)
   parent: NamespacedContainer
 
-  def __init__(self, name: Optional[str] = None):
-    super().__init__()
+  def __init__(self, name: Optional[str] = None,
+               builder: Optional[Callable[['Block'], Any]] = None):
+    super().__init__(builder=builder)
     self.name = name
 
 
 class Group(Container):
-  """Logically groups a sequence of Components together."""
+  """Logically groups a sequence of Components together.
+
+  Names are declared in the enclosing namespace. Lazily populated groups
+  keep the names they declared, to remove them when released.
+  """
+  __slots__ = ("_declared",)
+  _fingerprint_exclude = ("_declared",)
   parent: NamespacedContainer
 
+  def __init__(self, builder: Optional[Callable[['Group'], Any]] = None):
+    super().__init__(builder=builder)
+    self._declared = None if builder is None else []
+
   def _add_named_item(self, name: str, item: component.Component):
     parent = typing.cast(NamespacedContainer, self.parent)
     parent._add_named_item(name=name, item=item)
+    if self._declared is not None:
+      self._declared.append(name)
+
+  def _add_named_items(self, names: Sequence[str], items: Sequence[component.Component]):
+    parent = typing.cast(NamespacedContainer, self.parent)
+    parent._add_named_items(names=names, items=items)
+    if self._declared is not None:
+      self._declared.extend(names)
+
+  def _unshare(self):
+    super()._unshare()
+    if self._declared is not None:
+      self._declared = list(self._declared)
+
+  def _clear(self):
+    super()._clear()
+    if self._declared:
+      # Names are declared in the nearest enclosing namespace, and by the
+      # enclosing groups, which must not remove them again.
+      released = set(self._declared)
+      namespace = self.parent
+      while not isinstance(namespace, NamespacedContainer):
+        if isinstance(namespace, Group) and namespace._declared:
+          namespace._declared = [name for name in namespace._declared if name not in released]
+        namespace = namespace.parent
+      namespace._remove_named_items(self._declared)
+      self._declared = []
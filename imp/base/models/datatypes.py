@@ -16,10 +16,102 @@ limitations under the License.
 """
 
 import abc
+import weakref
 
+from typing import Any, Dict, MutableMapping, Tuple
 
-class DataType:
-  """Base class for all data types."""
+# Shared DataType instances, keyed by their structure and by the arguments
+# used to construct them. Instances are only shared while they are in use.
+_instances: MutableMapping[Tuple, 'DataType'] = weakref.WeakValueDictionary()
+# Weak references rather than a WeakValueDictionary, whose lookups are much
+# slower, as every DataType call goes through this table.
+_instances_by_call: Dict[Tuple, weakref.KeyedRef] = {}
+
+
+def _discard_call(ref: weakref.KeyedRef):
+  # The key may have been reused by an instance created since.
+  if _instances_by_call.get(ref.key) is ref:
+    del _instances_by_call[ref.key]
+
+
+def _typed(values) -> Tuple:
+  # Include the value types, so that e.g. 1 and True or 1.0 aren't conflated.
+  return tuple((type(v), v) for v in values)
+
+
+def _intern(instance: 'DataType') -> 'DataType':
+  """Returns the shared instance structurally identical to the given one."""
+  key = (type(instance),) + tuple(
+      (name, type(value), value) for name, value in sorted(vars(instance).items()))
+  instance.__dict__["_key"] = key
+  return _instances.setdefault(key, instance)
+
+
+def _restore(cls, state: Dict[str, Any]) -> 'DataType':
+  """Unpickles a DataType, returning the shared instance."""
+  instance = cls.__new__(cls)
+  instance.__dict__.update(state)
+  return _intern(instance)
+
+
+class _InternedType(abc.ABCMeta):
+  """Metaclass hash-consing DataType instances.
+
+  Calling a DataType class returns a single shared, immutable instance per
+  distinct structure. For example, LogicType(3, 0) is LogicType(msb=3, lsb=0).
+  """
+
+  def __call__(cls, *args, **kwargs):
+    try:
+      if kwargs:
+        call_key = (cls, _typed(args), _typed(sorted(kwargs.items())))
+      else:
+        # Keys of different lengths can't collide.
+        call_key = (cls, _typed(args)) if args else cls
+      ref = _instances_by_call.get(call_key)
+    except TypeError:
+      # Unhashable arguments, intern by structure only.
+      call_key = ref = None
+    if ref is not None:
+      instance = ref()
+      if instance is not None:
+        return instance
+
+    instance = _intern(super().__call__(*args, **kwargs))
+    if call_key is not None:
+      _instances_by_call[call_key] = weakref.KeyedRef(instance, _discard_call, call_key)
+    return instance
+
+
+class DataType(metaclass=_InternedType):
+  """Base class for all data types.
+
+  Data types are immutable, and structurally identical data types are the
+  same object. They can be compared with `is` and used as dict keys.
+  """
+
+  def __setattr__(self, name, value):
+    if "_key" in self.__dict__:
+      raise AttributeError(f"{type(self).__name__} instances are immutable.")
+    super().__setattr__(name, value)
+
+  def __eq__(self, other):
+    if self is other:
+      return True
+    if not isinstance(other, DataType):
+      return NotImplemented
+    return self._key == other._key
+
+  def __hash__(self):
+    return hash(self._key)
+
+  def __reduce__(self):
+    state = {name: value for name, value in vars(self).items() if name != "_key"}
+    return _restore, (type(self), state)
+
+  def __repr__(self):
+    fields = ", ".join(f"{name}={value!r}" for name, _, value in self._key[1:])
+    return f"{type(self).__name__}({fields})"
 
 
 class IntegerTypeBase(DataType, abc.ABC):
@@ -0,0 +1,120 @@
+"""Structural fingerprints of components.
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import enum
+import hashlib
+
+from imp.base.models import component
+from imp.base.models import container
+from typing import Any, Dict, Tuple
+
+# Fingerprinted attributes by component class.
+_fields_by_type: Dict[type, Tuple[str, ...]] = {}
+
+
+def fingerprinted_fields(cls: type) -> Tuple[str, ...]:
+  """Returns the attributes of a component class that define its structure."""
+  try:
+    return _fields_by_type[cls]
+  except KeyError:
+    pass
+
+  excluded = set()
+  fields = []
+  for base in reversed(cls.__mro__):
+    excluded.update(base.__dict__.get("_fingerprint_exclude", ()))
+    slots = base.__dict__.get("__slots__", ())
+    fields.extend([slots] if isinstance(slots, str) else slots)
+  fields = tuple(f for f in fields if f not in excluded)
+  _fields_by_type[cls] = fields
+  return fields
+
+
+def _instance_attributes(value: component.Component) -> Dict[str, Any]:
+  """Returns the attributes of a component held outside its slots.
+
+  Subclasses which don't declare __slots__ store their attributes in an
+  instance dict, which defines their structure as well.
+  """
+  excluded = set()
+  for base in type(value).__mro__:
+    excluded.update(base.__dict__.get("_fingerprint_exclude", ()))
+  return {name: attr for name, attr in vars(value).items() if name not in excluded}
+
+
+def _type_name(cls: type) -> str:
+  return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def fingerprint(item: Any) -> str:
+  """Returns a hex digest of a component's structure.
+
+  The fingerprint covers the component's type and its attributes, including
+  child items, data types and values. Two components with the same
+  fingerprint produce the same code.
+
+  Component classes can define a `_fingerprint_state` method returning the
+  values to fingerprint instead of their attributes.
+  """
+  digest = hashlib.blake2b(digest_size=16)
+  update = digest.update
+
+  # Walk with an explicit stack, as designs can be deeply nested.
+  stack = [item]
+  while stack:
+    value = stack.pop()
+    cls = type(value)
+
+    if value is None or cls in (bool, int, float, complex, str, bytes) or isinstance(value, enum.Enum):
+      update(f"{_type_name(cls)}:{value!r};".encode())
+    elif isinstance(value, component.Component):
+      if isinstance(value, container.Container):
+        # Lazily populated containers are fingerprinted by their items.
+        value.populate()
+      if hasattr(value, "__dict__"):
+        update(f"<{_type_name(cls)}:dict;".encode())
+        stack.append(_instance_attributes(value))
+      state_fn = getattr(cls, "_fingerprint_state", None)
+      if state_fn is not None:
+        update(f"<{_type_name(cls)}:state;".encode())
+        stack.append(state_fn(value))
+        continue
+      fields = fingerprinted_fields(cls)
+      update(f"<{_type_name(cls)}:{len(fields)};".encode())
+      for name in reversed(fields):
+        stack.append(getattr(value, name, None))
+        stack.append(name)
+    elif isinstance(value, (list, tuple)):
+      update(f"[{_type_name(cls)}:{len(value)};".encode())
+      stack.extend(reversed(value))
+    elif isinstance(value, (set, frozenset)):
+      update(f"{{{_type_name(cls)}:{len(value)};".encode())
+      stack.extend(sorted(value, key=repr))
+    elif isinstance(value, dict):
+      update(f"{{{_type_name(cls)}:{len(value)};".encode())
+      for key, val in reversed(list(value.items())):
+        stack.append(val)
+        stack.append(key)
+    elif hasattr(value, "__dict__"):
+      # E.g. data types, which are fingerprinted by their attributes.
+      attrs = {k: v for k, v in vars(value).items() if k != "_key"}
+      update(f"({_type_name(cls)};".encode())
+      stack.append(attrs)
+    else:
+      update(f"{_type_name(cls)}:{value!r};".encode())
+
+  return digest.hexdigest()
@@ -15,10 +15,11 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-import component
-import datatypes
 import enum
 
+from imp.base.models import component
+from imp.base.models import datatypes
+
 
 class Signal(component.Component):
   """Base class for all signals.
@@ -30,6 +31,8 @@ class Signal(component.Component):
   - Interfaces
 
   """
+  __slots__ = ("name", "dtype")
+
   def __init__(self, name, dtype: datatypes.DataType):
     super().__init__()
     self.name = name
@@ -46,6 +49,7 @@ class Direction(enum.Enum):
 
 class Port(Signal):
   """Base class for SystemVerilog ports."""
+  __slots__ = ("direction",)
 
   def __init__(self, name, dtype, direction):
     super().__init__(name, dtype=dtype)
@@ -0,0 +1,204 @@
+"""Maps dotted paths to named components.
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import fnmatch
+
+from imp.base.models import component
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+Symbol = Tuple[str, component.Component]
+
+
+class SymbolTable:
+  """A hierarchical table of components by their full dotted path.
+
+  Besides the path of each symbol, the table keeps the paths below each
+  dotted prefix, so lookups are O(1) and prefix queries only visit the
+  matching part of the hierarchy.
+
+  A `copy` of a table only records its own changes, on top of the original
+  table, which must then no longer be changed.
+  """
+  __slots__ = ("_symbols", "_children", "_base", "_size", "_depth")
+
+  # Copies are flattened rather than layered on tables this deep.
+  MAX_DEPTH = 16
+
+  def __init__(self):
+    self._symbols: Dict[str, component.Component] = {}
+    # Paths by the path of the namespace declaring them, "" at the top level.
+    self._children: Dict[str, List[str]] = {}
+    # The table this one is a copy of, which holds the unchanged symbols.
+    self._base: Optional[SymbolTable] = None
+    self._size = 0
+    self._depth = 0
+
+  def __len__(self):
+    return self._size
+
+  def __contains__(self, path: str):
+    return path in self._symbols or (self._base is not None and path in self._base)
+
+  def __iter__(self) -> Iterator[str]:
+    return iter(self._merged()[0])
+
+  def items(self) -> Iterator[Symbol]:
+    return iter(self._merged()[0].items())
+
+  def _merged(self) -> Tuple[Dict[str, component.Component], Dict[str, List[str]]]:
+    """Returns the symbols and children of this table and the ones below it."""
+    if self._base is None:
+      return self._symbols, self._children
+    symbols, children = self._base._merged()
+    # Replaced symbols keep their position.
+    symbols = {**symbols, **self._symbols}
+    children = dict(children)
+    for namespace, paths in self._children.items():
+      children[namespace] = children.get(namespace, []) + paths
+    return symbols, children
+
+  def copy(self) -> 'SymbolTable':
+    """Returns a copy of the table, which shares the components."""
+    table = SymbolTable()
+    table._size = self._size
+    if self._depth < self.MAX_DEPTH:
+      table._base = self
+      table._depth = self._depth + 1
+    else:
+      symbols, children = self._merged()
+      table._symbols = dict(symbols)
+      table._children = {path: list(paths) for path, paths in children.items()}
+    return table
+
+  def add(self, path: str, item: component.Component, namespace: Optional[str] = None):
+    """Adds a symbol. Namespaces must be added before their members.
+
+    Args:
+      path: The path of the symbol.
+      item: The component.
+      namespace: The path of the namespace declaring the symbol, if known.
+    """
+    symbols = self._symbols
+    if path in symbols or (self._base is not None and path in self._base):
+      raise KeyError(f"A symbol named {path} already exists")
+    symbols[path] = item
+    if namespace is None:
+      namespace = path.rpartition(".")[0]
+    self._children.setdefault(namespace, []).append(path)
+    self._size += 1
+
+  def add_many(self, paths: Sequence[str], items: Sequence[component.Component],
+               namespace: Optional[str] = None):
+    """Adds several symbols, or none of them if any path already exists.
+
+    Args:
+      paths: The paths of the symbols, which must be unique.
+      items: The components, in the same order.
+      namespace: If all symbols are declared by the same namespace, its path.
+    """
+    symbols = self._symbols
+    base = self._base
+    if not symbols.keys().isdisjoint(paths) or (base is not None and any(path in base for path in paths)):
+      existing = sorted(path for path in paths if path in self)
+      raise KeyError(f"Symbols named {existing} already exist")
+    symbols.update(zip(paths, items))
+    self._size += len(paths)
+
+    children = self._children
+    if namespace is not None:
+      children.setdefault(namespace, []).extend(paths)
+    else:
+      for path in paths:
+        children.setdefault(path.rpartition(".")[0], []).append(path)
+
+  def replace(self, path: str, item: component.Component):
+    """Replaces the component of an existing symbol."""
+    if path not in self:
+      raise KeyError(path)
+    self._symbols[path] = item
+
+  def remove(self, path: str, members_only: bool = False):
+    """Removes a symbol and the symbols below it.
+
+    Args:
+      path: The path of the symbol.
+      members_only: Only removes the symbols below the path.
+    """
+    if self._base is not None:
+      # Removals aren't layered on the base table.
+      symbols, children = self._merged()
+      self._symbols = dict(symbols)
+      self._children = {namespace: list(paths) for namespace, paths in children.items()}
+      self._base = None
+      self._depth = 0
+
+    symbols = self._symbols
+    children = self._children
+    if not members_only:
+      del symbols[path]
+      children[path.rpartition(".")[0]].remove(path)
+      self._size -= 1
+    stack = [path]
+    while stack:
+      for member in children.pop(stack.pop(), ()):
+        del symbols[member]
+        self._size -= 1
+        stack.append(member)
+
+  def lookup(self, path: str) -> component.Component:
+    """Returns the component with a full path, or raises a KeyError."""
+    try:
+      return self._symbols[path]
+    except KeyError:
+      if self._base is None:
+        raise
+    return self._base.lookup(path)
+
+  def get(self, path: str, default: Optional[component.Component] = None) -> Optional[component.Component]:
+    try:
+      return self.lookup(path)
+    except KeyError:
+      return default
+
+  def with_prefix(self, prefix: str = "") -> Iterator[Symbol]:
+    """Yields the symbols whose paths start with a prefix.
+
+    Symbols are yielded depth first, each namespace followed by its members.
+    Only the members of the namespace in which the prefix ends are compared
+    to it, e.g. "top.blk.s" only looks at the names declared in "top.blk".
+    """
+    symbols, children = self._merged()
+    namespace = prefix.rpartition(".")[0]
+    stack = [iter([path for path in children.get(namespace, ()) if path.startswith(prefix)])]
+    while stack:
+      for path in stack[-1]:
+        yield path, symbols[path]
+        if path in children:
+          stack.append(iter(children[path]))
+          break
+      else:
+        stack.pop()
+
+  def glob(self, pattern: str) -> List[Symbol]:
+    """Returns the symbols whose paths match a shell-style pattern.
+
+    Wildcards also match dots, so "top.*" matches all symbols below "top".
+    Only the symbols starting with the pattern's literal prefix are matched.
+    """
+    wildcard = min((i for i in map(pattern.find, "*?[") if i >= 0), default=len(pattern))
+    return [(path, item) for path, item in self.with_prefix(pattern[:wildcard])
+            if fnmatch.fnmatchcase(path, pattern)]
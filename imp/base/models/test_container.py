@@ -0,0 +1,276 @@
+"""Tests for the base Container classes.
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import pickle
+
+import pytest
+
+from imp.base.models import comments
+from imp.base.models import component
+from imp.base.models import container
+
+
+def test_items_follow_nested_additions_in_pre_order():
+  top = container.Block()
+  first = top._add_item(container.Group())
+  c1 = top._add_item(comments.Comment("c1"))
+
+  # Adding to a child which isn't the last item of its parent.
+  c0 = first._add_item(comments.Comment("c0"))
+  assert top.items == [first, c0, c1]
+  assert top.items == list(top.iter_items(expand=True))
+
+  # Adding to the last child extends the views in place.
+  last = top._add_item(container.Group())
+  c2 = last._add_item(comments.Comment("c2"))
+  assert top.items == [first, c0, c1, last, c2]
+  assert last.items == [c2]
+
+
+def test_populated_subtree_added_to_container():
+  sub = container.Group()
+  c0 = sub._add_item(comments.Comment("c0"))
+
+  top = container.Block()
+  top._add_item(sub)
+
+  assert top.items == [sub, c0]
+  assert c0 in top
+  assert sub in top
+
+
+def test_nested_views_are_only_kept_once_read():
+  top = container.Block()
+  outer = top._add_item(container.Group())
+  inner = outer._add_item(container.Group())
+  c0 = inner._add_item(comments.Comment("c0"))
+  assert outer._flat_items is None and inner._flat_items is None
+
+  # Views built by reading a nested container are maintained from then on.
+  assert outer.items == [inner, c0]
+  c1 = inner._add_item(comments.Comment("c1"))
+  assert outer.items == [inner, c0, c1]
+  assert c1 in outer and c1 in top
+  assert top.items == [outer, inner, c0, c1]
+  assert inner._flat_items is None
+
+
+def test_contains_is_identity_based():
+  top = container.Block()
+  c0 = top._add_item(comments.Comment("c0"))
+
+  assert c0 in top
+  assert comments.Comment("c0") not in top
+  assert top not in top
+
+
+def test_pickled_container_rebuilds_views():
+  top = container.Block()
+  sub = top._add_item(container.Group())
+  sub._add_item(comments.Comment("c0"))
+
+  copy = pickle.loads(pickle.dumps(top))
+
+  assert [type(i) for i in copy.items] == [container.Group, comments.Comment]
+  assert copy.items[1] in copy
+  assert sub not in copy
+
+
+class _UnslottedGroup(container.Group):
+  pass
+
+
+def test_pickle_state():
+  top = container.Block()
+  top._add_item(comments.Comment("c0"))
+  if hasattr(object, "__getstate__"):
+    # Python 3.11 on gives slotted objects the same state.
+    assert component.Component.__getstate__(top) == object.__getstate__(top)
+
+  sub = top._add_item(_UnslottedGroup())
+  sub.label = "sub"
+  copy = pickle.loads(pickle.dumps(top))
+  assert copy.items[1].label == "sub"
+  assert copy.items[1].parent is copy
+
+
+def test_pickle_deep_hierarchy():
+  top = container.Block()
+  blk = top
+  for i in range(1500):
+    inner = blk._add_item(container.Block())
+    blk._add_named_item(f"b{i}", inner)
+    inner._add_named_item(f"c{i}", inner._add_item(comments.Comment(f"c{i}")))
+    blk = inner
+
+  copy = pickle.loads(pickle.dumps(top))
+  assert len(copy.items) == len(top.items)
+  leaf = copy.items[-1]
+  assert leaf.txt == "c1499" and leaf.parent.parent.c1498.txt == "c1498"
+  assert copy.lookup(".".join(f"b{i}" for i in range(1500)) + ".c1499") is leaf
+
+  # Nested containers are pickled along with the outermost one.
+  nested = pickle.loads(pickle.dumps(top.items[0]))
+  assert nested.items[0].txt == "c0" and nested.parent.items[0] is nested
+
+
+def test_query_by_class():
+  top = container.Block()
+  c0 = top._add_item(comments.Comment("c0"))
+  sub = top._add_item(container.Group())
+  b0 = sub._add_item(comments.Banner("b0"))
+
+  # Subclasses match, in pre-order.
+  assert top.query(comments.Comment) == [c0, b0]
+  assert top.query(comments.Banner) == [b0]
+  assert top.query(comments.Comment, expand=False) == [c0]
+  assert top.query((container.Group, comments.Banner)) == [sub, b0]
+  assert top.query(container.Block) == []
+
+  # The index is maintained as items are added, anywhere in the tree.
+  c1 = top._add_item(comments.BlockComment("c1"))
+  b1 = sub._add_item(comments.Banner("b1"))
+  assert top.query(comments.Comment) == [c0, b0, b1, c1]
+  assert sub.query(comments.Comment) == [b0, b1]
+  assert top.query(comments.Comment) == list(top.iter_items(filter_fn=lambda i: isinstance(i, comments.Comment)))
+
+
+def test_add_items_matches_add_item():
+  sub = container.Group()
+  c0 = sub._add_item(comments.Comment("c0"))
+  top = container.Block()
+  top.query(comments.Comment)
+
+  c1 = comments.Comment("c1")
+  assert top._add_items([c1, sub]) == [c1, sub]
+  assert top.items == [c1, sub, c0]
+  assert top.query(comments.Comment) == [c1, c0]
+  assert sub.parent is top and c0 in top
+
+
+def test_clone_copies_on_write():
+  top = container.Block()
+  sub = top._add_item(container.Group())
+  c0 = sub._add_item(comments.Comment("c0"))
+  c1 = top._add_item(comments.Comment("c1"))
+  top.query(comments.Comment)
+
+  clone = top.clone()
+  clone_sub = clone._items[0]
+  assert clone_sub is not sub and clone_sub.parent is clone
+  assert clone.items == [clone_sub, c0, c1]
+  assert c0 in clone and sub not in clone
+
+  c2 = clone_sub._add_item(comments.Comment("c2"))
+  c3 = top._add_item(comments.Comment("c3"))
+  assert clone.query(comments.Comment) == [c0, c2, c1]
+  assert top.query(comments.Comment) == [c0, c1, c3]
+  assert sub.items == [c0]
+
+
+def test_clone_namespaces():
+  top = container.NamespacedContainer()
+  inner = top._add_item(container.Block(name="inner"))
+  top._add_named_item("inner", inner)
+  c0 = inner._add_named_item("c0", comments.Comment("c0"))
+
+  clone = top.clone()
+  clone_inner = clone.lookup("inner")
+  assert clone_inner is not inner and clone.inner is clone_inner
+  assert clone_inner.lookup("c0") is c0
+
+  c1 = clone_inner._add_named_item("c1", comments.Comment("c1"))
+  assert [path for path, _ in clone.symbols()] == ["inner", "inner.c0", "inner.c1"]
+  assert [path for path, _ in top.symbols()] == ["inner", "inner.c0"]
+
+  # Replacing a shared item only changes the clone.
+  new_c0 = comments.Comment("new")
+  clone._replace_named_items({c0: new_c0})
+  assert clone.lookup("inner.c0") is new_c0 and clone_inner.c0 is new_c0
+  assert top.lookup("inner.c0") is c0
+  assert c1 not in top
+
+
+def test_lazy_population_and_release():
+  calls = []
+
+  def build(group):
+    calls.append(group)
+    group._add_item(comments.Comment("c0"))
+    group._add_named_item("c1", group._add_item(comments.Comment("c1")))
+
+  top = container.Block()
+  first = top._add_item(comments.Comment("first"))
+  lazy = top._add_item(container.Group(builder=build))
+  assert not lazy.populated and calls == []
+
+  # Names declared by the group are found in the enclosing namespace.
+  assert top.c1.txt == "c1"
+  assert lazy.populated and calls == [lazy]
+  assert [item.txt for item in top] == ["first", "c0", "c1"]
+
+  top.release()
+  assert not lazy.populated and lazy._items == []
+  assert top.items == [first, lazy] + lazy._items
+  assert len(calls) == 2
+  assert top.lookup("c1") is lazy._items[1]
+
+  lazy.release()
+  assert "c1" not in top._named_items
+  # Listing the symbols populates the group again.
+  assert [path for path, _ in top.symbols()] == ["c1"]
+  assert top.query(comments.Comment) == [first, *lazy._items]
+  assert len(calls) == 3
+
+
+def test_release_nested_lazy_groups():
+  def build_inner(group):
+    group._add_named_item("x", group._add_item(comments.Comment("x")))
+
+  def build_outer(group):
+    group._add_named_item("y", group._add_item(comments.Comment("y")))
+    group._add_item(container.Group(builder=build_inner))
+
+  top = container.Block()
+  outer = top._add_item(container.Group(builder=build_outer))
+  assert [path for path, _ in top.symbols()] == ["y", "x"]
+  inner = outer._items[1]
+
+  inner.release()
+  assert "x" not in top._named_items
+  outer.release()
+  assert top._named_items == {} and len(top._symbol_table) == 0
+
+  # Both groups declare their names again when used.
+  assert top.x.txt == "x" and top.y.txt == "y"
+  outer._items[1].release()
+  assert top.x.txt == "x"
+  outer.release()
+  assert top._named_items == {} and len(top._symbol_table) == 0
+
+
+def test_failed_population_is_undone():
+  def build(group):
+    group._add_named_item("c0", group._add_item(comments.Comment("c0")))
+    raise RuntimeError("failed")
+
+  top = container.Block()
+  lazy = top._add_item(container.Group(builder=build))
+  with pytest.raises(RuntimeError):
+    lazy.populate()
+  assert not lazy.populated and lazy._items == []
+  assert "c0" not in top._named_items and len(top._symbol_table) == 0
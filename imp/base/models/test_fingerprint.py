@@ -0,0 +1,62 @@
+"""Tests for component fingerprints.
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from imp.base.models import comments
+from imp.base.models import container
+from imp.base.models.fingerprint import fingerprint
+from imp.system_verilog.models import datatypes
+from imp.system_verilog.models import modules
+
+
+def _module(name="example", value=30, dtype=datatypes.IntType(), comment="comment"):
+  m = modules.Module(module_name=name)
+  m.comment(comment)
+  m.localparam(name="p1", dtype=dtype, value=value)
+  return m
+
+
+def test_identical_modules_have_the_same_fingerprint():
+  assert fingerprint(_module()) == fingerprint(_module())
+
+
+def test_fingerprint_covers_names_values_and_types():
+  reference = fingerprint(_module())
+  assert fingerprint(_module(name="other")) != reference
+  assert fingerprint(_module(value=31)) != reference
+  assert fingerprint(_module(value="30")) != reference
+  assert fingerprint(_module(dtype=datatypes.LogicType(31, 0))) != reference
+  assert fingerprint(_module(comment="other")) != reference
+
+
+def test_fingerprint_deep_hierarchy():
+  top = container.Block()
+  blk = top
+  for _ in range(1500):
+    blk = blk._add_item(container.Group())
+  assert len(fingerprint(top)) == 32
+
+
+class _UnslottedComment(comments.Comment):
+  def __init__(self, txt, prefix):
+    super().__init__(txt=txt)
+    self.prefix = prefix
+
+
+def test_fingerprint_covers_attributes_outside_slots():
+  reference = fingerprint(_UnslottedComment("comment", prefix="//"))
+  assert fingerprint(_UnslottedComment("comment", prefix="//")) == reference
+  assert fingerprint(_UnslottedComment("comment", prefix="#")) != reference
@@ -0,0 +1,119 @@
+"""Tests for the symbol table of namespaced containers.
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import pickle
+
+import pytest
+
+from imp.base.models import comments
+from imp.base.models import container
+
+
+def _named_block(parent, name):
+  blk = parent._add_item(container.Block(name=name))
+  parent._add_named_item(name, blk)
+  return blk
+
+
+def _design():
+  top = container.Block(name="top")
+  blk_a = _named_block(top, "blk_a")
+  blk_b = _named_block(blk_a, "blk_b")
+  for name in ("sig", "sig2"):
+    blk_b._add_named_item(name, comments.Comment(name))
+  top._add_named_item("sig", comments.Comment("top sig"))
+  return top
+
+
+def test_lookup_by_dotted_path():
+  top = _design()
+  assert top.lookup("blk_a.blk_b.sig") is top.blk_a.blk_b.sig
+  assert top.blk_a.lookup("blk_b.sig2").txt == "sig2"
+  with pytest.raises(KeyError):
+    top.lookup("blk_a.sig")
+
+
+def test_namespaces_built_bottom_up_are_merged():
+  blk_b = container.Block(name="blk_b")
+  blk_b._add_named_item("sig", comments.Comment("sig"))
+  blk_a = container.Block(name="blk_a")
+  blk_a._add_named_item("blk_b", blk_a._add_item(blk_b))
+  top = container.Block(name="top")
+  top._add_named_item("blk_a", top._add_item(blk_a))
+
+  # Names added to the inner namespaces later are visible from the top.
+  blk_b._add_named_item("late", comments.Comment("late"))
+  assert [path for path, _ in top.symbols()] == [
+      "blk_a", "blk_a.blk_b", "blk_a.blk_b.sig", "blk_a.blk_b.late"]
+  assert blk_b.lookup("late") is top.lookup("blk_a.blk_b.late")
+
+
+def test_prefix_and_glob_queries():
+  top = _design()
+  assert [path for path, _ in top.symbols("blk_a.blk_b.sig")] == ["blk_a.blk_b.sig", "blk_a.blk_b.sig2"]
+  assert [path for path, _ in top.blk_a.symbols("blk_b.")] == ["blk_b.sig", "blk_b.sig2"]
+  assert [path for path, _ in top.find("*.sig")] == ["blk_a.blk_b.sig"]
+  assert [path for path, _ in top.find("sig*")] == ["sig"]
+  assert [path for path, _ in top.blk_a.find("blk_?.sig?")] == ["blk_b.sig2"]
+
+
+def test_unnamed_blocks_keep_their_own_names():
+  top = container.Block()
+  anonymous = top._add_item(container.Block())
+  anonymous._add_named_item("sig", comments.Comment("sig"))
+
+  assert anonymous.lookup("sig").txt == "sig"
+  assert list(top.symbols()) == []
+
+
+def test_pickled_symbol_table():
+  top = pickle.loads(pickle.dumps(_design()))
+  assert top.lookup("blk_a.blk_b.sig") is top.blk_a.blk_b.sig
+  top.blk_a.blk_b._add_named_item("new", comments.Comment("new"))
+  assert top.lookup("blk_a.blk_b.new").txt == "new"
+
+
+def test_cloned_inner_namespace_gets_its_own_table():
+  top = _design()
+  clone = top.blk_a.clone()
+
+  assert [path for path, _ in clone.symbols()] == ["blk_b", "blk_b.sig", "blk_b.sig2"]
+  assert clone.lookup("blk_b") is clone.blk_b is not top.blk_a.blk_b
+  clone.blk_b._add_named_item("new", comments.Comment("new"))
+  assert clone.lookup("blk_b.new").txt == "new"
+  assert "blk_a.blk_b.new" not in [path for path, _ in top.symbols()]
+
+
+def test_lookup_populates_lazy_namespaces_on_its_path():
+  def build_b(blk):
+    blk._add_named_item("sig", blk._add_item(comments.Comment("sig")))
+
+  def build_a(blk):
+    blk._add_named_item("blk_b", blk._add_item(container.Block(name="blk_b", builder=build_b)))
+
+  top = container.Block()
+  blk_a = top._add_named_item("blk_a", top._add_item(container.Block(name="blk_a", builder=build_a)))
+  other = top._add_named_item("other", top._add_item(container.Block(name="other", builder=build_b)))
+
+  assert top.lookup("blk_a.blk_b.sig").txt == "sig"
+  assert blk_a.populated and not other.populated
+  with pytest.raises(KeyError):
+    top.lookup("blk_a.missing")
+
+  blk_a.release()
+  assert [path for path, _ in top.symbols()] == [
+      "blk_a", "blk_a.blk_b", "blk_a.blk_b.sig", "other", "other.sig"]
@@ -0,0 +1,103 @@
+"""Cache of formatted text, keyed by the fingerprint of the emitted items.
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import collections
+import os
+import pathlib
+import tempfile
+import threading
+
+from typing import Optional, Union
+
+
+class EmissionCache:
+  """An LRU cache of formatted text, optionally backed by a directory.
+
+  Entries evicted from memory are still found in the cache directory, which
+  can be shared between runs and processes.
+  """
+
+  def __init__(self, max_entries: int = 1024, directory: Optional[Union[str, os.PathLike]] = None):
+    self.max_entries = max_entries
+    self.directory = pathlib.Path(directory) if directory is not None else None
+    if self.directory is not None:
+      self.directory.mkdir(parents=True, exist_ok=True)
+    self._entries = collections.OrderedDict()
+    self._lock = threading.Lock()
+
+  def __getstate__(self):
+    state = self.__dict__.copy()
+    del state["_lock"]
+    return state
+
+  def __setstate__(self, state):
+    self.__dict__.update(state)
+    self._lock = threading.Lock()
+
+  def __len__(self):
+    return len(self._entries)
+
+  def _path(self, key: str) -> pathlib.Path:
+    return self.directory / key[:2] / f"{key}.txt"
+
+  def get(self, key: str) -> Optional[str]:
+    """Returns the text stored for a key, or None."""
+    with self._lock:
+      text = self._entries.get(key)
+      if text is not None:
+        self._entries.move_to_end(key)
+        return text
+
+    if self.directory is None:
+      return None
+    try:
+      with open(self._path(key), encoding="utf-8", newline="") as f:
+        text = f.read()
+    except FileNotFoundError:
+      return None
+    self._remember(key, text)
+    return text
+
+  def put(self, key: str, text: str):
+    """Stores the text for a key."""
+    self._remember(key, text)
+    if self.directory is None:
+      return
+
+    path = self._path(key)
+    path.parent.mkdir(exist_ok=True)
+    # Write to a temporary file first, so readers never see partial entries.
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+      with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+        f.write(text)
+      os.replace(tmp_path, path)
+    except BaseException:
+      os.unlink(tmp_path)
+      raise
+
+  def _remember(self, key: str, text: str):
+    with self._lock:
+      self._entries[key] = text
+      self._entries.move_to_end(key)
+      while len(self._entries) > self.max_entries:
+        self._entries.popitem(last=False)
+
+  def clear(self):
+    """Clears the in-memory entries. The cache directory is left as is."""
+    with self._lock:
+      self._entries.clear()
@@ -0,0 +1,98 @@
+"""Writes generated code to files, skipping files whose content is unchanged.
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+import pathlib
+import shutil
+import threading
+import uuid
+
+from typing import Union
+
+PathType = Union[str, os.PathLike]
+
+_CHUNK_SIZE = 1 << 16
+
+
+def _same_content(path_a: pathlib.Path, path_b: pathlib.Path) -> bool:
+  """Returns True if both files have the same bytes."""
+  if path_a.stat().st_size != path_b.stat().st_size:
+    return False
+  with open(path_a, "rb") as file_a, open(path_b, "rb") as file_b:
+    while True:
+      chunk = file_a.read(_CHUNK_SIZE)
+      if chunk != file_b.read(_CHUNK_SIZE):
+        return False
+      if not chunk:
+        return True
+
+
+class FileOutput:
+  """Writes files through a Writer, leaving unchanged files untouched.
+
+  New content is first streamed to a temporary file next to the target, and
+  then compared with the existing file. Unchanged files keep their
+  modification time, so build tools downstream don't recompile them. Changed
+  files are atomically replaced, so readers never see partial content.
+
+  Attributes:
+    written: The number of files created or replaced.
+    skipped: The number of files left untouched as their content was unchanged.
+  """
+
+  def __init__(self, writer=None):
+    self.writer = writer
+    self.written = 0
+    self.skipped = 0
+    self._lock = threading.Lock()
+
+  def write(self, item, path: PathType) -> bool:
+    """Writes the text for an item to a file.
+
+    Returns:
+      True if the file was written, False if it was already up to date.
+    """
+    return self._write(path, lambda f: self.writer.write_to(item, f))
+
+  def write_text(self, text: str, path: PathType) -> bool:
+    """Writes text to a file, see `write`."""
+    return self._write(path, lambda f: f.write(text.encode()))
+
+  def _write(self, path: PathType, write_fn) -> bool:
+    path = pathlib.Path(path)
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+      with open(tmp_path, "xb") as f:
+        write_fn(f)
+
+      unchanged = path.exists() and _same_content(path, tmp_path)
+      if unchanged:
+        tmp_path.unlink()
+      else:
+        if path.exists():
+          shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+      tmp_path.unlink(missing_ok=True)
+      raise
+
+    with self._lock:
+      if unchanged:
+        self.skipped += 1
+      else:
+        self.written += 1
+    return not unchanged
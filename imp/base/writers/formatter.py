@@ -15,26 +15,86 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-import functools
+import copy
+import io
 
+from imp.base.writers import token_buffer
 from imp.base.writers import tokens
 from imp.base.writers.tokens import Token, Null, Name, Indent, Dedent, Space, NewLine, Keyword
 
 
+def is_binary(sink) -> bool:
+  """Returns True if text written to the sink must be encoded first."""
+  return isinstance(sink, (io.RawIOBase, io.BufferedIOBase))
+
+
 class Formatter:
-  """Class to convert a token stream to formatted text."""
+  """Class to convert a token stream to formatted text.
 
-  def __init__(self, tab: str = "  ", debug=False):
-    self._lines = []
-    self._current_line = []
-    self._prefix = []
+  By default the formatted lines are kept in memory and returned by `text`.
+  When reset with a sink, finished lines are instead written to the sink
+  through a write buffer of roughly `buffer_size` characters, so memory use
+  doesn't depend on the size of the output. Call `finish` once all tokens
+  have been processed to write out the remaining text.
+
+  Tokens and lines can be counted by attaching an Instrumentation with
+  `set_instrumentation`. `debug=True` instead prints every token, which is
+  only practical for small inputs.
+  """
+
+  def __init__(self, tab: str = "  ", debug=False, buffer_size: int = 1 << 16):
     self._tab = tab
     self._debug = debug
+    self._buffer_size = buffer_size
+    # Bound handlers by token type, and indentation prefixes by depth.
+    self._handlers = {}
+    self._prefixes = [""]
+    self.instrumentation = None
+    self.reset()
+
+  def set_instrumentation(self, instrumentation):
+    """Attaches an Instrumentation, or detaches it when given None."""
+    self.instrumentation = instrumentation
+    self._handlers = {}
+    self._instrument_lines()
+
+  def _instrument_lines(self):
+    self.__dict__.pop("emit_line", None)
+    if self.instrumentation is not None:
+      self.emit_line = self.instrumentation.wrap_emit_line(self.emit_line)
+
+  def __getstate__(self):
+    # Handlers wrapped by instrumentation can't be pickled, and are dropped.
+    state = self.__dict__.copy()
+    state["_handlers"] = {}
+    state.pop("emit_line", None)
+    state["instrumentation"] = None
+    return state
 
-  def reset(self):
+  def clone(self) -> 'Formatter':
+    """Returns a formatter with the same configuration and a fresh state."""
+    clone = copy.copy(self)
+    clone._handlers = {}
+    clone._prefixes = [""]
+    clone.instrumentation = self.instrumentation
+    clone.reset()
+    return clone
+
+  def reset(self, sink=None):
+    """Clears the formatter state, optionally streaming to a new sink.
+
+    Args:
+      sink: A text or binary file-like object. Binary sinks receive UTF-8.
+    """
     self._lines = []
     self._current_line = []
-    self._prefix = []
+    self._depth = 0
+    self._prefix = ""
+    self._sink = sink
+    self._encode = sink is not None and is_binary(sink)
+    self._buffered = 0
+    self._line_count = 0
+    self._instrument_lines()
 
   @property
   def text(self):
@@ -42,79 +102,201 @@ class Formatter:
     txt += "".join(self._current_line)
     return txt
 
+  def emit_line(self, line: str):
+    """Adds a finished line to the output."""
+    if self._sink is None:
+      self._lines.append(line)
+      return
+
+    if self._line_count:
+      line = "\n" + line
+    self._line_count += 1
+    self._lines.append(line)
+    self._buffered += len(line)
+    if self._buffered >= self._buffer_size:
+      self.flush()
+
+  def flush(self):
+    """Writes the buffered lines to the sink."""
+    if self._sink is None or not self._lines:
+      return
+    chunk = "".join(self._lines)
+    self._sink.write(chunk.encode() if self._encode else chunk)
+    self._lines = []
+    self._buffered = 0
+
+  def finish(self):
+    """Writes the remaining text, including any unfinished line, to the sink."""
+    if self._sink is None:
+      return
+    if self._current_line:
+      self._lines.append("".join(self._current_line))
+      self._current_line = []
+    self.flush()
 
   def print(self):
     print(self.text)
 
-  def process_tokens(self, token_generator, debug=False):
-    """Main token processing method."""
+  @property
+  def debug(self) -> bool:
+    """Whether tokens are printed as they are processed, by default."""
+    return self._debug
 
-    self._debug = debug
+  def process_tokens(self, token_generator, debug=None):
+    """Main token processing method.
+
+    Args:
+      token_generator: The tokens to format.
+      debug: Whether to print each token. Defaults to the formatter's `debug`.
+    """
+    if debug is None:
+      debug = self._debug
+    if debug:
+      token_generator = self._trace_tokens(token_generator)
+
+    handlers = self._handlers
+    for token in token_generator:
+      try:
+        handler = handlers[type(token)]
+      except KeyError:
+        handler = self._resolve_handler(type(token))
+      handler(token)
+
+  def process_buffer(self, buffer: token_buffer.TokenBuffer):
+    """Formats the contents of a TokenBuffer.
+
+    Produces the same text as process_tokens does for the tokens the buffer
+    was built from. Buffers only keep the words of tokens, not their types,
+    so formatters which override token handlers can't format them. With
+    instrumentation attached, the buffer is replayed as tokens so that they
+    are counted.
+
+    Raises:
+      ValueError: if the formatter overrides token handlers.
+    """
+    if self._overrides_handlers():
+      raise ValueError(f"{type(self).__name__} overrides token handlers, and can only "
+                       "format tokens, not TokenBuffers.")
+    if self.instrumentation is not None:
+      self.process_tokens(iter(buffer))
+      return
+
+    strings = buffer.strings
+    append = self._current_line.append
+    for kind, value in zip(buffer.kinds, buffer.values):
+      if kind == token_buffer.WORD:
+        append(strings[value])
+      elif kind == token_buffer.NEWLINE:
+        self.handle_return(None)
+        append = self._current_line.append
+      elif kind == token_buffer.INDENT:
+        self.handle_indent(None)
+      else:
+        self.handle_dedent(None)
 
+  def _overrides_handlers(self) -> bool:
+    cls = type(self)
+    if cls._handler_names is not Formatter._handler_names:
+      return True
+    return any(getattr(cls, name) is not getattr(Formatter, name)
+               for name in ("handle", *Formatter._handler_names.values()))
+
+  def _trace_tokens(self, token_generator):
+    """Prints each token along with the formatter's state."""
     for token in token_generator:
-      if debug:
-        trace = f"({token.trace})" if token.trace else ''
-        print(f"Token:{str(token):30} {trace:20} prefix:{str(self._prefix):12}  line:{self._current_line}")
-        if isinstance(token, NewLine):
-          print("\n")
+      trace = f"({token.trace})" if getattr(token, "trace", None) else ''
+      print(f"Token:{token!r:30} {trace:20} prefix:{self._prefix!r:12}  line:{self._current_line}")
+      if isinstance(token, NewLine):
+        print("\n")
+      yield token
 
-      if isinstance(token, tokens.TokenStream):
-        raise ValueError(f"Found a TokenStream instead of a Token. "
-                         " The tokenizer should use 'yield from'.")
+  def _resolve_handler(self, token_type: type):
+    """Finds, caches and returns the handler for a token type."""
+    if issubclass(token_type, tokens.TokenStream):
+      raise ValueError(f"Found a TokenStream instead of a Token. "
+                       " The tokenizer should use 'yield from'.")
 
-      if not isinstance(token, Token):
-        raise ValueError(f"Unexpected token type: {token} {type(token)}")
+    for cls in token_type.__mro__:
+      if cls in self._handler_names:
+        handler = getattr(self, self._handler_names[cls])
+        if self.instrumentation is not None:
+          handler = self.instrumentation.wrap_token_handler(handler, token_type)
+        self._handlers[token_type] = handler
+        return handler
 
-      self.handle(token)
+    raise ValueError(f"Unexpected token type: {token_type}")
 
+  # Direct emission. Emitters write words and formatting with these methods
+  # rather than through tokens. Words are added as they are, so emitters must
+  # only be used with formatters which don't transform them.
 
   def add_word(self, word):
     self._current_line.append(word)
 
+  def newline(self):
+    self.handle_return(None)
+
+  def indent(self):
+    self.handle_indent(None)
+
+  def dedent(self):
+    self.handle_dedent(None)
+
   # ----------------------------------------
   # Handlers
   # ----------------------------------------
-  @functools.singledispatchmethod
+
+  # Handler method names by token class. Tokens are dispatched to the handler
+  # of the nearest class in their MRO, which is resolved once per type.
+  _handler_names = {
+    Token: "handle_token",
+    Null: "handle_null",
+    Name: "handle_identifier",
+    Keyword: "handle_keyword",
+    Indent: "handle_indent",
+    Dedent: "handle_dedent",
+    Space: "handle_space",
+    NewLine: "handle_return",
+  }
+
   def handle(self, token: Token):
-    ...
+    try:
+      handler = self._handlers[type(token)]
+    except KeyError:
+      handler = self._resolve_handler(type(token))
+    handler(token)
 
-  @handle.register
   def handle_null(self, token: Null):
     pass
 
-  @handle.register
   def handle_token(self, token: Token):
-    value = str(token.value)
-    self.add_word(value)
+    self._current_line.append(str(token.value))
 
-  @handle.register
   def handle_identifier(self, token: Name):
-    value = str(token.value)
-    self.add_word(value)
+    self._current_line.append(str(token.value))
 
-  @handle.register
   def handle_keyword(self, token: Keyword):
-    value = str(token.value)
-    self.add_word(value)
+    self._current_line.append(str(token.value))
 
-  @handle.register
   def handle_indent(self, token: Indent):
-    self._prefix.append(self._tab)
+    self._depth += 1
+    if self._depth == len(self._prefixes):
+      self._prefixes.append(self._tab * self._depth)
+    self._prefix = self._prefixes[self._depth]
 
-  @handle.register
   def handle_dedent(self, token: Dedent):
-    self._prefix.pop()
+    if not self._depth:
+      raise ValueError("Found a Dedent token without a matching Indent.")
+    self._depth -= 1
+    self._prefix = self._prefixes[self._depth]
 
-  @handle.register
   def handle_space(self, token: Space):
-    self.add_word(' ' * token.n)
+    self._current_line.append(token.value)
 
-  @handle.register
   def handle_return(self, token: NewLine):
     # Only add white space if something follows it.
     if self._current_line:
-      self._lines.append("".join(list(self._prefix) + self._current_line))
+      self.emit_line(self._prefix + "".join(self._current_line))
+      self._current_line = []
     else:
-      self._lines.append("")
-    self._current_line = []
-
+      self.emit_line("")
@@ -0,0 +1,245 @@
+"""Counters and timings for tokenizers and formatters.
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import collections
+import functools
+import json
+import os
+import threading
+import time
+
+from typing import Callable, Dict, Union
+
+
+class Timing:
+  """Accumulated calls and times, in nanoseconds, of a handler."""
+  __slots__ = ("calls", "inclusive_ns", "self_ns")
+
+  def __init__(self):
+    self.calls = 0
+    self.inclusive_ns = 0
+    self.self_ns = 0
+
+  def __repr__(self):
+    return f"Timing(calls={self.calls}, inclusive_ns={self.inclusive_ns}, self_ns={self.self_ns})"
+
+
+class Instrumentation:
+  """Collects counters and timings from tokenizers and formatters.
+
+  Instrumentation is attached with the `set_instrumentation` method of a
+  tokenizer, formatter or writer. It works by wrapping the handlers stored in
+  their dispatch tables, so nothing is measured, and nothing is paid, by
+  tokenizers and formatters without instrumentation.
+
+  Collected are:
+    tokens_by_type: Tokens processed by formatters, by token class name.
+    lines, bytes: Lines finished by formatters, and their UTF-8 size
+      including the new line.
+    handler_times: Timing of each tokenizer function (or its emitter) by
+      name.
+    class_times: Timing of each component class.
+
+  Times exclude the time spent formatting tokens. The inclusive time of a
+  handler includes the handlers of its children, while its self time doesn't.
+  IterativeSystemVerilogTokenizer runs the handlers of children itself
+  rather than through their parents, so there both times are the same, but
+  emitters still include their children.
+  With trace=True, each handler call is also recorded as an event for
+  `write_chrome_trace`.
+
+  Counters may be approximate when instrumented objects are used from
+  several threads at once. Instrumentation isn't carried over to the worker
+  processes of SystemVerilogWriter.write_many.
+  """
+
+  def __init__(self, trace: bool = False, clock: Callable[[], int] = time.perf_counter_ns):
+    self.trace = trace
+    self._clock = clock
+    self._local = threading.local()
+    self._wrapped = {}
+    self.reset()
+
+  def reset(self):
+    """Clears the collected counters, timings and trace events."""
+    self.tokens_by_type = collections.Counter()
+    self.lines = 0
+    self.bytes = 0
+    self.handler_times: Dict[str, Timing] = collections.defaultdict(Timing)
+    self.class_times: Dict[str, Timing] = collections.defaultdict(Timing)
+    self.events = []
+
+  def _stack(self):
+    # Time spent in the children of each running handler, per thread.
+    try:
+      return self._local.stack
+    except AttributeError:
+      stack = self._local.stack = []
+      return stack
+
+  def _record(self, handler_name, cls_name, start, end, inclusive, exclusive):
+    for timing in (self.handler_times[handler_name], self.class_times[cls_name]):
+      timing.calls += 1
+      timing.inclusive_ns += inclusive
+      timing.self_ns += exclusive
+    if self.trace:
+      self.events.append((handler_name, cls_name, start, end, threading.get_ident()))
+
+  # ----------------------------------------
+  # Tokenizer hooks
+  # ----------------------------------------
+
+  def wrap_tokenizer(self, tokenizer_fn):
+    """Returns a timed version of a tokenizer function and its emitter."""
+    try:
+      return self._wrapped[tokenizer_fn]
+    except KeyError:
+      pass
+
+    name = tokenizer_fn.__qualname__
+
+    @functools.wraps(tokenizer_fn)
+    def timed_tokenizer(item, tokenize):
+      return self._timed_tokens(tokenizer_fn(item, tokenize=tokenize), name, type(item).__name__)
+
+    if (emitter := tokenizer_fn.__dict__.get('emitter')) is not None:
+      timed_tokenizer.__dict__['emitter'] = self._timed_emitter(emitter, name)
+    self._wrapped[tokenizer_fn] = timed_tokenizer
+    return timed_tokenizer
+
+  def _timed_tokens(self, token_iter, handler_name, cls_name):
+    # Only the time spent producing each token is counted, not the time the
+    # consumer spends with it.
+    clock = self._clock
+    stack = self._stack()
+    token_iter = iter(token_iter)
+    inclusive = exclusive = 0
+    first = None
+    while True:
+      stack.append(0)
+      start = clock()
+      if first is None:
+        first = start
+      try:
+        token = next(token_iter)
+        done = False
+      except StopIteration:
+        done = True
+      except BaseException:
+        stack.pop()
+        raise
+      elapsed = clock() - start
+      children = stack.pop()
+      inclusive += elapsed
+      exclusive += elapsed - children
+      if stack:
+        stack[-1] += elapsed
+      if done:
+        break
+      yield token
+    self._record(handler_name, cls_name, first, clock(), inclusive, exclusive)
+
+  def _timed_emitter(self, emitter, handler_name):
+
+    @functools.wraps(emitter)
+    def timed_emitter(item, out, emit):
+      clock = self._clock
+      stack = self._stack()
+      stack.append(0)
+      start = clock()
+      try:
+        emitter(item, out, emit)
+      finally:
+        end = clock()
+        elapsed = end - start
+        children = stack.pop()
+        if stack:
+          stack[-1] += elapsed
+        self._record(handler_name, type(item).__name__, start, end, elapsed, elapsed - children)
+
+    return timed_emitter
+
+  # ----------------------------------------
+  # Formatter hooks
+  # ----------------------------------------
+
+  def wrap_token_handler(self, handler, token_type: type):
+    """Returns a formatter token handler which counts the tokens."""
+    counts = self.tokens_by_type
+    name = token_type.__name__
+
+    def counting_handler(token):
+      counts[name] += 1
+      handler(token)
+
+    return counting_handler
+
+  def wrap_emit_line(self, emit_line):
+    """Returns a formatter emit_line method which counts lines and bytes."""
+
+    def counting_emit_line(line):
+      self.lines += 1
+      self.bytes += len(line.encode()) + 1
+      emit_line(line)
+
+    return counting_emit_line
+
+  # ----------------------------------------
+  # Reports
+  # ----------------------------------------
+
+  def summary(self, limit: int = 20) -> str:
+    """Returns a table of the counters, and of the slowest handlers and classes."""
+    lines = [
+        f"tokens: {sum(self.tokens_by_type.values())}  lines: {self.lines}  bytes: {self.bytes}",
+    ]
+    for title, timings in (("handler", self.handler_times), ("component class", self.class_times)):
+      lines.append("")
+      lines.append(f"{title:<48} {'calls':>9} {'self (ms)':>10} {'incl (ms)':>10}")
+      ranked = sorted(timings.items(), key=lambda kv: kv[1].self_ns, reverse=True)
+      for name, timing in ranked[:limit]:
+        lines.append(f"{name:<48} {timing.calls:>9} {timing.self_ns / 1e6:>10.3f} "
+                     f"{timing.inclusive_ns / 1e6:>10.3f}")
+
+    lines.append("")
+    lines.append(f"{'token type':<48} {'count':>9}")
+    for name, count in self.tokens_by_type.most_common(limit):
+      lines.append(f"{name:<48} {count:>9}")
+    return "\n".join(lines)
+
+  def chrome_trace(self) -> dict:
+    """Returns the trace events in the Chrome trace event format.
+
+    Each event spans a handler call from its start to its end. For tokenizer
+    functions, that includes the time spent formatting their tokens.
+    """
+    pid = os.getpid()
+    events = [{
+        "name": handler_name,
+        "cat": cls_name,
+        "ph": "X",
+        "ts": start / 1e3,
+        "dur": (end - start) / 1e3,
+        "pid": pid,
+        "tid": tid,
+    } for handler_name, cls_name, start, end, tid in self.events]
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+  def write_chrome_trace(self, path: Union[str, os.PathLike]):
+    """Writes the trace events to a JSON file, for chrome://tracing or Perfetto."""
+    with open(path, "w", encoding="utf-8") as f:
+      json.dump(self.chrome_trace(), f)
@@ -43,16 +43,70 @@ class tokenizer_for:
     for fn in tokenizer_functions:
       target = fn.__dict__['tokenizer_for']
       self.handlers_by_token_cls[target] = fn
+
+  Tokenizers for immutable, hashable components (e.g. data types) can pass
+  memoize=True. Model tokenizers may then cache the tokens produced for each
+  component and replay them, rather than calling the function again.
   """
 
-  def __init__(self, component_cls):
+  def __init__(self, component_cls, memoize: bool = False):
     self.target = component_cls
+    self.memoize = memoize
 
   def __call__(self, tokenizer_fn):
     tokenizer_fn.__dict__['tokenizer_for'] = self.target
+    tokenizer_fn.__dict__['memoize'] = self.memoize
+    tokenizer_fn.__dict__.setdefault('emitter', None)
     return tokenizer_fn
 
 
+class emitter_for:
+  """Class based decorator for emitter functions.
+
+  An emitter is an optional fast path for a tokenizer function. Rather than
+  yielding tokens, it writes the same text directly to a formatter, using
+  its add_word, newline, indent and dedent methods, and calls `emit` for
+  child components:
+
+    @emitter_for(tokenize_comments)
+    def emit_comments(comment: Comment, out, emit):
+      out.add_word("// " + str(comment.txt))
+
+  Formatting the tokens from the tokenizer function and calling the emitter
+  must produce identical text. Model tokenizers use the emitter whenever the
+  tokenizer function it is attached to handles a component.
+  """
+
+  def __init__(self, tokenizer_fn):
+    self.tokenizer_fn = tokenizer_fn
+
+  def __call__(self, emitter_fn):
+    self.tokenizer_fn.__dict__['emitter'] = emitter_fn
+    return emitter_fn
+
+
+class Descend:
+  """A request, yielded by a handler, to tokenize a child component.
+
+  Iterative tokenizer drivers pass the Descend class to handlers as their
+  `tokenize` callback. `yield from tokenize(child)` then yields the request to
+  the driver, which tokenizes the child before resuming the handler.
+  """
+  __slots__ = ("item",)
+
+  def __init__(self, item):
+    self.item = item
+
+  def __iter__(self):
+    yield self
+
+  def __add__(self, other):
+    return tokens.TokenStream([self, other])
+
+  def __radd__(self, other):
+    return tokens.TokenStream([other, self])
+
+
 class ModelTokenizer:
   """Produces tokens from components/containers."""
 
@@ -0,0 +1,42 @@
+"""Tests for the EmissionCache.
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from imp.base.writers import emission_cache
+
+
+def test_lru_eviction():
+  cache = emission_cache.EmissionCache(max_entries=2)
+  cache.put("a", "A")
+  cache.put("b", "B")
+  assert cache.get("a") == "A"
+  cache.put("c", "C")
+
+  assert cache.get("b") is None
+  assert cache.get("a") == "A"
+  assert cache.get("c") == "C"
+  assert len(cache) == 2
+
+
+def test_directory_backed_entries(tmp_path):
+  cache = emission_cache.EmissionCache(max_entries=1, directory=tmp_path)
+  cache.put("a0", "A\r\n")
+  cache.put("b0", "B")
+
+  # Evicted from memory, and still found on disk, also by another cache.
+  assert cache.get("a0") == "A\r\n"
+  assert emission_cache.EmissionCache(directory=tmp_path).get("b0") == "B"
+  assert not list(tmp_path.glob("**/*.tmp"))
@@ -0,0 +1,62 @@
+"""Tests for FileOutput.
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+
+from imp.base.writers import file_output
+
+
+def test_skips_unchanged_files(tmp_path):
+  path = tmp_path / "out.sv"
+  output = file_output.FileOutput()
+
+  assert output.write_text("module a;\n", path)
+  os.utime(path, ns=(0, 0))
+
+  assert not output.write_text("module a;\n", path)
+  assert path.stat().st_mtime_ns == 0
+
+  assert output.write_text("module b;\n", path)
+  assert path.read_text() == "module b;\n"
+
+  assert (output.written, output.skipped) == (2, 1)
+  assert os.listdir(tmp_path) == ["out.sv"]
+
+
+def test_keeps_file_mode(tmp_path):
+  path = tmp_path / "out.sv"
+  path.write_text("old")
+  path.chmod(0o640)
+
+  file_output.FileOutput().write_text("new", path)
+  assert path.stat().st_mode & 0o777 == 0o640
+
+
+class _EchoWriter:
+  """Writes items, which are strings, as is."""
+
+  def write_to(self, item, stream):
+    stream.write(item.encode())
+
+
+def test_write_streams_items_through_the_writer(tmp_path):
+  path = tmp_path / "out.sv"
+  output = file_output.FileOutput(writer=_EchoWriter())
+
+  assert output.write("module a;\n", path)
+  assert not output.write("module a;\n", path)
+  assert path.read_text() == "module a;\n"
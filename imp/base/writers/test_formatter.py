@@ -0,0 +1,112 @@
+"""Tests for the Formatter.
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import io
+
+import pytest
+
+from imp.base.writers import formatter
+from imp.base.writers import tokens
+
+
+def _tokens():
+  yield from tokens.Keyword("module") + tokens.Space() + tokens.Name("m") + tokens.NewLine()
+  yield tokens.Indent()
+  for i in range(50):
+    yield from tokens.Keyword("wire") + tokens.Space() + tokens.Name(f"w{i}") + tokens.Symbol(";")
+    yield tokens.NewLine()
+  yield tokens.NewLine()
+  yield tokens.Dedent()
+  yield from tokens.Keyword("endmodule")
+
+
+def _in_memory_text():
+  fmt = formatter.Formatter()
+  fmt.process_tokens(_tokens())
+  return fmt.text
+
+
+@pytest.mark.parametrize("buffer_size", [1, 16, 1 << 16])
+def test_streaming_matches_in_memory_text(buffer_size):
+  sink = io.StringIO()
+  fmt = formatter.Formatter(buffer_size=buffer_size)
+  fmt.reset(sink=sink)
+  fmt.process_tokens(_tokens())
+  fmt.finish()
+
+  assert sink.getvalue() == _in_memory_text()
+
+
+def test_streaming_to_binary_sink():
+  sink = io.BytesIO()
+  fmt = formatter.Formatter(buffer_size=32)
+  fmt.reset(sink=sink)
+  fmt.process_tokens(_tokens())
+  fmt.finish()
+
+  assert sink.getvalue() == _in_memory_text().encode()
+
+
+def test_streaming_flushes_finished_lines():
+  sink = io.StringIO()
+  fmt = formatter.Formatter(buffer_size=1)
+  fmt.reset(sink=sink)
+  fmt.process_tokens(tokens.Name("a") + tokens.NewLine() + tokens.Name("b"))
+
+  # The unfinished line is only written by finish().
+  assert sink.getvalue() == "a"
+  fmt.finish()
+  # Like Formatter.text, the unfinished line isn't preceded by a new line.
+  assert sink.getvalue() == "ab"
+
+
+def test_nested_indentation():
+  fmt = formatter.Formatter(tab="\t")
+  fmt.process_tokens([
+      tokens.Name("a"), tokens.NEWLINE, tokens.INDENT,
+      tokens.Name("b"), tokens.NEWLINE, tokens.INDENT,
+      tokens.Keyword("c"), tokens.Space(2), tokens.Symbol(";"), tokens.NEWLINE,
+      tokens.NEWLINE, tokens.DEDENT,
+      tokens.Null(), tokens.Literal(1), tokens.NEWLINE, tokens.DEDENT,
+      tokens.Name("e"), tokens.NEWLINE,
+  ])
+  assert fmt.text == "a\n\tb\n\t\tc  ;\n\n\t1\ne"
+
+
+def test_unbalanced_dedent():
+  fmt = formatter.Formatter()
+  with pytest.raises(ValueError):
+    fmt.process_tokens([tokens.DEDENT])
+
+
+def test_rejects_non_tokens():
+  fmt = formatter.Formatter()
+  with pytest.raises(ValueError, match="yield from"):
+    fmt.process_tokens([tokens.Name("a") + tokens.Name("b")])
+  with pytest.raises(ValueError):
+    fmt.process_tokens(["a"])
+
+
+def test_debug_mode_is_kept(capsys):
+  fmt = formatter.Formatter(debug=True)
+  fmt.process_tokens([tokens.Name("a")], debug=False)
+  assert capsys.readouterr().out == ""
+  assert fmt.debug
+
+  fmt.process_tokens([tokens.Name("b")])
+  assert "Token:" in capsys.readouterr().out
+  assert fmt.text == "ab"
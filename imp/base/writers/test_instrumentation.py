@@ -0,0 +1,111 @@
+"""Tests for Instrumentation.
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+import pickle
+
+import pytest
+
+from imp.base.models import comments
+from imp.base.models import container
+from imp.base.writers import instrumentation
+from imp.system_verilog.models import datatypes
+from imp.system_verilog.models import modules
+from imp.system_verilog.writers import systemverilog_tokenizer
+from imp.system_verilog.writers import systemverilog_writer
+
+
+class FakeClock:
+  """Advances by one nanosecond per reading."""
+
+  def __init__(self):
+    self.now = 0
+
+  def __call__(self):
+    self.now += 1
+    return self.now
+
+
+def _module():
+  m = modules.Module(module_name="example")
+  m.localparam(name="p0", dtype=datatypes.IntType(), value=1)
+  m.localparam(name="p1", dtype=datatypes.IntType(), value=2)
+  blk = m._add_item(container.Block())
+  blk._add_item(comments.Comment("c"))
+  return m
+
+
+@pytest.mark.parametrize("direct", [False, True])
+def test_counts_and_timings(direct):
+  inst = instrumentation.Instrumentation(clock=FakeClock())
+  # The recursive tokenizer runs the handlers of children within their parents.
+  writer = systemverilog_writer.SystemVerilogWriter(
+      tokenizer=systemverilog_tokenizer.SystemVerilogTokenizer(), direct=direct)
+  expected = writer.get_text_for(_module())
+
+  writer.set_instrumentation(inst)
+  assert writer.get_text_for(_module()) == expected
+
+  # The last line is finished too, though Formatter.text omits its new line.
+  assert inst.lines == expected.count("\n") + 1
+  assert inst.bytes == len(expected) + 1
+  assert inst.handler_times["localparam_declaration_tokenizer"].calls == 2
+  assert inst.class_times["LocalParamDeclaration"].calls == 2
+  assert inst.class_times["Block"].calls == 1
+  module = inst.handler_times["module_tokenizer"]
+  assert 0 < module.self_ns < module.inclusive_ns
+  if not direct:
+    assert inst.tokens_by_type["Identifier"] == 3
+  assert "module_tokenizer" in inst.summary()
+
+
+def test_detached_instrumentation_collects_nothing():
+  inst = instrumentation.Instrumentation()
+  writer = systemverilog_writer.SystemVerilogWriter()
+  writer.set_instrumentation(inst)
+  writer.set_instrumentation(None)
+  writer.get_text_for(_module())
+
+  assert inst.lines == 0
+  assert not inst.handler_times
+  assert not inst.tokens_by_type
+
+
+def test_chrome_trace(tmp_path):
+  inst = instrumentation.Instrumentation(trace=True, clock=FakeClock())
+  writer = systemverilog_writer.SystemVerilogWriter()
+  writer.set_instrumentation(inst)
+  writer.get_text_for(_module())
+
+  path = tmp_path / "trace.json"
+  inst.write_chrome_trace(path)
+  events = json.loads(path.read_text())["traceEvents"]
+  names = [e["name"] for e in events]
+  assert names.count("inttype_tokenizer") == 1  # Memoized.
+  module = events[names.index("module_tokenizer")]
+  assert all(module["ts"] <= e["ts"] and e["ts"] + e["dur"] <= module["ts"] + module["dur"]
+             for e in events)
+
+
+def test_instrumented_writer_pickles_without_instrumentation():
+  writer = systemverilog_writer.SystemVerilogWriter()
+  writer.set_instrumentation(instrumentation.Instrumentation())
+  writer.get_text_for(_module())
+
+  copy = pickle.loads(pickle.dumps(writer))
+  assert copy.tokenizer.instrumentation is None
+  assert copy.get_text_for(_module()) == writer.get_text_for(_module())
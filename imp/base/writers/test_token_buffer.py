@@ -0,0 +1,104 @@
+"""Tests for the TokenBuffer.
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import pickle
+
+import pytest
+
+from imp.base.writers import formatter
+from imp.base.writers import instrumentation
+from imp.base.writers import token_buffer
+from imp.base.writers import tokens
+
+
+def _tokens():
+  return [
+      tokens.Name("a"), tokens.NEWLINE, tokens.INDENT,
+      tokens.Keyword("b"), tokens.Space(2), tokens.Symbol(";"), tokens.NEWLINE,
+      tokens.NEWLINE, tokens.Null(), tokens.Literal(1), tokens.NEWLINE, tokens.DEDENT,
+      tokens.Name("a"),
+  ]
+
+
+def _text(token_iter):
+  fmt = formatter.Formatter()
+  fmt.process_tokens(token_iter)
+  return fmt.text
+
+
+def test_buffer_formats_like_tokens():
+  buffer = token_buffer.TokenBuffer(_tokens())
+  fmt = formatter.Formatter()
+  fmt.process_buffer(buffer)
+
+  assert fmt.text == _text(_tokens()) == "a\n  b  ;\n\n  1a"
+  # Null tokens are dropped, and repeated words share a string table entry.
+  assert len(buffer) == len(_tokens()) - 1
+  assert buffer.strings == ["a", "b", "  ", ";", "1"]
+
+
+def test_buffer_replays_as_tokens():
+  buffer = token_buffer.TokenBuffer(_tokens())
+  assert _text(buffer) == _text(_tokens())
+  assert token_buffer.TokenBuffer(buffer) == buffer
+
+
+class _UpperKeywords(formatter.Formatter):
+  def handle_keyword(self, token):
+    self._current_line.append(str(token.value).upper())
+
+
+def test_formatters_overriding_handlers_reject_buffers():
+  fmt = _UpperKeywords()
+  with pytest.raises(ValueError, match="overrides token handlers"):
+    fmt.process_buffer(token_buffer.TokenBuffer(_tokens()))
+
+
+def test_instrumented_formatters_count_buffered_tokens():
+  fmt = formatter.Formatter()
+  inst = instrumentation.Instrumentation()
+  fmt.set_instrumentation(inst)
+  fmt.process_buffer(token_buffer.TokenBuffer(_tokens()))
+
+  assert fmt.text == _text(_tokens())
+  assert sum(inst.tokens_by_type.values()) == len(_tokens()) - 1
+  assert inst.lines == 4
+
+
+def test_extend_buffer_remaps_strings():
+  first = token_buffer.TokenBuffer([tokens.Name("x"), tokens.NEWLINE])
+  second = token_buffer.TokenBuffer([tokens.Name("y"), tokens.Name("x")])
+  first.extend_buffer(second)
+
+  assert _text(first) == "xyx"
+  assert first.strings == ["x", "y"]
+
+
+def test_pickled_buffer():
+  buffer = token_buffer.TokenBuffer(_tokens())
+  copy = pickle.loads(pickle.dumps(buffer))
+
+  assert copy == buffer
+  copy.append_word("a")
+  assert copy.strings == buffer.strings
+
+
+def test_rejects_non_tokens():
+  with pytest.raises(ValueError, match="yield from"):
+    token_buffer.TokenBuffer([tokens.Name("a") + tokens.Name("b")])
+  with pytest.raises(ValueError):
+    token_buffer.TokenBuffer(["a"])
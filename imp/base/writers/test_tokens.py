@@ -0,0 +1,37 @@
+"""Tests for the Token classes.
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import pytest
+
+from imp.base.writers import tokens
+
+
+def _token_classes(cls=tokens.Token):
+  yield cls
+  for subclass in cls.__subclasses__():
+    yield from _token_classes(subclass)
+
+
+@pytest.mark.parametrize("cls", list(_token_classes()), ids=lambda cls: cls.__name__)
+def test_tokens_have_no_instance_dict(cls):
+  assert "__dict__" not in dir(cls)
+
+
+def test_shared_tokens_in_streams():
+  stream = tokens.SPACE + tokens.Name("a") + tokens.SPACE + tokens.SEMICOLON
+  assert [str(t) for t in stream] == [" ", "a", " ", ";"]
+  assert [str(t) for t in stream] == [" ", "a", " ", ";"]
@@ -0,0 +1,149 @@
+"""Array-backed alternative to streams of Token objects.
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import array
+
+from imp.base.writers import tokens
+from typing import Dict, Iterable, Iterator
+
+# Kinds of buffer entries. Only WORD entries have a value, an index into the
+# buffer's string table.
+WORD = 0
+NEWLINE = 1
+INDENT = 2
+DEDENT = 3
+
+# Buffer entry kinds by token class. Tokens are mapped using the nearest class
+# in their MRO, which is resolved once per type.
+_KINDS_BY_TOKEN_CLS = {
+  tokens.Token: WORD,
+  tokens.Null: None,
+  tokens.NewLine: NEWLINE,
+  tokens.Indent: INDENT,
+  tokens.Dedent: DEDENT,
+}
+_kinds_by_type: Dict[type, int] = {}
+
+
+def _kind(token_type: type):
+  try:
+    return _kinds_by_type[token_type]
+  except KeyError:
+    pass
+
+  if issubclass(token_type, tokens.TokenStream):
+    raise ValueError(f"Found a TokenStream instead of a Token. "
+                     " The tokenizer should use 'yield from'.")
+  for cls in token_type.__mro__:
+    if cls in _KINDS_BY_TOKEN_CLS:
+      kind = _kinds_by_type[token_type] = _KINDS_BY_TOKEN_CLS[cls]
+      return kind
+  raise ValueError(f"Unexpected token type: {token_type}")
+
+
+class TokenBuffer:
+  """A compact sequence of words and formatting instructions.
+
+  Entry kinds are stored in a byte array, and words as indices into a table of
+  interned strings. Buffers take a fraction of the memory of Token objects,
+  are formatted in a single loop by Formatter.process_buffer, and are cheap to
+  cache or pickle.
+  """
+  __slots__ = ("kinds", "values", "strings", "_string_ids")
+
+  def __init__(self, token_iter: Iterable[tokens.Token] = ()):
+    self.kinds = array.array("B")
+    self.values = array.array("I")
+    self.strings = []
+    self._string_ids = {}
+    self.extend(token_iter)
+
+  def __getstate__(self):
+    return self.kinds, self.values, self.strings
+
+  def __setstate__(self, state):
+    self.kinds, self.values, self.strings = state
+    self._string_ids = {s: i for i, s in enumerate(self.strings)}
+
+  def __len__(self):
+    return len(self.kinds)
+
+  def __eq__(self, other):
+    if not isinstance(other, TokenBuffer):
+      return NotImplemented
+    return list(self.iter_entries()) == list(other.iter_entries())
+
+  def _string_id(self, text: str) -> int:
+    try:
+      return self._string_ids[text]
+    except KeyError:
+      index = self._string_ids[text] = len(self.strings)
+      self.strings.append(text)
+      return index
+
+  def append_word(self, text: str):
+    self.kinds.append(WORD)
+    self.values.append(self._string_id(text))
+
+  def append_newline(self):
+    self.kinds.append(NEWLINE)
+    self.values.append(0)
+
+  def append_indent(self):
+    self.kinds.append(INDENT)
+    self.values.append(0)
+
+  def append_dedent(self):
+    self.kinds.append(DEDENT)
+    self.values.append(0)
+
+  def extend(self, token_iter: Iterable[tokens.Token]):
+    """Appends the words and formatting of a stream of tokens."""
+    kinds = self.kinds
+    values = self.values
+    string_id = self._string_id
+    for token in token_iter:
+      try:
+        kind = _kinds_by_type[type(token)]
+      except KeyError:
+        kind = _kind(type(token))
+
+      if kind == WORD:
+        kinds.append(WORD)
+        values.append(string_id(str(token.value)))
+      elif kind is not None:
+        kinds.append(kind)
+        values.append(0)
+
+  def extend_buffer(self, other: 'TokenBuffer'):
+    """Appends the entries of another buffer."""
+    ids = [self._string_id(s) for s in other.strings]
+    self.kinds.extend(other.kinds)
+    self.values.extend(ids[value] if kind == WORD else 0
+                       for kind, value in zip(other.kinds, other.values))
+
+  def iter_entries(self) -> Iterator:
+    """Yields (kind, word) pairs, where word is None for formatting entries."""
+    strings = self.strings
+    for kind, value in zip(self.kinds, self.values):
+      yield kind, strings[value] if kind == WORD else None
+
+  def __iter__(self) -> Iterator[tokens.Token]:
+    """Replays the buffer as tokens, for consumers of token streams."""
+    constants = {NEWLINE: tokens.NEWLINE, INDENT: tokens.INDENT, DEDENT: tokens.DEDENT}
+    for kind, word in self.iter_entries():
+      yield tokens.Literal(word) if kind == WORD else constants[kind]
@@ -19,15 +19,22 @@ import pathlib
 
 
 class Token:
-  """Class that represents a token of text."""
+  """Class that represents a token of text.
+
+  Tokens use __slots__ to keep them small, and are treated as immutable so
+  that constant tokens (see SPACE, NEWLINE, etc. below) can be shared.
+  """
+  __slots__ = ("value", "line_num", "char_num", "file", "trace")
 
   type: str = "TOKEN"
 
-  def __init__(self, value: str = None, line_num: int = None, char_num: int = None, file: pathlib.Path = None):
+  def __init__(self, value: str = None, line_num: int = None, char_num: int = None, file: pathlib.Path = None,
+               trace: str = None):
     self.value = value
     self.line_num = line_num
     self.char_num = char_num
     self.file = file
+    self.trace = trace
 
   def __repr__(self):
     text = f'{self.__class__.__name__}({self.type!r}, {self.value!r}'
@@ -51,6 +58,8 @@ class Token:
 
 
 class TokenStream:
+  __slots__ = ("tokens",)
+
   def __init__(self, tokens):
     self.tokens = tokens
 
@@ -68,100 +77,132 @@ class TokenStream:
 
 class FormattingToken(Token):
   """Tokens used to format or align text."""
+  __slots__ = ()
 
 
 class WhiteSpace(FormattingToken):
   """Represents an ignored token."""
+  __slots__ = ()
   type: str = "WHITESPACE"
 
 
 class Space(WhiteSpace):
   """Indicates a number of space characters."""
+  __slots__ = ("n",)
   type: str = "SPACE"
 
-  def __init__(self, n: int = 1):
+  def __init__(self, n: int = 1, trace: str = None):
+    super().__init__(' ' * n, trace=trace)
     self.n = n
-    self.value = ' ' * n
 
 
 class Indent(WhiteSpace):
   """Indicates an indentation."""
+  __slots__ = ()
   type: str = "INDENT"
 
 
 class Dedent(WhiteSpace):
   """Indicates an indentation."""
+  __slots__ = ()
   type: str = "INDENT"
 
 
 class NewLine(FormattingToken):
   """Represents a return (new line) token."""
+  __slots__ = ()
   type: str = "NewLine"
 
 
 class Null(Token):
   """Represents an ignored line token."""
+  __slots__ = ()
   type: str = "NULL"
 
 
 class Symbol(Token):
   """Tokens used to represent symbols."""
+  __slots__ = ()
   type: str = "SYMBOL"
 
 
 class Identifier(Token):
   """Used to represent the names of variables, signals, etc.."""
+  __slots__ = ()
 
 
 class Keyword(Token):
   """Token used to represent keywords."""
+  __slots__ = ()
   type: str = "KEYWORD"
 
 
 class Literal(Token):
   """Used to denote literal values."""
+  __slots__ = ()
+
   def __init__(self, value):
     super().__init__(value)
 
 
 class Name(Token):
   """Token used to represent named constructs."""
+  __slots__ = ()
   type: str = "NAME"
 
 
 class Number(Token):
   """Token used to represent numbers."""
+  __slots__ = ()
   type: str = "NUMBER"
 
 
 class Type(Token):
   """Token used to represent data types."""
+  __slots__ = ()
   type: str = "TYPE"
 
 
 class LineComment(Token):
   """Token used to represent a line comment."""
+  __slots__ = ()
   type: str = "LINE_COMMENT"
 
 
 class BlockComment(Token):
   """Token used to represent a block comment."""
+  __slots__ = ()
   type: str = "BLOCK_COMMENT"
 
 
 class EndOfFile(Token):
   """Token used to denote the end of source code."""
+  __slots__ = ()
   type = "END_OF_FILE"
 
   def __init__(self, line_num, char_num):
-    self.line_num = line_num
-    self.char_num = char_num
+    super().__init__(line_num=line_num, char_num=char_num)
 
   def __repr__(self):
     return (f'{self.__class__.__name__}( '
             f'{self.line_num}, {self.char_num})')
 
 
+# Shared instances of constant tokens. Tokenizers should prefer these over
+# creating new tokens, since tokenizing a large design yields millions of them.
+SPACE = Space()
+NEWLINE = NewLine()
+INDENT = Indent()
+DEDENT = Dedent()
+NULL = Null()
+
+COMMA = Symbol(",")
+SEMICOLON = Symbol(";")
+EQUALS = Symbol("=")
+OPEN_PAREN = Symbol("(")
+CLOSE_PAREN = Symbol(")")
+
+
 class SymbolSeperated:
   """Helper class to emit tokens delimited by symbol characters."""
   def __init__(self, items, separator, tokenize):
@@ -178,12 +219,12 @@ class SymbolSeperated:
 
 class CommaSeperated(SymbolSeperated):
   def __init__(self, items, tokenize):
-    super().__init__(items=items, separator=Symbol(",") + Space(), tokenize=tokenize)
+    super().__init__(items=items, separator=COMMA + SPACE, tokenize=tokenize)
 
 
 class SemicolonSeperated(SymbolSeperated):
   def __init__(self, items):
-    super().__init__(items=items, separator=Symbol(";") + Space())
+    super().__init__(items=items, separator=SEMICOLON + SPACE)
 
 
 class DelimitedList:
@@ -196,7 +237,7 @@ class DelimitedList:
     self.items = items
 
   def start(self):
-    yield Space()
+    yield SPACE
     yield self._start
     yield NewLine(trace="DL:StartDone")
 
@@ -204,7 +245,7 @@ class DelimitedList:
     yield self._stop
 
   def delimiter(self):
-    yield Null()
+    yield NULL
     while True:
       yield self._delimiter
 
@@ -236,7 +277,7 @@ class DelimitedList:
 class ParensWithComma(DelimitedList):
 
   def __init__(self, items):
-    super().__init__(start=Symbol("("),
-                     stop=Symbol(")"),
-                     delimiter=Symbol(','),
+    super().__init__(start=OPEN_PAREN,
+                     stop=CLOSE_PAREN,
+                     delimiter=COMMA,
                      items=items)
\ No newline at end of file
@@ -15,24 +15,144 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-from imp.base.writers.formatter import Formatter
+import hashlib
+import io
+import threading
+
+from imp.base.models import container
+from imp.base.models import fingerprint
+from imp.base.writers import emission_cache
+from imp.base.writers import token_buffer
+from imp.base.writers.formatter import Formatter, is_binary
 from imp.base.writers import tokens
-from typing import Iterator, Union
+from typing import Iterator, Optional, Union
 
 TokenizerType = Iterator[Union[tokens.Token, tokens.TokenStream]]
 
 
 class Writer:
-  """Given a tokenizer function and a formatter, converts the tokens to text."""
-  def __init__(self, tokenizer, formatter: Formatter):
+  """Given a tokenizer function and a formatter, converts the tokens to text.
+
+  `write_to` and `get_text_for` format each item with a clone of `formatter`,
+  so a writer can be used from several threads at once. `process` uses
+  `formatter` itself, and isn't thread-safe.
+
+  When given an EmissionCache, the text for each item is stored under the
+  item's structural fingerprint, and items which are unchanged since they
+  were last converted are served from the cache without tokenizing them.
+
+  With direct=True, items are written by the tokenizer's `emit` method,
+  which skips creating tokens for components that have an emitter. The text
+  is the same, but emitters bypass the formatter's token handlers, so
+  formatters which override them, and debug formatters, always use tokens.
+
+  Items can also be tokenized once into a TokenBuffer with `get_buffer_for`.
+  Buffers passed to `write_to` or `get_text_for` are formatted directly, and
+  bypass the cache. Like direct emission, they can't be used with formatters
+  which override token handlers, see Formatter.process_buffer.
+
+  With release=True, the lazily populated containers of each item are
+  released once its text is written, see Container.release. Each item's
+  containers are then only held in memory while it is written.
+  """
+  def __init__(self, tokenizer, formatter: Formatter, cache: Optional[emission_cache.EmissionCache] = None,
+               direct: bool = False, release: bool = False):
     self.tokenizer = tokenizer
     self.formatter = formatter
+    self.cache = cache
+    self.direct = direct
+    self.release = release
+    self.cache_hits = 0
+    self.cache_misses = 0
+    self._lock = threading.Lock()
+
+  def __getstate__(self):
+    state = self.__dict__.copy()
+    del state["_lock"]
+    return state
+
+  def __setstate__(self, state):
+    self.__dict__.update(state)
+    self._lock = threading.Lock()
+
+  def set_instrumentation(self, instrumentation):
+    """Attaches an Instrumentation to the tokenizer and formatter."""
+    self.tokenizer.set_instrumentation(instrumentation)
+    self.formatter.set_instrumentation(instrumentation)
 
   def process(self, item):
     self.formatter.process_tokens(self.tokenizer.tokenize(item))
 
+  def get_buffer_for(self, item) -> token_buffer.TokenBuffer:
+    """Returns the tokens for an item as a TokenBuffer."""
+    return token_buffer.TokenBuffer(self.tokenizer.tokenize(item))
+
+  def write_to(self, item, stream):
+    """Streams the text for an item to a text or binary file-like object."""
+    if self.cache is None or isinstance(item, token_buffer.TokenBuffer):
+      self._format(item, stream)
+    else:
+      text = self._get_cached_text(item)
+      stream.write(text.encode() if is_binary(stream) else text)
+    self._release(item)
+
   def get_text_for(self, item):
-    self.formatter.reset()
-    self.process(item)
-    return self.formatter.text
+    if self.cache is not None and not isinstance(item, token_buffer.TokenBuffer):
+      text = self._get_cached_text(item)
+    else:
+      stream = io.StringIO()
+      self._format(item, stream)
+      text = stream.getvalue()
+    self._release(item)
+    return text
+
+  def _release(self, item):
+    if self.release and isinstance(item, container.Container):
+      item.release()
+
+  def _format(self, item, stream):
+    formatter = self.formatter.clone()
+    formatter.reset(sink=stream)
+    self._process(item, formatter)
+    formatter.finish()
+
+  def _process(self, item, formatter: Formatter):
+    """Formats an item with a formatter, which keeps its state."""
+    if isinstance(item, token_buffer.TokenBuffer):
+      formatter.process_buffer(item)
+    elif self.direct and not formatter.debug and not formatter._overrides_handlers():
+      self.tokenizer.emit(item, formatter)
+    else:
+      formatter.process_tokens(self.tokenizer.tokenize(item))
+
+  def cache_key(self, item) -> str:
+    """Returns the key under which the item's text is cached.
+
+    The key combines the item's fingerprint with the writer's configuration,
+    so that caches shared by differently configured writers don't collide.
+    """
+    handlers = getattr(self.tokenizer, "handlers_by_token_cls", {}).values()
+    config = repr((
+        type(self.tokenizer).__qualname__,
+        [f"{fn.__module__}.{fn.__qualname__}" for fn in handlers],
+        type(self.formatter).__qualname__,
+        self.formatter._tab,
+    ))
+    digest = hashlib.blake2b(config.encode(), digest_size=16)
+    digest.update(fingerprint.fingerprint(item).encode())
+    return digest.hexdigest()
 
+  def _get_cached_text(self, item) -> str:
+    key = self.cache_key(item)
+    text = self.cache.get(key)
+    with self._lock:
+      if text is None:
+        self.cache_misses += 1
+      else:
+        self.cache_hits += 1
+    if text is None:
+      stream = io.StringIO()
+      self._format(item, stream)
+      text = stream.getvalue()
+      self.cache.put(key, text)
+    return text
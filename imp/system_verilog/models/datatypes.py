@@ -53,6 +53,7 @@ class LogicType(datatypes.IntegerTypeBase):
   """4-state data type, user-defined vector size, unsigned."""
 
   def __init__(self, msb:int, lsb:int):
+    super().__init__()
     self.msb = msb
     self.lsb = lsb
 
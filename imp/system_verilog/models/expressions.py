@@ -0,0 +1,404 @@
+"""Constant expressions built from parameters.
+
+Parameters, localparams and the expressions combining them form a DAG.
+Operators on them build expression nodes rather than computing values:
+
+  width = m.localparam(name="width", dtype=IntType(), value=8)
+  depth = m.localparam(name="depth", dtype=IntType(), value=width * 4 - 1)
+
+Writers print the symbolic expression ("width * 4 - 1"), while `value`
+returns the folded constant (31). Folded values are memoized. Changing a
+parameter only invalidates the values downstream of it, and they are
+recomputed when next read.
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import abc
+import operator
+import weakref
+
+from imp.base.models import component
+from imp.base.models import fingerprint
+from typing import Any, Dict, Iterable, Mapping, Tuple
+
+# Marks values which haven't been folded since their inputs last changed.
+_UNSET = object()
+
+
+def _div(a, b):
+  # SystemVerilog integer division truncates towards zero.
+  if isinstance(a, int) and isinstance(b, int):
+    q = abs(a) // abs(b)
+    return q if (a < 0) == (b < 0) else -q
+  return a / b
+
+
+def _mod(a, b):
+  # The result takes the sign of the dividend, as in SystemVerilog.
+  if isinstance(a, int) and isinstance(b, int):
+    return a - b * _div(a, b)
+  return a % b
+
+
+# SystemVerilog binary operators with their precedence, higher binding
+# tighter, and their evaluation.
+BINARY_OPERATORS = {
+  "**": (12, operator.pow),
+  "*": (11, operator.mul),
+  "/": (11, _div),
+  "%": (11, _mod),
+  "+": (10, operator.add),
+  "-": (10, operator.sub),
+  "<<": (9, operator.lshift),
+  ">>": (9, operator.rshift),
+  "&": (6, operator.and_),
+  "^": (5, operator.xor),
+  "|": (4, operator.or_),
+}
+
+UNARY_OPERATORS = {
+  "-": operator.neg,
+  "~": operator.invert,
+}
+
+# Unary operators bind tighter than any binary operator.
+UNARY_PRECEDENCE = 13
+
+
+def _binary(op: str):
+  def method(self, other):
+    return BinaryOp(op, self, other)
+
+  def reflected(self, other):
+    return BinaryOp(op, other, self)
+
+  return method, reflected
+
+
+class Expression(component.Component):
+  """Base class for values which can be combined with operators and folded.
+
+  Subclasses define their inputs, `operands`, and how to fold their values.
+  Each expression keeps weak references to the expressions using it, so that
+  their memoized values can be invalidated when it changes.
+  """
+  __slots__ = ("_folded", "_dependents", "__weakref__")
+  _fingerprint_exclude = ("_folded", "_dependents", "__weakref__")
+
+  def __init__(self):
+    super().__init__()
+    self._folded = _UNSET
+    self._dependents = None
+
+  @property
+  @abc.abstractmethod
+  def operands(self) -> Tuple[Any, ...]:
+    """The expressions and constants this expression is computed from."""
+
+  @abc.abstractmethod
+  def fold(self, values) -> Any:
+    """Computes the value of the expression from the values of its operands."""
+
+  def evaluate(self) -> Any:
+    """Returns the folded value of the expression."""
+    if self._folded is _UNSET:
+      evaluate(self)
+    return self._folded
+
+  def _depend_on(self, operands):
+    for operand in operands:
+      if isinstance(operand, Expression):
+        # While unpickling, the operand may not be restored yet.
+        if getattr(operand, "_dependents", None) is None:
+          operand._dependents = []
+        operand._dependents.append(weakref.ref(self))
+
+  def invalidate(self):
+    """Clears the memoized values of this expression and those using it."""
+    stack = [self]
+    while stack:
+      node = stack.pop()
+      node._folded = _UNSET
+      if node._dependents:
+        live = []
+        for ref in node._dependents:
+          dependent = ref()
+          if dependent is not None:
+            live.append(ref)
+            # Expressions using an unset value are unset already.
+            if dependent._folded is not _UNSET:
+              stack.append(dependent)
+        node._dependents = live
+
+  def __getstate__(self):
+    # Memoized values and weak references are rebuilt after unpickling.
+    state, slots = super().__getstate__()
+    slots.pop("_folded", None)
+    slots.pop("_dependents", None)
+    return state, slots
+
+  def __setstate__(self, state):
+    attributes, slots = state
+    if attributes:
+      self.__dict__.update(attributes)
+    for name, value in slots.items():
+      setattr(self, name, value)
+    self._folded = _UNSET
+    # Expressions using this one may have been restored first.
+    if not hasattr(self, "_dependents"):
+      self._dependents = None
+    self._depend_on(self.operands)
+
+  __add__, __radd__ = _binary("+")
+  __sub__, __rsub__ = _binary("-")
+  __mul__, __rmul__ = _binary("*")
+  __truediv__, __rtruediv__ = _binary("/")
+  __mod__, __rmod__ = _binary("%")
+  __pow__, __rpow__ = _binary("**")
+  __lshift__, __rlshift__ = _binary("<<")
+  __rshift__, __rrshift__ = _binary(">>")
+  __and__, __rand__ = _binary("&")
+  __xor__, __rxor__ = _binary("^")
+  __or__, __ror__ = _binary("|")
+
+  def __neg__(self):
+    return UnaryOp("-", self)
+
+  def __invert__(self):
+    return UnaryOp("~", self)
+
+
+def evaluate(value) -> Any:
+  """Returns the folded value of an expression, or a constant as it is.
+
+  Operands are folded with an explicit stack, as chains of parameters can be
+  thousands of expressions long.
+  """
+  if not isinstance(value, Expression):
+    return value
+  if value._folded is not _UNSET:
+    return value._folded
+
+  expanded = set()
+  stack = [value]
+  while stack:
+    node = stack[-1]
+    if node._folded is not _UNSET:
+      stack.pop()
+      continue
+
+    operands = node.operands
+    pending = [op for op in operands if isinstance(op, Expression) and op._folded is _UNSET]
+    if pending:
+      if id(node) in expanded:
+        raise ValueError(f"Found a cycle in the expression for {node!r}")
+      expanded.add(id(node))
+      stack.extend(pending)
+      continue
+
+    node._folded = node.fold([op._folded if isinstance(op, Expression) else op for op in operands])
+    stack.pop()
+  return value._folded
+
+
+class NamedValue(Expression):
+  """A value defined by an expression, which is referred to by its name."""
+  __slots__ = ("name",)
+
+  @property
+  @abc.abstractmethod
+  def expression(self) -> Any:
+    """The expression or constant defining the value.
+
+    Subclasses make it settable. Setting it invalidates the values using it.
+    """
+
+  @property
+  def operands(self) -> Tuple[Any, ...]:
+    return (self.expression,)
+
+  def fold(self, values) -> Any:
+    return values[0]
+
+  def _set_expression(self, slot: str, expression):
+    setattr(self, slot, expression)
+    self._depend_on((expression,))
+    self.invalidate()
+
+  def with_expression(self, expression) -> 'NamedValue':
+    """Returns a copy of the named value, defined by another expression."""
+    _, slots = self.__getstate__()
+    value = object.__new__(type(self))
+    for name, slot_value in slots.items():
+      setattr(value, name, slot_value)
+    value._folded = _UNSET
+    value._dependents = None
+    value.expression = expression
+    return value
+
+  def _fingerprint_state(self):
+    # A named value used as the expression is referred to by name, as in the
+    # operators, rather than fingerprinted again for each alias of it.
+    expression = self.expression
+    return tuple(_fingerprint_operand(value) if value is expression else value
+                 for value in (getattr(self, name, None)
+                               for name in fingerprint.fingerprinted_fields(type(self))))
+
+  def __repr__(self):
+    return f"{type(self).__name__}({self.name!r})"
+
+
+def rebind(named_values: Iterable[NamedValue], overrides: Mapping[NamedValue, Any]
+           ) -> Dict[NamedValue, NamedValue]:
+  """Copies named values with new expressions, and the values using them.
+
+  The named values are left unchanged. Each one whose expression refers,
+  directly or through other named values, to an overridden one is copied,
+  with a copy of its expression referring to the copies. Expressions and
+  named values which don't depend on the overrides are shared.
+
+  Args:
+    named_values: The named values in scope, e.g. those of a module. Only
+      these are copied.
+    overrides: New expressions or constants by named value. They may refer
+      to other named values in scope, which then refer to their copies.
+
+  Returns:
+    The copies by the named values they replace.
+
+  Raises:
+    ValueError: if the new expressions form a cycle.
+  """
+  named_values = list(named_values)
+  scope = {id(value) for value in named_values}
+  by_id = {id(value): expression for value, expression in overrides.items()}
+  # Values defined by constants only change when overridden.
+  roots = [value for value in named_values if isinstance(value.expression, Expression)]
+
+  def inputs(node):
+    if id(node) in by_id:
+      return (by_id[id(node)],)
+    if isinstance(node, NamedValue) and id(node) not in scope:
+      return ()
+    return node.operands
+
+  # Rebuilt nodes by the id of the original, or the original if unchanged.
+  rebuilt = {}
+  copies = {}
+  # Post-order walk with an explicit stack, as chains can be long.
+  stack = [(node, False) for node in overrides]
+  stack.extend((value, False) for value in roots)
+  in_progress = set()
+  while stack:
+    node, expanded = stack.pop()
+    if not expanded:
+      if id(node) in rebuilt:
+        continue
+      if id(node) in in_progress:
+        raise ValueError(f"Found a cycle in the expression for {node!r}")
+      in_progress.add(id(node))
+      stack.append((node, True))
+      for op in inputs(node):
+        if isinstance(op, Expression) and id(op) not in rebuilt:
+          stack.append((op, False))
+      continue
+
+    in_progress.discard(id(node))
+    operands = inputs(node)
+    mapped = tuple(rebuilt.get(id(op), op) if isinstance(op, Expression) else op
+                   for op in operands)
+    changed = any(new is not old for new, old in zip(mapped, operands))
+    if id(node) in by_id:
+      new = node.with_expression(mapped[0])
+      copies[node] = new
+    elif not changed:
+      new = node
+    elif isinstance(node, NamedValue):
+      new = node.with_expression(mapped[0])
+      copies[node] = new
+    elif isinstance(node, BinaryOp):
+      new = BinaryOp(node.op, *mapped)
+    else:
+      new = UnaryOp(node.op, *mapped)
+    rebuilt[id(node)] = new
+  return copies
+
+
+def _fingerprint_operand(operand):
+  # Named values are referred to by name, so only the name affects the code
+  # of the expressions using them.
+  return ("name", operand.name) if isinstance(operand, NamedValue) else operand
+
+
+class BinaryOp(Expression):
+  """An expression applying a binary operator to two operands."""
+  __slots__ = ("op", "left", "right")
+
+  def __init__(self, op: str, left, right):
+    super().__init__()
+    if op not in BINARY_OPERATORS:
+      raise ValueError(f"Unsupported binary operator: {op}")
+    self.op = op
+    self.left = left
+    self.right = right
+    self._depend_on((left, right))
+
+  @property
+  def precedence(self) -> int:
+    return BINARY_OPERATORS[self.op][0]
+
+  @property
+  def operands(self) -> Tuple[Any, ...]:
+    return (self.left, self.right)
+
+  def fold(self, values) -> Any:
+    return BINARY_OPERATORS[self.op][1](*values)
+
+  def _fingerprint_state(self):
+    return (self.op, _fingerprint_operand(self.left), _fingerprint_operand(self.right))
+
+  def __repr__(self):
+    return f"BinaryOp({self.op!r}, {self.left!r}, {self.right!r})"
+
+
+class UnaryOp(Expression):
+  """An expression applying a unary operator to an operand."""
+  __slots__ = ("op", "operand")
+
+  def __init__(self, op: str, operand):
+    super().__init__()
+    if op not in UNARY_OPERATORS:
+      raise ValueError(f"Unsupported unary operator: {op}")
+    self.op = op
+    self.operand = operand
+    self._depend_on((operand,))
+
+  @property
+  def precedence(self) -> int:
+    return UNARY_PRECEDENCE
+
+  @property
+  def operands(self) -> Tuple[Any, ...]:
+    return (self.operand,)
+
+  def fold(self, values) -> Any:
+    return UNARY_OPERATORS[self.op](values[0])
+
+  def _fingerprint_state(self):
+    return (self.op, _fingerprint_operand(self.operand))
+
+  def __repr__(self):
+    return f"UnaryOp({self.op!r}, {self.operand!r})"
@@ -17,9 +17,31 @@ limitations under the License.
 
 from imp.base.models import container
 from imp.base.models import comments
+from imp.base.models import datatypes
 from imp.system_verilog.models import parameters
 
-from typing import Optional
+from typing import Any, Iterable, List, Mapping, Optional, Sequence, Union
+
+
+def _as_list(values) -> list:
+  """Converts a sequence, or an array such as a NumPy array, to a list."""
+  tolist = getattr(values, "tolist", None)
+  return tolist() if tolist is not None else list(values)
+
+
+def _sized_list(values, count: int) -> list:
+  """Converts values to a list, which must hold count values."""
+  values = _as_list(values)
+  if len(values) != count:
+    raise ValueError(f"Expected {count} values, got {len(values)}")
+  return values
+
+
+def _per_item(value, cls, count: int) -> list:
+  """Returns a list of count values, repeating a single instance of cls."""
+  if isinstance(value, cls):
+    return [value] * count
+  return _sized_list(value, count)
 
 
 """
@@ -30,6 +52,7 @@ meth = types.MethodType(fn, cls(), cls) # Bind fn to an instance of the class 'c
 
 class ModuleBuilderMixin(container.NamespaceBuilderMixin):
   """Builder API for Modules and their child containers."""
+  __slots__ = ()
 
   # Generic blocks and groups.
   def group(self) -> container.Group:
@@ -79,3 +102,52 @@ class ModuleBuilderMixin(container.NamespaceBuilderMixin):
     declaration = parameters.LocalParamDeclaration(names=[name], localparam=param)
     self._add_item(declaration)
     return param
+
+  # Bulk builders. These add many items at once, and are much faster than
+  # calling the builder for each item. Names are checked for collisions
+  # before anything is added.
+
+  def localparams(self, names: Sequence[str],
+                  dtype: Union[datatypes.DataType, Sequence[datatypes.DataType]],
+                  values: Sequence[Any]) -> List[parameters.LocalParam]:
+    """Creates and returns localparams, one per name.
+
+    Args:
+      names: The names of the localparams. A sequence or a NumPy array.
+      dtype: The data type of all localparams, or a sequence of data types.
+      values: The values of the localparams. A sequence or a NumPy array.
+    """
+    names = _as_list(names)
+    dtypes = _per_item(dtype, datatypes.DataType, len(names))
+    values = _sized_list(values, len(names))
+
+    LocalParam = parameters.LocalParam
+    params = [LocalParam(name, t, value) for name, t, value in zip(names, dtypes, values)]
+    self._add_named_items(names, params)
+
+    Declaration = parameters.LocalParamDeclaration
+    self._add_items([Declaration([name], param) for name, param in zip(names, params)])
+    return params
+
+  def parameters_from(self, records: Iterable[Union[Mapping[str, Any], Sequence[Any]]]
+                      ) -> List[parameters.Parameter]:
+    """Creates and returns parameters, one per record.
+
+    Args:
+      records: (name, dtype, default) tuples, or mappings with these keys
+        where default is optional. For example a list of dicts, or a NumPy
+        structured array.
+    """
+    Parameter = parameters.Parameter
+    params = []
+    for record in _as_list(records):
+      if isinstance(record, Mapping):
+        params.append(Parameter(record["name"], record["dtype"], record.get("default")))
+      else:
+        params.append(Parameter(*record))
+    names = [param.name for param in params]
+    self._add_named_items(names, params)
+
+    Declaration = parameters.ParameterDeclaration
+    self._add_items([Declaration([param.name], param) for param in params])
+    return params
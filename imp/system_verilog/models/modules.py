@@ -15,8 +15,14 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import copy
+
 from imp.base.models import container
+from imp.system_verilog.models import expressions
 from imp.system_verilog.models import module_builder_mixin
+from imp.system_verilog.models import parameters
+
+from typing import Any, Mapping, Optional
 
 
 class ModuleHeader(container.Group):
@@ -25,6 +31,8 @@ class ModuleHeader(container.Group):
 
 class ModuleHeader(container.Block):
   """Module Header"""
+  __slots__ = ("_ports", "_parameters")
+
   def __init__(self):
     super().__init__()
     self._ports = container.Block()
@@ -33,20 +41,61 @@ class ModuleHeader(container.Block):
 
 class Module(container.NamespacedContainer, module_builder_mixin.ModuleBuilderMixin):
   """Class to represent SystemVerilog module definitions."""
+  __slots__ = ("_module_name",)
 
-  def __init__(self, module_name=None):
-    super().__init__()
+  def __init__(self, module_name=None, builder=None):
+    super().__init__(builder=builder)
     self._module_name = module_name
 
   @property
   def module_name(self) -> str:
     return self._module_name
 
+  @module_name.setter
+  def module_name(self, module_name: str):
+    self._module_name = module_name
+
 
   @property
   def name(self) -> str:
     return self._module_name
 
+  def derive(self, module_name: Optional[str] = None,
+             values: Optional[Mapping[str, Any]] = None) -> 'Module':
+    """Returns a clone of the module with another name and parameter values.
+
+    The clone shares its components with this module, except for the
+    parameters given new values, the parameters whose expressions depend on
+    them, and their declarations. See `clone`.
+
+    Args:
+      module_name: The name of the new module, defaults to this one's.
+      values: New expressions or constants by parameter path, see `lookup`.
+    """
+    derived = self.clone()
+    if module_name is not None:
+      derived.module_name = module_name
+    if not values:
+      return derived
+
+    overrides = {derived.lookup(path): value for path, value in values.items()}
+    named_values = [item for _, item in derived.symbols() if isinstance(item, expressions.NamedValue)]
+    copies = expressions.rebind(named_values, overrides)
+    derived._replace_named_items(copies)
+
+    # The clone shares the declarations, and the index used by query.
+    declarations = {}
+    for item in self.query((parameters.LocalParamDeclaration, parameters.ParameterDeclaration)):
+      if isinstance(item, parameters.LocalParamDeclaration):
+        if item.localparam in copies:
+          declarations[item] = copy.copy(item)
+          declarations[item].localparam = copies[item.localparam]
+      elif item.parameter in copies:
+        declarations[item] = copy.copy(item)
+        declarations[item].parameter = copies[item.parameter]
+    derived._replace_items(declarations)
+    return derived
+
 
 if __name__ == '__main__':
   from imp.system_verilog.models import datatypes
@@ -55,4 +104,6 @@ if __name__ == '__main__':
   p = m.parameter(name="p1", dtype=datatypes.IntType(), default=30)
   p2 = m.parameter(name="p2", dtype=datatypes.LogicType(msb=2, lsb=0), default=p*2)
   print(p.default, p.name)
-  print(m.p1.default)
\ No newline at end of file
+  print(m.p1.default)
+  # p2's default is the expression p1 * 2, which folds to 60.
+  print(m.p2.expression, m.p2.default)
\ No newline at end of file
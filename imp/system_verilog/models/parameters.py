@@ -16,14 +16,41 @@ limitations under the License.
 """
 
 from imp.base.models import component
+from imp.system_verilog.models import expressions
 
 
-class Parameter(component.Component):
-  """Parameters."""
+class Parameter(expressions.NamedValue):
+  """Parameters.
+
+  `default` is the folded value of the default, which may be an expression
+  of other parameters. `expression` is the default as given.
+  """
+  __slots__ = ("dtype", "_default")
+
   def __init__(self, name, dtype, default=None):
+    super().__init__()
     self.name = name
     self.dtype = dtype
-    self.default = default
+    self._default = default
+    # Most defaults are constants, which nothing needs to track.
+    if isinstance(default, expressions.Expression):
+      self._depend_on((default,))
+
+  @property
+  def expression(self):
+    return self._default
+
+  @expression.setter
+  def expression(self, default):
+    self._set_expression("_default", default)
+
+  @property
+  def default(self):
+    return self.evaluate()
+
+  @default.setter
+  def default(self, default):
+    self._set_expression("_default", default)
 
   @property
   def is_constant(self):
@@ -31,19 +58,47 @@ class Parameter(component.Component):
 
 
 class ParameterDeclaration(component.Component):
+  __slots__ = ("names", "parameter")
+
   def __init__(self, names, parameter: Parameter):
+    super().__init__()
     self.names = names
     self.parameter = parameter
 
 
-class LocalParam(component.Component):
-  """Local parameters"""
+class LocalParam(expressions.NamedValue):
+  """Local parameters.
+
+  `value` is the folded value, which may be an expression of other
+  parameters. `expression` is the value as given.
+  """
+  __slots__ = ("dtype", "_value", "comment")
+
   def __init__(self, name, dtype, value, comment=None):
     super().__init__()
     self.name = name
     self.dtype = dtype
-    self.value = value
     self.comment = comment
+    self._value = value
+    # Most values are constants, which nothing needs to track.
+    if isinstance(value, expressions.Expression):
+      self._depend_on((value,))
+
+  @property
+  def expression(self):
+    return self._value
+
+  @expression.setter
+  def expression(self, value):
+    self._set_expression("_value", value)
+
+  @property
+  def value(self):
+    return self.evaluate()
+
+  @value.setter
+  def value(self, value):
+    self._set_expression("_value", value)
 
   @property
   def is_constant(self):
@@ -51,6 +106,9 @@ class LocalParam(component.Component):
 
 
 class LocalParamDeclaration(component.Component):
+  __slots__ = ("names", "localparam")
+
   def __init__(self, names, localparam):
+    super().__init__()
     self.names = names
     self.localparam = localparam
\ No newline at end of file
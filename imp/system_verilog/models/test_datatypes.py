@@ -0,0 +1,61 @@
+"""Tests for the SystemVerilog data types.
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import gc
+import pickle
+import weakref
+
+import pytest
+
+from imp.system_verilog.models import datatypes
+
+
+def test_identical_datatypes_are_shared():
+  assert datatypes.IntType() is datatypes.IntType()
+  assert datatypes.LogicType(3, 0) is datatypes.LogicType(msb=3, lsb=0)
+  assert datatypes.LogicType(3, 0) is not datatypes.LogicType(4, 0)
+  assert datatypes.LogicType(1, 0) is not datatypes.LogicType(True, False)
+
+
+def test_unused_datatypes_are_released():
+  dtype = datatypes.LogicType(12_345, 0)
+  shared = datatypes.LogicType(12_345, 0)
+  assert shared is dtype
+  ref = weakref.ref(dtype)
+
+  del dtype, shared
+  gc.collect()
+  assert ref() is None
+
+
+def test_datatypes_hash_and_compare_by_structure():
+  widths = {datatypes.LogicType(3, 0): 4, datatypes.IntType(): 32}
+  assert widths[datatypes.LogicType(msb=3, lsb=0)] == 4
+  assert widths[datatypes.IntType()] == 32
+  assert datatypes.IntType() != datatypes.LogicType(31, 0)
+
+
+def test_datatypes_are_immutable():
+  dtype = datatypes.LogicType(3, 0)
+  with pytest.raises(AttributeError):
+    dtype.msb = 7
+  assert datatypes.LogicType(3, 0).msb == 3
+
+
+def test_unpickled_datatypes_are_shared():
+  dtype = datatypes.LogicType(3, 0)
+  assert pickle.loads(pickle.dumps(dtype)) is dtype
@@ -0,0 +1,137 @@
+"""Tests for parameter expressions.
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import pickle
+
+import pytest
+
+from imp.base.models import fingerprint
+from imp.system_verilog.models import datatypes
+from imp.system_verilog.models import expressions
+from imp.system_verilog.models import modules
+
+
+def _is_folded(*values):
+  return [value._folded is not expressions._UNSET for value in values]
+
+
+def test_folds_expressions():
+  m = modules.Module(module_name="example")
+  width = m.localparam(name="width", dtype=datatypes.IntType(), value=8)
+  depth = m.localparam(name="depth", dtype=datatypes.IntType(), value=width * 4 - 1)
+  p = m.parameter(name="p", dtype=datatypes.IntType(), default=-(depth % 5) + (1 << 2))
+
+  assert depth.value == 31
+  assert p.default == 3
+  assert isinstance(depth.expression, expressions.BinaryOp)
+
+
+def test_division_follows_systemverilog():
+  assert expressions.evaluate(expressions.BinaryOp("/", -7, 2)) == -3
+  assert expressions.evaluate(expressions.BinaryOp("%", -7, 2)) == -1
+  assert expressions.evaluate(expressions.BinaryOp("/", 7.0, 2)) == 3.5
+
+
+def test_changes_only_invalidate_downstream_values():
+  m = modules.Module(module_name="example")
+  a = m.localparam(name="a", dtype=datatypes.IntType(), value=1)
+  b = m.localparam(name="b", dtype=datatypes.IntType(), value=2)
+  a2 = m.localparam(name="a2", dtype=datatypes.IntType(), value=a * 2)
+  b2 = m.localparam(name="b2", dtype=datatypes.IntType(), value=b * 2)
+  total = m.localparam(name="total", dtype=datatypes.IntType(), value=a2 + b2)
+  assert total.value == 6
+
+  a.value = 10
+  assert _is_folded(a, a2, total, b, b2) == [False, False, False, True, True]
+  assert total.value == 24
+  assert _is_folded(a, a2, total) == [True, True, True]
+
+
+def test_long_chains():
+  m = modules.Module(module_name="chain")
+  previous = m.localparam(name="p0", dtype=datatypes.IntType(), value=0)
+  first = previous
+  for i in range(1, 5_000):
+    previous = m.localparam(name=f"p{i}", dtype=datatypes.IntType(), value=previous + 1)
+
+  assert previous.value == 4_999
+  first.value = 1
+  assert previous.value == 5_000
+
+
+def test_cycles_are_detected():
+  m = modules.Module(module_name="example")
+  a = m.localparam(name="a", dtype=datatypes.IntType(), value=1)
+  b = m.localparam(name="b", dtype=datatypes.IntType(), value=a + 1)
+  a.value = b + 1
+
+  with pytest.raises(ValueError, match="cycle"):
+    a.value
+
+
+def test_pickled_expressions_stay_connected():
+  m = modules.Module(module_name="example")
+  a = m.localparam(name="a", dtype=datatypes.IntType(), value=1)
+  m.localparam(name="b", dtype=datatypes.IntType(), value=a + 1)
+  assert m.b.value == 2
+
+  copy = pickle.loads(pickle.dumps(m))
+  copy.a.value = 5
+  assert copy.b.value == 6
+  assert m.b.value == 2
+
+
+def test_references_are_fingerprinted_by_name():
+  def build(a_value, offset=1):
+    m = modules.Module(module_name="example")
+    a = m.localparam(name="a", dtype=datatypes.IntType(), value=a_value)
+    return m.localparam(name="b", dtype=datatypes.IntType(), value=a + offset)
+
+  assert fingerprint.fingerprint(build(1)) == fingerprint.fingerprint(build(2))
+  assert fingerprint.fingerprint(build(1)) != fingerprint.fingerprint(build(1, offset=2))
+
+
+def test_alias_chains_are_fingerprinted_by_name():
+  def build(n, first=0):
+    m = modules.Module(module_name="aliases")
+    previous = m.localparam(name="p0", dtype=datatypes.IntType(), value=first)
+    for i in range(1, n):
+      previous = m.localparam(name=f"p{i}", dtype=datatypes.IntType(), value=previous)
+    return m
+
+  # Walking the chain behind each alias would take minutes.
+  reference = fingerprint.fingerprint(build(5_000))
+  assert fingerprint.fingerprint(build(5_000)) == reference
+  assert fingerprint.fingerprint(build(5_000, first=1)) != reference
+  assert fingerprint.fingerprint(build(4_999)) != reference
+
+
+def test_rebind_copies_dependent_values():
+  m = modules.Module(module_name="example")
+  a = m.localparam(name="a", dtype=datatypes.IntType(), value=1)
+  b = m.localparam(name="b", dtype=datatypes.IntType(), value=2)
+  a2 = m.localparam(name="a2", dtype=datatypes.IntType(), value=a * 2)
+  total = m.localparam(name="total", dtype=datatypes.IntType(), value=a2 + b)
+
+  copies = expressions.rebind([a, b, a2, total], {a: 10})
+  assert set(copies) == {a, a2, total}
+  assert copies[total].value == 22
+  assert copies[total].expression.right is b
+  assert total.value == 4
+
+  with pytest.raises(ValueError, match="cycle"):
+    expressions.rebind([a, b, a2], {a: a2 + 1})
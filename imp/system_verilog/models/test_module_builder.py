@@ -15,6 +15,7 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import pytest
 
 from imp.system_verilog.models import datatypes
 from imp.system_verilog.models import modules
@@ -27,3 +28,87 @@ def test_module_param_builder():
   assert len(m.items) == 1
   assert m.p1.value == 30
   assert isinstance(m.p1.dtype, datatypes.IntType)
+
+
+def test_module_components_are_compact():
+  m = modules.Module(module_name="example")
+  m.localparam(name="p1", dtype=datatypes.IntType(), value=30)
+  m.parameter(name="p2", dtype=datatypes.IntType(), default=1)
+  m.comment("comment")
+  m.block(name="b1")
+
+  for item in [m, m.p1, m.p2, *m.items]:
+    assert not hasattr(item, "__dict__"), type(item)
+
+  with pytest.raises(AttributeError):
+    m.missing
+
+
+class FakeArray:
+  """Stands in for a NumPy array."""
+
+  def __init__(self, values):
+    self.values = values
+
+  def tolist(self):
+    return list(self.values)
+
+
+def test_bulk_localparams():
+  m = modules.Module(module_name="example")
+  m.localparam(name="p0", dtype=datatypes.IntType(), value=0)
+  params = m.localparams(FakeArray(["p1", "p2"]), datatypes.IntType(), FakeArray([1, 2]))
+
+  assert [p.name for p in params] == ["p1", "p2"]
+  assert m.p2.value == 2
+  assert [d.localparam for d in m.items] == [m.p0, m.p1, m.p2]
+  assert m.lookup("p1") is m.p1
+  assert m.query(type(m.items[0])) == m.items
+
+
+def test_bulk_parameters_from_records():
+  m = modules.Module(module_name="example")
+  params = m.parameters_from([
+      ("a", datatypes.IntType(), 1),
+      {"name": "b", "dtype": datatypes.IntType()},
+  ])
+
+  assert [(p.name, p.default) for p in params] == [("a", 1), ("b", None)]
+  assert m.b is params[1]
+
+
+def test_bulk_builders_check_names_first():
+  m = modules.Module(module_name="example")
+  m.localparam(name="p0", dtype=datatypes.IntType(), value=0)
+
+  with pytest.raises(KeyError):
+    m.localparams(["p1", "p0"], datatypes.IntType(), [1, 0])
+  with pytest.raises(KeyError):
+    m.localparams(["p1", "p1"], datatypes.IntType(), [1, 1])
+  with pytest.raises(ValueError):
+    m.localparams(["p1"], datatypes.IntType(), [1, 2])
+
+  assert len(m.items) == 1
+  assert list(m.symbols()) == [("p0", m.p0)]
+
+
+def test_derived_modules_share_unchanged_components():
+  m = modules.Module(module_name="mem")
+  depth = m.localparam(name="depth", dtype=datatypes.IntType(), value=4)
+  width = m.localparam(name="width", dtype=datatypes.IntType(), value=8)
+  bits = m.localparam(name="bits", dtype=datatypes.IntType(), value=depth * width)
+  declarations = list(m.iter_items())
+
+  derived = m.derive("mem16", {"depth": 16})
+  assert derived.module_name == "mem16"
+  assert derived.bits.value == 128 and bits.value == 32
+  assert derived.width is width
+  assert derived.bits.expression.right is width
+  assert [item.localparam for item in derived.iter_items()] == [derived.depth, width, derived.bits]
+  assert list(derived.iter_items())[1] is declarations[1]
+  assert list(m.iter_items()) == declarations
+
+  clone = m.clone()
+  extra = clone.localparam(name="extra", dtype=datatypes.IntType(), value=1)
+  assert clone.items[-1].localparam is extra
+  assert len(m.items) == 3 and "extra" not in dict(m.symbols())
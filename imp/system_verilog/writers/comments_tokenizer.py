@@ -18,27 +18,54 @@ limitations under the License.
 
 from imp.base.writers import tokens
 from imp.base.models import comments
-from imp.base.writers.model_tokenizer import tokenizer_for
+from imp.base.writers.model_tokenizer import emitter_for, tokenizer_for
 
-SP = tokens.Space
+SP = tokens.SPACE
 Symbol = tokens.Symbol
 Literal = tokens.Literal
-CR = tokens.NewLine
+CR = tokens.NEWLINE
+
+# Constant token sequences, shared by all comments.
+LINE_COMMENT_START = (Symbol("//"), SP)
+BLOCK_COMMENT_START = (Symbol("/*"), SP)
+BLOCK_COMMENT_STOP = (SP, Symbol("*/"))
 
 
 @tokenizer_for(comments.Comment)
 def comment_tokenizer(target: comments.Comment, tokenize):
-  yield from Symbol("//") + SP() + Literal(target.txt)
+  yield from LINE_COMMENT_START
+  yield Literal(target.txt)
 
 
 @tokenizer_for(comments.Banner)
 def banner_tokenizer(target: comments.Banner, tokenize):
-  banner_txt = target.border_char * target.num
-  yield from Symbol("//") + SP() + Literal(banner_txt) + CR()
-  yield from Symbol("//") + SP() + Literal(target.txt) + CR()
-  yield from Symbol("//") + SP() + Literal(banner_txt) + CR()
+  banner = Literal(target.border_char * target.num)
+  for literal in (banner, Literal(target.txt), banner):
+    yield from LINE_COMMENT_START
+    yield literal
+    yield CR
 
 
 @tokenizer_for(comments.BlockComment)
 def block_comment_tokenizer(target: comments.BlockComment, tokenize):
-  yield from Symbol("/*") + SP() + Literal(target.txt) + SP() + Symbol("*/")
\ No newline at end of file
+  yield from BLOCK_COMMENT_START
+  yield Literal(target.txt)
+  yield from BLOCK_COMMENT_STOP
+
+
+@emitter_for(comment_tokenizer)
+def comment_emitter(target: comments.Comment, out, emit):
+  out.add_word("// " + str(target.txt))
+
+
+@emitter_for(banner_tokenizer)
+def banner_emitter(target: comments.Banner, out, emit):
+  banner = "// " + str(target.border_char * target.num)
+  for line in (banner, "// " + str(target.txt), banner):
+    out.add_word(line)
+    out.newline()
+
+
+@emitter_for(block_comment_tokenizer)
+def block_comment_emitter(target: comments.BlockComment, out, emit):
+  out.add_word("/* " + str(target.txt) + " */")
@@ -0,0 +1,32 @@
+"""Tokenizers for generic containers (groups and blocks).
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from imp.base.models import container
+from imp.base.writers.model_tokenizer import emitter_for, tokenizer_for
+
+
+@tokenizer_for(container.Container)
+def container_tokenizer(target: container.Container, tokenize):
+  """Groups and blocks don't add any code of their own."""
+  for item in target.iter_items(expand=False):
+    yield from tokenize(item)
+
+
+@emitter_for(container_tokenizer)
+def container_emitter(target: container.Container, out, emit):
+  for item in target.iter_items(expand=False):
+    emit(item)
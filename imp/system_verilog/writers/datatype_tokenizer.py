@@ -16,7 +16,7 @@ limitations under the License.
 """
 
 
-from imp.base.writers.model_tokenizer import tokenizer_for
+from imp.base.writers.model_tokenizer import emitter_for, tokenizer_for
 from imp.base.writers import tokens
 from imp.system_verilog.models import datatypes
 from imp.base.writers.tokens import CommaSeperated
@@ -27,10 +27,15 @@ Number = tokens.Number
 Keyword = tokens.Keyword
 Symbol = tokens.Symbol
 
-SP = tokens.Space
-CR = tokens.NewLine
+SP = tokens.SPACE
+CR = tokens.NEWLINE
 
 
-@tokenizer_for(datatypes.IntegerAtomType)
+@tokenizer_for(datatypes.IntegerAtomType, memoize=True)
 def inttype_tokenizer(target: datatypes.IntType, tokenize):
   yield Keyword(target.type_name)
+
+
+@emitter_for(inttype_tokenizer)
+def inttype_emitter(target: datatypes.IntType, out, emit):
+  out.add_word(str(target.type_name))
@@ -0,0 +1,95 @@
+"""Tokenizers for parameter expressions.
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from imp.base.writers import tokens
+from imp.base.writers.model_tokenizer import emitter_for, tokenizer_for
+from imp.system_verilog.models import expressions
+
+SP = tokens.SPACE
+Symbol = tokens.Symbol
+Literal = tokens.Literal
+
+
+def _needs_parens(operand, precedence: int, right: bool) -> bool:
+  """Returns True if an operand must be parenthesized to keep its meaning."""
+  operand_precedence = getattr(operand, "precedence", None)
+  if operand_precedence is None:
+    return False
+  return operand_precedence < precedence or (right and operand_precedence == precedence)
+
+
+def _operand_tokens(operand, precedence: int, right: bool, tokenize):
+  if not isinstance(operand, expressions.Expression):
+    yield Literal(operand)
+  elif _needs_parens(operand, precedence, right):
+    yield tokens.OPEN_PAREN
+    yield from tokenize(operand)
+    yield tokens.CLOSE_PAREN
+  else:
+    yield from tokenize(operand)
+
+
+def _emit_operand(operand, precedence: int, right: bool, out, emit):
+  if not isinstance(operand, expressions.Expression):
+    out.add_word(str(operand))
+  elif _needs_parens(operand, precedence, right):
+    out.add_word("(")
+    emit(operand)
+    out.add_word(")")
+  else:
+    emit(operand)
+
+
+@tokenizer_for(expressions.NamedValue)
+def named_value_tokenizer(target: expressions.NamedValue, tokenize):
+  """Parameters in expressions are referred to by name."""
+  yield tokens.Identifier(target.name)
+
+
+@emitter_for(named_value_tokenizer)
+def named_value_emitter(target: expressions.NamedValue, out, emit):
+  out.add_word(str(target.name))
+
+
+@tokenizer_for(expressions.BinaryOp)
+def binary_op_tokenizer(target: expressions.BinaryOp, tokenize):
+  precedence = target.precedence
+  yield from _operand_tokens(target.left, precedence, False, tokenize)
+  yield SP
+  yield Symbol(target.op)
+  yield SP
+  yield from _operand_tokens(target.right, precedence, True, tokenize)
+
+
+@emitter_for(binary_op_tokenizer)
+def binary_op_emitter(target: expressions.BinaryOp, out, emit):
+  precedence = target.precedence
+  _emit_operand(target.left, precedence, False, out, emit)
+  out.add_word(" " + target.op + " ")
+  _emit_operand(target.right, precedence, True, out, emit)
+
+
+@tokenizer_for(expressions.UnaryOp)
+def unary_op_tokenizer(target: expressions.UnaryOp, tokenize):
+  yield Symbol(target.op)
+  yield from _operand_tokens(target.operand, target.precedence, True, tokenize)
+
+
+@emitter_for(unary_op_tokenizer)
+def unary_op_emitter(target: expressions.UnaryOp, out, emit):
+  out.add_word(target.op)
+  _emit_operand(target.operand, target.precedence, True, out, emit)
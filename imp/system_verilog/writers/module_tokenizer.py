@@ -16,7 +16,7 @@ limitations under the License.
 """
 
 from imp.base.writers import tokens
-from imp.base.writers.model_tokenizer import tokenizer_for
+from imp.base.writers.model_tokenizer import emitter_for, tokenizer_for
 from imp.system_verilog.models import modules
 
 
@@ -24,25 +24,54 @@ from imp.system_verilog.models import modules
 Identifier = tokens.Identifier
 Keyword = tokens.Keyword
 Symbol = tokens.Symbol
-SP = tokens.Space
-CR = tokens.NewLine
+SP = tokens.SPACE
+CR = tokens.NEWLINE
+
+
+def module_header_tokens(module: modules.Module):
+  """Yields the tokens opening a module definition, before its items."""
+  yield from Keyword('module') + SP + Identifier(module.module_name)
+  yield from tokens.OPEN_PAREN + CR
+  yield from tokens.CLOSE_PAREN + tokens.SEMICOLON + CR
+
+  yield tokens.INDENT
+
+
+def module_footer_tokens():
+  """Yields the tokens closing a module definition, after its items."""
+  yield tokens.DEDENT
+  yield from Keyword('endmodule') + CR
 
 
 @tokenizer_for(modules.Module)
 def module_tokenizer(module: modules.Module, tokenize):
 
-  yield from Keyword('module') + SP() + Identifier(module.module_name)
-  yield from Symbol('(') + CR()
-  yield from Symbol(')') + Symbol(';') + CR()
-
-  yield tokens.Indent()
+  yield from module_header_tokens(module)
 
   # If the module is not empty, insert a  new line before additional items.
   if len(module.items):
-    yield CR()
+    yield CR
 
-  for item in module.items:
+  for item in module.iter_items(expand=False):
     yield from tokenize(item)
 
-  yield tokens.Dedent()
-  yield from Keyword('endmodule') + CR()
\ No newline at end of file
+  yield from module_footer_tokens()
+
+
+@emitter_for(module_tokenizer)
+def module_emitter(module: modules.Module, out, emit):
+  out.add_word("module " + str(module.module_name) + "(")
+  out.newline()
+  out.add_word(");")
+  out.newline()
+
+  out.indent()
+  if len(module.items):
+    out.newline()
+
+  for item in module.iter_items(expand=False):
+    emit(item)
+
+  out.dedent()
+  out.add_word("endmodule")
+  out.newline()
@@ -16,22 +16,48 @@ limitations under the License.
 """
 
 from imp.base.writers import tokens
-from imp.base.writers.model_tokenizer import tokenizer_for
+from imp.base.writers.model_tokenizer import emitter_for, tokenizer_for
+from imp.system_verilog.models import expressions
 from imp.system_verilog.models import parameters
 
-SP = tokens.Space
+SP = tokens.SPACE
 Symbol = tokens.Symbol
 Keyword = tokens.Keyword
 Literal = tokens.Literal
-CR = tokens.NewLine
+CR = tokens.NEWLINE
+
+# Constant token sequences, shared by all declarations.
+LOCALPARAM_START = (Keyword('localparam'), SP)
+ASSIGN = (SP, tokens.EQUALS, SP)
+DECLARATION_STOP = (tokens.SEMICOLON, CR)
 
 
 @tokenizer_for(parameters.LocalParamDeclaration)
 def localparam_declaration_tokenizer(target: parameters.LocalParamDeclaration, tokenize):
   identifiers = [tokens.Identifier(name) for name in target.names]
-  yield from Keyword('localparam') + SP()
-  yield from tokenize(target.localparam.dtype) + SP()
+  yield from LOCALPARAM_START
+  yield from tokenize(target.localparam.dtype)
+  yield SP
   yield from tokens.CommaSeperated(identifiers, tokenize)
-  if value := target.localparam.value:
-    yield from SP() + Symbol("=") + SP() + Literal(value)
-  yield from Symbol(";") + CR()
+  if (value := target.localparam.expression) is not None:
+    yield from ASSIGN
+    if isinstance(value, expressions.Expression):
+      yield from tokenize(value)
+    else:
+      yield Literal(value)
+  yield from DECLARATION_STOP
+
+
+@emitter_for(localparam_declaration_tokenizer)
+def localparam_declaration_emitter(target: parameters.LocalParamDeclaration, out, emit):
+  out.add_word("localparam ")
+  emit(target.localparam.dtype)
+  out.add_word(" " + ", ".join(str(name) for name in target.names))
+  if (value := target.localparam.expression) is not None:
+    if isinstance(value, expressions.Expression):
+      out.add_word(" = ")
+      emit(value)
+    else:
+      out.add_word(" = " + str(value))
+  out.add_word(";")
+  out.newline()
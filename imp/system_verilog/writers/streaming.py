@@ -0,0 +1,82 @@
+"""Modules which are written while they are built.
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from imp.base.models import component
+from imp.system_verilog.models import modules
+
+from typing import Callable, Iterable, List
+
+
+class _Written:
+  """Stands in for the parent of the items of a StreamingModule once written.
+
+  Adding items to a container updates the views of its ancestors, which
+  reach this object and raise, rather than the items being silently lost.
+  """
+  __slots__ = ()
+
+  def _raise(self, *args):
+    raise ValueError("Items can't be added to a container of a StreamingModule once it is written")
+
+  __getattr__ = _raise
+  __setattr__ = _raise
+
+
+_WRITTEN = _Written()
+
+
+class StreamingModule(modules.Module):
+  """A module whose items are written as they are added, rather than kept.
+
+  Created by SystemVerilogWriter.stream. Each item added to the module is
+  written when the next one is added, or when the stream ends, so that
+  containers returned by builders such as `group` can be filled in until
+  then. Only that last item is held in `items`, the written ones are
+  dropped. Named items stay in the module's namespace, so they can be looked
+  up and used in expressions, and name collisions are still detected.
+  Adding items to a container once it is written raises a ValueError.
+  """
+  __slots__ = ("_emit",)
+
+  def __init__(self, module_name: str, emit: Callable[[component.Component], None]):
+    super().__init__(module_name=module_name)
+    self._emit = emit
+
+  def _hold(self, item: component.Component):
+    self.flush()
+    self._items.append(item)
+    item.set_parent(self)
+    # The views would only ever hold the last item, and aren't kept.
+    self._drop_views()
+
+  def _add_item(self, item: component.Component) -> component.Component:
+    self._hold(item)
+    return item
+
+  def _add_items(self, items: Iterable[component.Component]) -> List[component.Component]:
+    items = list(items)
+    for item in items:
+      self._hold(item)
+    return items
+
+  def flush(self):
+    """Writes the item added last, if it hasn't been written yet."""
+    if self._items:
+      item = self._items.pop()
+      self._drop_views()
+      self._emit(item)
+      item.set_parent(_WRITTEN)
@@ -0,0 +1,263 @@
+"""Generates variants of a module for a grid of parameter values.
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import collections
+import os
+import pathlib
+import re
+
+from imp.base.writers.file_output import FileOutput
+from imp.system_verilog.models import expressions
+from imp.system_verilog.models import modules
+from imp.system_verilog.writers import systemverilog_writer
+
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+try:
+  import numpy
+except ImportError:
+  numpy = None
+
+# Slot markers in the template text. NUL characters don't occur in code.
+_MARKER = "\0{}\0"
+_MARKER_RE = re.compile("\0([0-9]+)\0")
+
+
+def _is_array(value) -> bool:
+  return numpy is not None and isinstance(value, numpy.ndarray)
+
+
+def _array_div(a, b):
+  if not numpy.issubdtype(numpy.result_type(a, b), numpy.integer):
+    return numpy.true_divide(a, b)
+  # SystemVerilog integer division truncates towards zero.
+  q = numpy.abs(a) // numpy.abs(b)
+  return numpy.where((a < 0) == (b < 0), q, -q)
+
+
+def _array_mod(a, b):
+  if not numpy.issubdtype(numpy.result_type(a, b), numpy.integer):
+    return numpy.fmod(a, b)
+  return a - b * _array_div(a, b)
+
+
+_ARRAY_FUNCTIONS = {"/": _array_div, "%": _array_mod}
+
+
+class ParameterSweep:
+  """Emits variants of a module, one per point of a parameter grid.
+
+  The module is the template. Its swept parameters are the slots, whose
+  values differ between variants. The module is formatted once, with markers
+  in place of the values of the slots and of the module name. Each variant's
+  text is then produced by filling in the markers, rather than by building
+  and writing a module per variant.
+
+  Parameters derived from the swept ones are written as their expressions,
+  which are the same for all variants, unless they are listed in `folded`.
+  Those are written as their folded values, which are computed for all grid
+  points at once, with NumPy arrays when the grid holds them and with lists
+  otherwise.
+
+  Example:
+
+    sweep = ParameterSweep(template, swept=["depth", "width"], folded=["size"])
+    for name, text in sweep.texts({"depth": depths, "width": widths},
+                                  name_format="mem_{depth}x{width}"):
+      ...
+  """
+
+  def __init__(self, module: modules.Module, swept: Sequence[str], folded: Sequence[str] = (),
+               writer: Optional[systemverilog_writer.SystemVerilogWriter] = None):
+    self.module = module
+    self.swept = list(swept)
+    self.folded = list(folded)
+    self.writer = writer or systemverilog_writer.SystemVerilogWriter()
+    self._fragments, self._slot_names = self._render_template()
+
+  def _render_template(self) -> Tuple[List[str], List[str]]:
+    """Formats the module with markers, and splits the text at the markers."""
+    slot_names = ["module_name", *self.swept, *self.folded]
+    # A derived copy is formatted, so that the template isn't modified while
+    # other threads may use it.
+    marked = self.module.derive(
+        module_name=_MARKER.format(0),
+        values={name: _MARKER.format(i) for i, name in enumerate(slot_names[1:], start=1)})
+    text = self.writer.get_text_for(marked)
+
+    parts = _MARKER_RE.split(text)
+    # Text fragments alternate with slot indices.
+    fragments = parts[0::2]
+    slot_order = [slot_names[int(i)] for i in parts[1::2]]
+    return fragments, slot_order
+
+  def evaluate(self, grid) -> Dict[str, Any]:
+    """Returns the values of the named parameters for all grid points.
+
+    Args:
+      grid: A mapping from swept parameter names to equally long sequences or
+        arrays of values, or a NumPy structured array with those fields.
+
+    Returns:
+      A mapping from parameter names to their values per grid point, as
+      arrays or lists. Parameters which don't depend on swept ones map to
+      their single value.
+    """
+    return self._evaluate(self._grid_columns(grid))
+
+  def _evaluate(self, columns: Dict[str, Any]) -> Dict[str, Any]:
+    # Swept parameters are looked up by path, like when rendering the template.
+    inputs = {id(self.module.lookup(name)): columns[name] for name in self.swept}
+    # Values per grid point, by expression id. Other expressions have a
+    # single value.
+    varying = {}
+    for node in self._evaluation_order(inputs):
+      if id(node) in inputs:
+        varying[id(node)] = inputs[id(node)]
+      elif any(id(op) in varying for op in node.operands):
+        operands = [varying[id(op)] if id(op) in varying else expressions.evaluate(op)
+                    for op in node.operands]
+        varying[id(node)] = self._fold_columns(node, operands)
+
+    return {name: varying[id(item)] if id(item) in varying else item.evaluate()
+            for name, item in self.module.symbols()
+            if isinstance(item, expressions.NamedValue)}
+
+  def _grid_columns(self, grid) -> Dict[str, Any]:
+    names = getattr(getattr(grid, "dtype", None), "names", None)
+    columns = {name: grid[name] for name in names} if names else dict(grid)
+    missing = set(self.swept) - set(columns)
+    if missing:
+      raise ValueError(f"The grid has no values for {sorted(missing)}")
+
+    lengths = {len(column) for column in columns.values()}
+    if len(lengths) > 1:
+      raise ValueError(f"The grid's columns have different lengths: {sorted(lengths)}")
+    for name, column in columns.items():
+      if not _is_array(column):
+        columns[name] = list(column)
+    return columns
+
+  def _evaluation_order(self, inputs: Dict[int, Any]) -> List[expressions.Expression]:
+    """Returns the expressions of the module's named values, operands first.
+
+    The operands of the swept parameters, given by id in inputs, are skipped.
+    """
+    order = []
+    visited = set()
+    roots = [item for _, item in self.module.symbols() if isinstance(item, expressions.NamedValue)]
+    # Post-order walk with an explicit stack, as chains can be long.
+    stack = [(root, False) for root in reversed(roots)]
+    while stack:
+      node, expanded = stack.pop()
+      if expanded:
+        order.append(node)
+        continue
+      if id(node) in visited:
+        continue
+      visited.add(id(node))
+      stack.append((node, True))
+      # Swept parameters are inputs, whatever their expression.
+      if id(node) not in inputs:
+        for op in reversed(node.operands):
+          if isinstance(op, expressions.Expression) and id(op) not in visited:
+            stack.append((op, False))
+    return order
+
+  def _fold_columns(self, node: expressions.Expression, operands):
+    if isinstance(node, expressions.NamedValue):
+      return operands[0]
+
+    if isinstance(node, expressions.BinaryOp):
+      fn = expressions.BINARY_OPERATORS[node.op][1]
+      array_fn = _ARRAY_FUNCTIONS.get(node.op, fn)
+    else:
+      fn = array_fn = expressions.UNARY_OPERATORS[node.op]
+
+    if any(_is_array(op) for op in operands):
+      # NumPy broadcasts single values over the arrays.
+      return array_fn(*operands)
+
+    length = max(len(op) for op in operands if isinstance(op, list))
+    columns = [op if isinstance(op, list) else [op] * length for op in operands]
+    return [fn(*values) for values in zip(*columns)]
+
+  def texts(self, grid, name_format: Optional[str] = None) -> Iterator[Tuple[str, str]]:
+    """Yields the module name and text of each variant.
+
+    Args:
+      grid: The parameter grid, see `evaluate`.
+      name_format: A str.format pattern for the module name of each variant,
+        given the values of all named parameters. Defaults to the template's
+        name.
+    """
+    return self._fill(*self._slot_values(grid, name_format))
+
+  def _fill(self, names: List[str], slots: List[List[str]]) -> Iterator[Tuple[str, str]]:
+    fragments = self._fragments
+    last = fragments[-1]
+    for i, name in enumerate(names):
+      parts = []
+      for fragment, slot in zip(fragments, slots):
+        parts.append(fragment)
+        parts.append(slot[i])
+      parts.append(last)
+      yield name, "".join(parts)
+
+  def _slot_values(self, grid, name_format: Optional[str]) -> Tuple[List[str], List[List[str]]]:
+    """Returns the module names, and the text of each slot, per variant."""
+    grid_columns = self._grid_columns(grid)
+    values = self._evaluate(grid_columns)
+    count = len(next(iter(grid_columns.values()), ()))
+
+    def per_point(value):
+      if _is_array(value):
+        return value.tolist()
+      return value if isinstance(value, list) else [value] * count
+
+    columns = {name: per_point(value) for name, value in values.items()}
+    if name_format is None:
+      names = [self.module.module_name] * count
+    else:
+      names = [name_format.format(**dict(zip(columns, point))) for point in zip(*columns.values())]
+    columns["module_name"] = names
+    return names, [list(map(str, columns[name])) for name in self._slot_names]
+
+  def write(self, grid, output: Union[str, os.PathLike], name_format: str,
+            file_output: Optional[FileOutput] = None) -> List[pathlib.Path]:
+    """Writes each variant to '<module name>.sv' in a directory.
+
+    Files are written like SystemVerilogWriter.write_many, optionally through
+    a FileOutput which skips unchanged files.
+    """
+    names, slots = self._slot_values(grid, name_format)
+    duplicates = sorted(name for name, count in collections.Counter(names).items() if count > 1)
+    if duplicates:
+      raise ValueError(f"Variants would overwrite each other's files: {duplicates}")
+
+    output = pathlib.Path(output)
+    output.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for name, text in self._fill(names, slots):
+      path = output / f"{name}.sv"
+      if file_output is None:
+        # The same bytes as FileOutput writes, whatever the locale.
+        path.write_bytes((text + "\n").encode())
+      else:
+        file_output.write_text(text + "\n", path)
+      paths.append(path)
+    return paths
@@ -17,11 +17,16 @@ limitations under the License.
 
 from imp.base.models import component
 from imp.base.writers import tokens
+from imp.base.writers import model_tokenizer
 from imp.system_verilog.writers import comments_tokenizer
+from imp.system_verilog.writers import container_tokenizer
 from imp.system_verilog.writers import datatype_tokenizer
+from imp.system_verilog.writers import expression_tokenizer
 from imp.system_verilog.writers import module_tokenizer
 from imp.system_verilog.writers import parameter_tokenizer
 
+import collections
+
 from typing import Callable, Sequence
 
 # A specific SystemVerilog tokenizer is defined by importing the component tokenizers
@@ -31,6 +36,9 @@ from typing import Callable, Sequence
 # take precedence over those defined earlier.
 _DEFAULT_TOKENIZER_FUNCTIONS = (
 
+  # Generic containers
+  container_tokenizer.container_tokenizer,
+
   # Comments
   comments_tokenizer.comment_tokenizer,
   comments_tokenizer.banner_tokenizer,
@@ -39,6 +47,11 @@ _DEFAULT_TOKENIZER_FUNCTIONS = (
   # Datatypes
   datatype_tokenizer.inttype_tokenizer,
 
+  # Expressions
+  expression_tokenizer.named_value_tokenizer,
+  expression_tokenizer.binary_op_tokenizer,
+  expression_tokenizer.unary_op_tokenizer,
+
   # Parameters
   parameter_tokenizer.localparam_declaration_tokenizer,
 
@@ -52,9 +65,22 @@ _DEFAULT_TOKENIZER_FUNCTIONS = (
 
 TokenizerFunctionType = Callable[[component.Component], Sequence[tokens.Token]]
 
+CacheInfo = collections.namedtuple("CacheInfo", ["hits", "misses", "currsize"])
+
+# Emitters recurse through the hierarchy, so items nested deeper than this
+# are tokenized instead, which IterativeSystemVerilogTokenizer does without
+# recursing.
+_MAX_EMIT_DEPTH = 100
+
 
 class SystemVerilogTokenizer:
-  """Produces SystemVerilog tokens from components."""
+  """Produces SystemVerilog tokens from components.
+
+  Tokenizing is thread-safe: the dispatch and memoization caches are only
+  ever filled with equivalent values. Handlers shouldn't be registered while
+  other threads are tokenizing, and cache statistics may be approximate when
+  the tokenizer is shared between threads.
+  """
 
   _base_tokens_classes = (
     tokens.Keyword,
@@ -66,20 +92,161 @@ class SystemVerilogTokenizer:
   def __init__(self,
                tokenizer_functions=_DEFAULT_TOKENIZER_FUNCTIONS):
     self.handlers_by_token_cls = {}
+    self._handlers_by_type = {}
+    self._memo = {}
+    self._memo_hits = 0
+    self._memo_misses = 0
+    self.instrumentation = None
     # Using reversed to allow later tokenizers to get priority.
     for fn in reversed(tokenizer_functions):
       target = fn.__dict__['tokenizer_for']
       self.handlers_by_token_cls[target] = fn
 
+  def register(self, tokenizer_fn):
+    """Adds a tokenizer function, taking precedence over existing ones."""
+    target = tokenizer_fn.__dict__['tokenizer_for']
+    handlers = {target: tokenizer_fn}
+    for token_cls, handler in self.handlers_by_token_cls.items():
+      handlers.setdefault(token_cls, handler)
+    self.handlers_by_token_cls = handlers
+    self._handlers_by_type.clear()
+    self.clear_cache()
+    return tokenizer_fn
+
+  def __getstate__(self):
+    # Handlers wrapped by instrumentation can't be pickled, and are dropped.
+    state = self.__dict__.copy()
+    state["_handlers_by_type"] = {}
+    state["instrumentation"] = None
+    return state
+
+  def set_instrumentation(self, instrumentation):
+    """Attaches an Instrumentation, or detaches it when given None."""
+    self.instrumentation = instrumentation
+    self._handlers_by_type.clear()
+
+  def cache_info(self) -> CacheInfo:
+    """Returns statistics for the memoized tokenizer functions."""
+    return CacheInfo(self._memo_hits, self._memo_misses, len(self._memo))
+
+  def clear_cache(self):
+    """Clears the memoized tokens and their statistics."""
+    self._memo.clear()
+    self._memo_hits = 0
+    self._memo_misses = 0
+
+  def handler_for(self, item_type: type):
+    """Returns the tokenizer function for a type, or None for base tokens.
+
+    The lookup walks `handlers_by_token_cls` in priority order once per type,
+    and the result is cached.
+    """
+    try:
+      return self._handlers_by_type[item_type]
+    except KeyError:
+      pass
+
+    if issubclass(item_type, self._base_tokens_classes):
+      handler = None
+    else:
+      mro = item_type.__mro__
+      for token_cls, handler in self.handlers_by_token_cls.items():
+        if token_cls in mro:
+          break
+      else:
+        raise ValueError(f"Could not find a tokenizer for {item_type}")
+      if self.instrumentation is not None:
+        handler = self.instrumentation.wrap_tokenizer(handler)
+
+    self._handlers_by_type[item_type] = handler
+    return handler
 
   def tokenize(self, item):
     # Dispatch on the component type.
-    if isinstance(item, self._base_tokens_classes):
+    handler = self.handler_for(type(item))
+    if handler is None:
       yield item
+    elif getattr(handler, "memoize", False):
+      yield from self._memoized_tokens(item, handler)
     else:
-      for token_cls, handler in self.handlers_by_token_cls.items():
-        if isinstance(item, token_cls):
-          yield from handler(item, tokenize=self.tokenize)
+      yield from handler(item, tokenize=self.tokenize)
+
+  def emit(self, item, out):
+    """Writes the text for an item directly to a formatter.
+
+    Components whose tokenizer function has an emitter are written without
+    creating any tokens. Others are tokenized, and their tokens processed by
+    the formatter. The text is the same as formatting `tokenize(item)`.
+    Formatters which override token handlers are always given tokens, and
+    so are items nested more than _MAX_EMIT_DEPTH levels deep.
+    """
+    if out._overrides_handlers():
+      out.process_tokens(self.tokenize(item))
+      return
+    handler_for = self.handler_for
+    tokenize = self.tokenize
+    depth = 0
+
+    def emit_item(item):
+      nonlocal depth
+      handler = handler_for(type(item))
+      if handler is None:
+        out.handle(item)
+      elif (emitter := getattr(handler, "emitter", None)) is not None and depth < _MAX_EMIT_DEPTH:
+        depth += 1
+        emitter(item, out, emit_item)
+        depth -= 1
+      else:
+        out.process_tokens(tokenize(item))
+
+    emit_item(item)
+
+  def _memoized_tokens(self, item, handler):
+    """Returns the cached tokens for an item, tokenizing it on a miss."""
+    try:
+      cached = self._memo[item]
+    except KeyError:
+      self._memo_misses += 1
+      cached = self._memo[item] = tuple(handler(item, tokenize=self.tokenize))
+      return cached
+    except TypeError:
+      # Unhashable items can't be memoized.
+      return handler(item, tokenize=self.tokenize)
+    self._memo_hits += 1
+    return cached
+
+
+class IterativeSystemVerilogTokenizer(SystemVerilogTokenizer):
+  """Produces SystemVerilog tokens, walking the hierarchy with an explicit stack.
+
+  SystemVerilogTokenizer passes its own `tokenize` to the handlers, so each
+  level of the hierarchy adds nested generators through which every token is
+  forwarded. Here, handlers are given a `tokenize` which returns a Descend work
+  item instead. It is yielded back to this driver, which then runs the child's
+  handler directly. Tokens are forwarded through a single generator at any
+  depth, and deep hierarchies don't hit the recursion limit.
+
+  Handlers must only iterate the results of `tokenize`, i.e. use
+  `yield from tokenize(child)`, optionally adding tokens to it.
+  """
+
+  def tokenize(self, item):
+    Descend = model_tokenizer.Descend
+    stack = [iter((Descend(item),))]
+    while stack:
+      for token in stack[-1]:
+        if type(token) is not Descend:
+          yield token
+          continue
+
+        child = token.item
+        handler = self.handler_for(type(child))
+        if handler is None:
+          yield child
+        elif getattr(handler, "memoize", False):
+          yield from self._memoized_tokens(child, handler)
+        else:
+          stack.append(iter(handler(child, tokenize=Descend)))
           break
       else:
-        raise ValueError(f"Could not find a tokenizer for {item} ({type(item)}")
+        stack.pop()
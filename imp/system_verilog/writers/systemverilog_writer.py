@@ -15,16 +15,148 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import collections
+import concurrent.futures
+import contextlib
+import os
+import pathlib
+
+from imp.base.writers import emission_cache
+from imp.base.writers.file_output import FileOutput
 from imp.base.writers import writer
-from imp.base.writers import formatter
+from imp.base.writers.formatter import Formatter
+from imp.base.writers import tokens
+from imp.system_verilog.writers import module_tokenizer
+from imp.system_verilog.writers import streaming
 from imp.system_verilog.writers import systemverilog_tokenizer
 
+from typing import Iterator, List, Optional, Sequence
+
+# The writer used by each worker process of SystemVerilogWriter.write_many.
+_worker_writer = None
+
+
+def _init_worker(writer_: 'SystemVerilogWriter'):
+  global _worker_writer
+  _worker_writer = writer_
+
+
+def _get_text_in_worker(item) -> str:
+  return _worker_writer.get_text_for(item)
+
 
 class SystemVerilogWriter(writer.Writer):
   """Produces SystemVerilog text from models."""
 
   def __init__(self,
-               tokenizer=systemverilog_tokenizer.SystemVerilogTokenizer(),
-               formatter=formatter.Formatter()):
+               tokenizer: Optional[systemverilog_tokenizer.SystemVerilogTokenizer] = None,
+               formatter: Optional[Formatter] = None,
+               cache: Optional[emission_cache.EmissionCache] = None,
+               direct: bool = False,
+               release: bool = False):
+    if tokenizer is None:
+      tokenizer = systemverilog_tokenizer.IterativeSystemVerilogTokenizer()
+    if formatter is None:
+      formatter = Formatter()
+    super().__init__(tokenizer=tokenizer, formatter=formatter, cache=cache, direct=direct,
+                     release=release)
+
+  @contextlib.contextmanager
+  def stream(self, module_name: str, output) -> Iterator[streaming.StreamingModule]:
+    """Builds a module while writing it to a text or binary file-like object.
+
+    Yields a StreamingModule, which is built like a Module. Each added item
+    is written as soon as the next one is added, and is then dropped, so the
+    memory used doesn't grow with the size of the module. Containers returned
+    by builders such as `group` must be filled in before the next item is
+    added, and raise a ValueError when added to afterwards. The module is ended when the context exits without an exception.
+    If it exits with one, the items written until then are still flushed to
+    the output, without the item added last or the end of the module, so the
+    output is partial.
+
+    The text is the same as writing the equivalent Module with `write_to`:
+
+      with writer.stream("top", output) as m:
+        m.comment("A large netlist.")
+        for i in range(n):
+          m.localparam(name=f"p{i}", dtype=IntType(), value=i)
+    """
+    formatter = self.formatter.clone()
+    formatter.reset(sink=output)
+    started = False
+
+    def emit(item):
+      nonlocal started
+      if not started:
+        # A new line separates the header from the first item.
+        formatter.process_tokens([tokens.NEWLINE])
+        started = True
+      self._process(item, formatter)
+      self._release(item)
+
+    module = streaming.StreamingModule(module_name, emit)
+    formatter.process_tokens(module_tokenizer.module_header_tokens(module))
+    try:
+      yield module
+      module.flush()
+      formatter.process_tokens(module_tokenizer.module_footer_tokens())
+    finally:
+      formatter.finish()
+
+  def write_many(self, modules: Sequence, output, workers: Optional[int] = None,
+                 file_output: Optional[FileOutput] = None) -> Optional[List[pathlib.Path]]:
+    """Converts modules to text using a pool of worker processes.
+
+    Each worker process gets its own copy of this writer, and so its own
+    formatter state. The output is the same, and in the same order, as
+    converting the modules one at a time.
+
+    Args:
+      modules: The modules to convert. They must be picklable.
+      output: Either a directory, in which each module is written to a
+        '<module name>.sv' file, or a text stream to which all modules are
+        written one after another.
+      workers: The number of worker processes, defaults to the CPU count. With
+        one worker, the modules are converted in this process.
+      file_output: When writing to a directory, writes the files through this
+        FileOutput, which skips unchanged files and counts written ones.
+
+    Returns:
+      The paths of the written files when output is a directory.
+    """
+    workers = workers or os.cpu_count() or 1
+    to_directory = isinstance(output, (str, os.PathLike))
+    if to_directory:
+      counts = collections.Counter(module.name for module in modules)
+      duplicates = [name for name, count in counts.items() if count > 1]
+      if duplicates:
+        raise ValueError(f"Modules would overwrite each other's files: {duplicates}")
+      output = pathlib.Path(output)
+      output.mkdir(parents=True, exist_ok=True)
+
+    if workers == 1:
+      return self._write_texts(modules, map(self.get_text_for, modules), output, file_output)
+
+    chunksize = max(1, len(modules) // (workers * 4))
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(self,)) as executor:
+      texts = executor.map(_get_text_in_worker, modules, chunksize=chunksize)
+      return self._write_texts(modules, texts, output, file_output)
+
+  def _write_texts(self, modules, texts, output, file_output):
+    if not isinstance(output, pathlib.Path):
+      for text in texts:
+        output.write(text)
+        output.write("\n")
+      return None
 
-    super().__init__(tokenizer=tokenizer, formatter=formatter)
+    paths = []
+    for module, text in zip(modules, texts):
+      path = output / f"{module.name}.sv"
+      if file_output is None:
+        # The same bytes as FileOutput writes, whatever the locale.
+        path.write_bytes((text + "\n").encode())
+      else:
+        file_output.write_text(text + "\n", path)
+      paths.append(path)
+    return paths
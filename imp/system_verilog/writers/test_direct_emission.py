@@ -0,0 +1,133 @@
+"""Differential tests for direct emission against the token path.
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import io
+
+import pytest
+
+from imp.base.models import comments
+from imp.base.models import container
+from imp.base.writers import tokens
+from imp.base.writers.formatter import Formatter
+from imp.base.writers.model_tokenizer import tokenizer_for
+from imp.system_verilog.models import datatypes
+from imp.system_verilog.models import modules
+from imp.system_verilog.writers import systemverilog_tokenizer
+from imp.system_verilog.writers import systemverilog_writer
+
+
+def _empty_module():
+  return modules.Module(module_name="empty")
+
+
+def _every_component():
+  m = modules.Module(module_name="example")
+  m.banner("Parameters")
+  m.localparam(name="p0", dtype=datatypes.IntType(), value=0)
+  m.localparam(name="p1", dtype=datatypes.IntType(), value="p0 + 1")
+  group = m.group()
+  group._add_item(comments.Comment("in a group"))
+  blk = m.block(name="named")
+  blk._add_item(comments.BlockComment("in a block"))
+  blk._add_item(container.Block())._add_item(comments.Banner("nested"))
+  m.comment("done")
+  return m
+
+
+def _nested(depth=50):
+  m = modules.Module(module_name="nested")
+  blk = m
+  for i in range(depth):
+    blk = blk._add_item(container.Block())
+    blk._add_item(comments.Banner(f"level {i}"))
+    blk._add_item(comments.Comment(f"comment {i}"))
+  return m
+
+
+def _large(n=2_000):
+  # Like the modules in benchmarks/.
+  m = modules.Module(module_name=f"bench_{n}")
+  for i in range(n):
+    if i % 100 == 0:
+      blk = m.block()
+    m.localparam(name=f"p{i}", dtype=datatypes.IntType(), value=i)
+    blk._add_item(comments.Comment(f"c{i}"))
+  return m
+
+
+@pytest.mark.parametrize("build", [_empty_module, _every_component, _nested, _large])
+def test_direct_emission_matches_tokens(build):
+  m = build()
+  expected = systemverilog_writer.SystemVerilogWriter().get_text_for(m)
+
+  writer = systemverilog_writer.SystemVerilogWriter(direct=True)
+  assert writer.get_text_for(m) == expected
+
+  stream = io.BytesIO()
+  writer.write_to(m, stream)
+  assert stream.getvalue() == expected.encode()
+
+
+@tokenizer_for(comments.Comment)
+def shout_tokenizer(target: comments.Comment, tokenize):
+  yield tokens.Literal(target.txt.upper())
+
+
+def test_tokenizers_without_emitters_use_tokens():
+  tokenizer = systemverilog_tokenizer.SystemVerilogTokenizer()
+  tokenizer.register(shout_tokenizer)
+  m = _every_component()
+
+  fmt = Formatter()
+  tokenizer.emit(m, fmt)
+  assert "IN A GROUP" in fmt.text
+
+  tokens_fmt = Formatter()
+  tokens_fmt.process_tokens(tokenizer.tokenize(m))
+  assert fmt.text == tokens_fmt.text
+
+
+def test_hand_tagged_tokenizers_use_tokens():
+  def whisper_tokenizer(target: comments.Comment, tokenize):
+    yield tokens.Literal(target.txt.lower())
+  # Tagged without the decorator, so without an emitter attribute.
+  whisper_tokenizer.tokenizer_for = comments.Comment
+
+  tokenizer = systemverilog_tokenizer.SystemVerilogTokenizer()
+  tokenizer.register(whisper_tokenizer)
+  fmt = Formatter()
+  tokenizer.emit(comments.Comment("QUIET"), fmt)
+  assert fmt.text == "quiet"
+
+
+class ShoutingFormatter(Formatter):
+  def handle_keyword(self, token):
+    self._current_line.append(str(token.value).upper())
+
+
+def test_formatters_overriding_handlers_use_tokens():
+  m = _every_component()
+  expected = ShoutingFormatter()
+  expected.process_tokens(systemverilog_tokenizer.SystemVerilogTokenizer().tokenize(m))
+  assert "LOCALPARAM" in expected.text
+
+  fmt = ShoutingFormatter()
+  systemverilog_tokenizer.SystemVerilogTokenizer().emit(m, fmt)
+  assert fmt.text == expected.text
+
+  writer = systemverilog_writer.SystemVerilogWriter(formatter=ShoutingFormatter(), direct=True)
+  assert writer.get_text_for(m) == expected.text
@@ -15,8 +15,19 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import concurrent.futures
+import io
+import pickle
+
+import pytest
+
+from imp.base.models import comments
+from imp.base.models import container
+from imp.base.writers import emission_cache
+from imp.base.writers import file_output
 from imp.system_verilog.models import datatypes
 from imp.system_verilog.models import modules
+from imp.system_verilog.models import parameters
 from imp.system_verilog.writers import systemverilog_writer
 
 
@@ -54,3 +65,291 @@ def test_convert_comprehensive_module_to_text():
     ]
   )
   assert text == expected
+
+
+def test_write_to_stream():
+  """Test streaming a module to text and binary sinks."""
+
+  writer = systemverilog_writer.SystemVerilogWriter()
+  target = modules.Module(module_name="example")
+  target.localparam(name="p1", dtype=datatypes.IntType(), value=30)
+  expected = writer.get_text_for(target)
+
+  text_stream = io.StringIO()
+  writer.write_to(target, text_stream)
+  assert text_stream.getvalue() == expected
+
+  binary_stream = io.BytesIO()
+  writer.write_to(target, binary_stream)
+  assert binary_stream.getvalue() == expected.encode()
+
+
+def _example_modules(n):
+  targets = []
+  for i in range(n):
+    target = modules.Module(module_name=f"example_{i}")
+    target.comment(f"Variant {i}")
+    target.localparam(name="p1", dtype=datatypes.IntType(), value=i + 1)
+    targets.append(target)
+  return targets
+
+
+def test_write_many_to_directory(tmp_path):
+  """Test writing modules to files using worker processes."""
+
+  writer = systemverilog_writer.SystemVerilogWriter()
+  targets = _example_modules(8)
+
+  paths = writer.write_many(targets, tmp_path, workers=2)
+
+  assert [p.name for p in paths] == [f"example_{i}.sv" for i in range(8)]
+  for path, target in zip(paths, targets):
+    assert path.read_text() == writer.get_text_for(target) + "\n"
+
+
+def test_write_many_to_stream():
+  """Test writing modules to a single stream, in order."""
+
+  writer = systemverilog_writer.SystemVerilogWriter()
+  targets = _example_modules(8)
+
+  stream = io.StringIO()
+  writer.write_many(targets, stream, workers=2)
+
+  assert stream.getvalue() == "".join(writer.get_text_for(t) + "\n" for t in targets)
+
+
+def _deep_module(depth):
+  # Named blocks nested deeper than the recursion limit.
+  target = modules.Module(module_name="deep")
+  blk = target
+  for i in range(depth):
+    inner = blk._add_item(container.Block(name=f"b{i}"))
+    blk._add_named_item(f"b{i}", inner)
+    inner._add_item(comments.Comment(f"comment {i}"))
+    blk = inner
+  return target
+
+
+@pytest.mark.parametrize("direct", [False, True])
+def test_deep_hierarchies(direct):
+  writer = systemverilog_writer.SystemVerilogWriter(direct=direct)
+  target = _deep_module(depth=1500)
+
+  text = writer.get_text_for(target)
+  assert "comment 1499" in text and text.endswith("endmodule")
+  assert writer.get_text_for(target.clone()) == text
+  assert writer.get_text_for(pickle.loads(pickle.dumps(target))) == text
+
+  stream = io.StringIO()
+  writer.write_many([target, _deep_module(depth=2)], stream, workers=2)
+  assert stream.getvalue().startswith(text + "\n")
+
+
+def test_write_many_rejects_duplicate_file_names(tmp_path):
+  writer = systemverilog_writer.SystemVerilogWriter()
+  targets = _example_modules(2) + _example_modules(1)
+
+  with pytest.raises(ValueError):
+    writer.write_many(targets, tmp_path, workers=1)
+
+
+def test_concurrent_get_text_for():
+  """Test sharing a writer between threads."""
+
+  writer = systemverilog_writer.SystemVerilogWriter()
+  targets = _example_modules(200)
+  for i, target in enumerate(targets):
+    for j in range(i % 20):
+      target.banner(f"Banner {j}")
+
+  expected = [writer.get_text_for(t) for t in targets]
+  with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+    for _ in range(5):
+      assert list(executor.map(writer.get_text_for, targets)) == expected
+
+
+def test_writers_do_not_share_formatters():
+  first = systemverilog_writer.SystemVerilogWriter()
+  second = systemverilog_writer.SystemVerilogWriter()
+  assert first.formatter is not second.formatter
+  assert first.tokenizer is not second.tokenizer
+
+
+def test_emission_cache(tmp_path):
+  """Test serving unchanged modules from the emission cache."""
+
+  cache = emission_cache.EmissionCache(directory=tmp_path)
+  writer = systemverilog_writer.SystemVerilogWriter(cache=cache)
+  uncached_writer = systemverilog_writer.SystemVerilogWriter()
+
+  targets = _example_modules(3)
+  texts = [writer.get_text_for(t) for t in targets]
+  assert (writer.cache_hits, writer.cache_misses) == (0, 3)
+
+  # Rebuilt but unchanged modules hit the cache, changed ones don't.
+  targets = _example_modules(3)
+  targets[1].comment("Changed")
+  assert writer.get_text_for(targets[0]) == texts[0]
+  assert writer.get_text_for(targets[1]) == uncached_writer.get_text_for(targets[1])
+  assert (writer.cache_hits, writer.cache_misses) == (1, 4)
+
+  # Entries persist across writers.
+  other = systemverilog_writer.SystemVerilogWriter(cache=emission_cache.EmissionCache(directory=tmp_path))
+  stream = io.BytesIO()
+  other.write_to(targets[2], stream)
+  assert stream.getvalue() == texts[2].encode()
+  assert (other.cache_hits, other.cache_misses) == (1, 0)
+
+
+def test_write_many_skips_unchanged_files(tmp_path):
+  """Test regenerating modules only rewrites the changed files."""
+
+  writer = systemverilog_writer.SystemVerilogWriter()
+  writer.write_many(_example_modules(4), tmp_path, workers=1)
+
+  targets = _example_modules(4)
+  targets[2].comment("Changed")
+  output = file_output.FileOutput()
+  paths = writer.write_many(targets, tmp_path, workers=1, file_output=output)
+
+  assert (output.written, output.skipped) == (1, 3)
+  assert paths[2].read_text() == writer.get_text_for(targets[2]) + "\n"
+
+
+def test_files_are_written_as_utf8(tmp_path):
+  writer = systemverilog_writer.SystemVerilogWriter()
+  targets = _example_modules(1)
+  targets[0].comment("Größe ≤ 4")
+
+  path, = writer.write_many(targets, tmp_path, workers=1)
+  assert path.read_bytes() == (writer.get_text_for(targets[0]) + "\n").encode("utf-8")
+
+  output = file_output.FileOutput()
+  writer.write_many(targets, tmp_path, workers=1, file_output=output)
+  assert (output.written, output.skipped) == (0, 1)
+
+
+@pytest.mark.parametrize("direct", [False, True])
+def test_expressions_are_written_symbolically(direct):
+  writer = systemverilog_writer.SystemVerilogWriter(direct=direct)
+  target = modules.Module(module_name="example")
+  a = target.localparam(name="a", dtype=datatypes.IntType(), value=0)
+  b = target.localparam(name="b", dtype=datatypes.IntType(), value=(a + 1) * 2)
+  target.localparam(name="c", dtype=datatypes.IntType(), value=b - (a - 1) - -(b ** 2))
+
+  assert writer.get_text_for(target).splitlines()[3:6] == [
+      "  localparam int a = 0;",
+      "  localparam int b = (a + 1) * 2;",
+      "  localparam int c = b - (a - 1) - -(b ** 2);",
+  ]
+
+
+@pytest.mark.parametrize("direct", [False, True])
+def test_zero_values_are_written(direct):
+  # Values used to be written only when truthy, which dropped "= 0".
+  writer = systemverilog_writer.SystemVerilogWriter(direct=direct)
+  target = modules.Module(module_name="example")
+  target.localparam(name="zero", dtype=datatypes.IntType(), value=0)
+  target.localparam(name="unset", dtype=datatypes.IntType(), value=None)
+
+  assert writer.get_text_for(target).splitlines()[3:5] == [
+      "  localparam int zero = 0;",
+      "  localparam int unset;",
+  ]
+
+
+def _build_example(module):
+  module.localparam(name="p1", dtype=datatypes.IntType(), value=30)
+  module.comment("Lazy")
+
+
+@pytest.mark.parametrize("direct", [False, True])
+def test_lazy_modules_are_populated_when_written(tmp_path, direct):
+  eager = modules.Module(module_name="example")
+  _build_example(eager)
+  writer = systemverilog_writer.SystemVerilogWriter(direct=direct)
+  releasing = systemverilog_writer.SystemVerilogWriter(direct=direct, release=True)
+
+  lazy = modules.Module(module_name="example", builder=_build_example)
+  assert not lazy.populated
+  assert writer.get_text_for(lazy) == writer.get_text_for(eager)
+  assert lazy.populated
+
+  assert releasing.get_text_for(lazy) == writer.get_text_for(eager)
+  assert not lazy.populated
+
+  cached = systemverilog_writer.SystemVerilogWriter(
+      cache=emission_cache.EmissionCache(directory=tmp_path), release=True)
+  assert cached.get_text_for(lazy) == cached.get_text_for(lazy) == writer.get_text_for(eager)
+  assert cached.cache_hits == 1 and not lazy.populated
+
+
+def _build_streamed(module):
+  module.banner("Streamed")
+  a = module.localparam(name="a", dtype=datatypes.IntType(), value=1)
+  group = module.group()
+  group._add_item(comments.Comment("In a group"))
+  b = parameters.LocalParam("b", datatypes.IntType(), a * 2)
+  group._add_named_item("b", b)
+  group._add_item(parameters.LocalParamDeclaration(["b"], b))
+  module.localparams(["c", "d"], datatypes.IntType(), [module.b + 1, 4])
+  module.comment("Last")
+
+
+@pytest.mark.parametrize("direct", [False, True])
+def test_stream(direct):
+  writer = systemverilog_writer.SystemVerilogWriter(direct=direct)
+  eager = modules.Module(module_name="example")
+  _build_streamed(eager)
+
+  output = io.StringIO()
+  with writer.stream("example", output) as streamed:
+    _build_streamed(streamed)
+    # Written items are dropped, while their names can still be used.
+    assert len(streamed.items) == 1
+    assert streamed.d.value == 4
+    with pytest.raises(KeyError):
+      streamed.localparam(name="a", dtype=datatypes.IntType(), value=0)
+
+  assert output.getvalue() == writer.get_text_for(eager)
+
+  output = io.BytesIO()
+  with writer.stream("empty", output):
+    pass
+  assert output.getvalue().decode() == writer.get_text_for(modules.Module(module_name="empty"))
+
+
+def test_stream_rejects_items_added_once_written():
+  writer = systemverilog_writer.SystemVerilogWriter()
+  output = io.StringIO()
+
+  with writer.stream("example", output) as streamed:
+    group = streamed.group()
+    inner = group._add_item(container.Group())
+    inner._add_item(comments.Comment("Written"))
+    streamed.comment("Next")
+    with pytest.raises(ValueError, match="once it is written"):
+      group._add_item(comments.Comment("Late"))
+    with pytest.raises(ValueError, match="once it is written"):
+      inner._add_items([comments.Comment("Late")])
+    with pytest.raises(ValueError, match="once it is written"):
+      group._add_item(container.Group(builder=lambda g: None))
+
+  text = output.getvalue()
+  assert "Written" in text and "Late" not in text
+
+
+def test_failed_stream_flushes_written_items():
+  writer = systemverilog_writer.SystemVerilogWriter()
+  output = io.StringIO()
+
+  with pytest.raises(RuntimeError):
+    with writer.stream("example", output) as streamed:
+      streamed.comment("Written")
+      streamed.comment("Pending")
+      raise RuntimeError
+
+  text = output.getvalue()
+  assert text.startswith("module example(") and text.endswith("Written")
+  assert "Pending" not in text and "endmodule" not in text
@@ -0,0 +1,177 @@
+"""Tests for generating module variants from a parameter grid.
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import pytest
+
+from imp.system_verilog.models import datatypes
+from imp.system_verilog.models import modules
+from imp.system_verilog.models import parameters
+from imp.system_verilog.writers import sweep
+from imp.system_verilog.writers import systemverilog_writer
+
+
+def build(name="mem", depth=4, width=8):
+  m = modules.Module(module_name=name)
+  m.comment("A memory.")
+  d = m.localparam(name="depth", dtype=datatypes.IntType(), value=depth)
+  w = m.localparam(name="width", dtype=datatypes.IntType(), value=width)
+  m.localparam(name="bits", dtype=datatypes.IntType(), value=d * w)
+  m.localparam(name="half", dtype=datatypes.IntType(), value=-(d * w) / 2)
+  m.localparam(name="mask", dtype=datatypes.IntType(), value=255)
+  return m
+
+
+GRID = {"depth": [4, 16, 3], "width": [8, 32, 5]}
+
+
+def test_texts_match_rebuilt_modules():
+  template = build()
+  variants = sweep.ParameterSweep(template, swept=["depth", "width"])
+  writer = systemverilog_writer.SystemVerilogWriter()
+
+  texts = list(variants.texts(GRID, name_format="mem_{depth}x{width}"))
+
+  expected = [
+      (f"mem_{d}x{w}", writer.get_text_for(build(f"mem_{d}x{w}", d, w)))
+      for d, w in zip(GRID["depth"], GRID["width"])
+  ]
+  assert texts == expected
+  assert "localparam int bits = depth * width;" in texts[0][1]
+
+
+def test_folded_parameters_are_written_as_values():
+  variants = sweep.ParameterSweep(build(), swept=["depth", "width"], folded=["bits", "half"])
+
+  texts = [text for _, text in variants.texts(GRID)]
+
+  assert "localparam int bits = 512;" in texts[1]
+  assert "localparam int half = -256;" in texts[1]
+  # SystemVerilog division truncates towards zero.
+  assert "localparam int half = -7;" in texts[2]
+  assert all(text.startswith("module mem(") for text in texts)
+
+
+def test_evaluate():
+  variants = sweep.ParameterSweep(build(), swept=["depth", "width"])
+
+  values = variants.evaluate(GRID)
+
+  assert values["bits"] == [32, 512, 15]
+  assert values["half"] == [-16, -256, -7]
+  assert values["mask"] == 255
+
+
+def test_template_is_restored():
+  template = build()
+  writer = systemverilog_writer.SystemVerilogWriter()
+  before = writer.get_text_for(template)
+
+  variants = sweep.ParameterSweep(template, swept=["depth"], folded=["bits"])
+  list(variants.texts({"depth": [1, 2]}))
+
+  assert writer.get_text_for(template) == before
+  assert template.bits.value == 32
+  template.depth.expression = 5
+  assert template.bits.value == 40
+
+
+def test_template_is_not_modified_while_rendering():
+  template = build()
+
+  class CheckingWriter(systemverilog_writer.SystemVerilogWriter):
+    def get_text_for(self, item):
+      # Other threads may use the template meanwhile.
+      assert template.module_name == "mem" and template.depth.expression == 4
+      return super().get_text_for(item)
+
+  variants = sweep.ParameterSweep(template, swept=["depth"], folded=["bits"], writer=CheckingWriter())
+  assert "localparam int depth = 2;" in dict(variants.texts({"depth": [2]}))["mem"]
+
+
+def test_swept_parameters_are_matched_by_path():
+  template = build()
+  inner = template.block(name="inner")
+  width = parameters.LocalParam("width", datatypes.IntType(), 3)
+  inner._add_named_item("width", width)
+  inner._add_item(parameters.LocalParamDeclaration(["width"], width))
+  variants = sweep.ParameterSweep(template, swept=["depth", "width"])
+
+  values = variants.evaluate(GRID)
+  assert values["width"] == GRID["width"] and values["inner.width"] == 3
+  text = dict(variants.texts(GRID, name_format="mem_{depth}x{width}"))["mem_16x32"]
+  assert "localparam int width = 32;" in text and "localparam int width = 3;" in text
+
+
+def test_invalid_grids():
+  variants = sweep.ParameterSweep(build(), swept=["depth", "width"])
+
+  with pytest.raises(ValueError, match="no values"):
+    variants.evaluate({"depth": [1]})
+  with pytest.raises(ValueError, match="different lengths"):
+    variants.evaluate({"depth": [1], "width": [1, 2]})
+
+
+def test_write(tmp_path):
+  variants = sweep.ParameterSweep(build(), swept=["depth", "width"])
+
+  paths = variants.write(GRID, tmp_path, name_format="mem_{depth}x{width}")
+
+  assert [path.name for path in paths] == ["mem_4x8.sv", "mem_16x32.sv", "mem_3x5.sv"]
+  assert paths[1].read_text().startswith("module mem_16x32(")
+  assert paths[1].read_bytes() == (dict(variants.texts(GRID, "mem_{depth}x{width}"))["mem_16x32"]
+                                   + "\n").encode("utf-8")
+
+  with pytest.raises(ValueError, match="overwrite"):
+    variants.write({"depth": [1, 1], "width": [2, 2]}, tmp_path, name_format="m{depth}")
+
+
+def _build_signed():
+  m = modules.Module(module_name="signed")
+  a = m.localparam(name="a", dtype=datatypes.IntType(), value=1)
+  b = m.localparam(name="b", dtype=datatypes.IntType(), value=1)
+  m.localparam(name="quotient", dtype=datatypes.IntType(), value=a / b)
+  m.localparam(name="remainder", dtype=datatypes.IntType(), value=a % b)
+  m.localparam(name="mixed", dtype=datatypes.IntType(), value=-(a * 7) / b + a % 3)
+  return m
+
+
+SIGNED_GRID = {"a": [7, -7, 7, -7, 0, 9], "b": [2, 2, -2, -2, 3, -4]}
+FOLDED = ["quotient", "remainder", "mixed"]
+
+
+def test_array_grids_match_list_grids():
+  numpy = pytest.importorskip("numpy")
+  variants = sweep.ParameterSweep(_build_signed(), swept=["a", "b"], folded=FOLDED)
+  arrays = {name: numpy.array(values) for name, values in SIGNED_GRID.items()}
+
+  expected = variants.evaluate(SIGNED_GRID)
+  values = variants.evaluate(arrays)
+
+  # SystemVerilog division truncates towards zero, unlike NumPy's.
+  assert expected["quotient"] == [3, -3, -3, 3, 0, -2]
+  assert expected["remainder"] == [1, -1, 1, -1, 0, 1]
+  for name in FOLDED:
+    assert values[name].tolist() == expected[name]
+  assert list(variants.texts(arrays)) == list(variants.texts(SIGNED_GRID))
+
+
+def test_structured_array_grids():
+  numpy = pytest.importorskip("numpy")
+  variants = sweep.ParameterSweep(_build_signed(), swept=["a", "b"], folded=FOLDED)
+  grid = numpy.array(list(zip(*SIGNED_GRID.values())), dtype=[("a", int), ("b", int)])
+
+  assert list(variants.texts(grid)) == list(variants.texts(SIGNED_GRID))
@@ -0,0 +1,132 @@
+"""Tests for the SystemVerilogTokenizer dispatch.
+
+Copyright 2023 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import pytest
+
+from imp.base.models import comments
+from imp.base.models import container
+from imp.base.writers import tokens
+from imp.base.writers.model_tokenizer import tokenizer_for
+from imp.system_verilog.models import datatypes
+from imp.system_verilog.models import modules
+from imp.system_verilog.writers import comments_tokenizer
+from imp.system_verilog.writers import systemverilog_tokenizer
+
+
+@tokenizer_for(comments.Comment)
+def shout_tokenizer(target: comments.Comment, tokenize):
+  yield tokens.Literal(target.txt.upper())
+
+
+def _values(tokenizer, item):
+  return [str(t) for t in tokenizer.tokenize(item)]
+
+
+def test_later_registrations_take_priority():
+  tokenizer = systemverilog_tokenizer.SystemVerilogTokenizer(tokenizer_functions=(
+      comments_tokenizer.banner_tokenizer,
+      comments_tokenizer.comment_tokenizer,
+  ))
+
+  # Comment is registered last, so it also wins for its Banner subclass.
+  assert _values(tokenizer, comments.Banner("b")) == ["//", " ", "b"]
+
+
+def test_register_invalidates_cached_dispatch():
+  tokenizer = systemverilog_tokenizer.SystemVerilogTokenizer()
+  assert _values(tokenizer, comments.Comment("c")) == ["//", " ", "c"]
+
+  tokenizer.register(shout_tokenizer)
+  assert _values(tokenizer, comments.Comment("c")) == ["C"]
+  assert _values(tokenizer, comments.BlockComment("c")) == ["C"]
+
+
+def test_hand_tagged_tokenizers():
+  def whisper_tokenizer(target: comments.Comment, tokenize):
+    yield tokens.Literal(target.txt.lower())
+  # Tagged without the decorator, so without its other attributes.
+  whisper_tokenizer.tokenizer_for = comments.Comment
+
+  for cls in (systemverilog_tokenizer.SystemVerilogTokenizer,
+              systemverilog_tokenizer.IterativeSystemVerilogTokenizer):
+    tokenizer = cls()
+    tokenizer.register(whisper_tokenizer)
+    assert _values(tokenizer, comments.Comment("C")) == ["c"]
+
+
+def test_base_tokens_pass_through():
+  tokenizer = systemverilog_tokenizer.SystemVerilogTokenizer()
+  token = tokens.Identifier("x")
+  assert list(tokenizer.tokenize(token)) == [token]
+
+
+def test_missing_tokenizer():
+  tokenizer = systemverilog_tokenizer.SystemVerilogTokenizer()
+  with pytest.raises(ValueError):
+    list(tokenizer.tokenize(object()))
+
+
+def test_memoized_datatype_tokens():
+  tokenizer = systemverilog_tokenizer.SystemVerilogTokenizer()
+  m = modules.Module(module_name="example")
+  for i in range(10):
+    m.localparam(name=f"p{i}", dtype=datatypes.IntType(), value=i + 1)
+
+  text = [t.value for t in tokenizer.tokenize(m)]
+  assert text.count("int") == 10
+  assert tokenizer.cache_info() == systemverilog_tokenizer.CacheInfo(hits=9, misses=1, currsize=1)
+
+  tokenizer.clear_cache()
+  assert tokenizer.cache_info() == systemverilog_tokenizer.CacheInfo(hits=0, misses=0, currsize=0)
+
+
+def _nested_module(depth):
+  # Built from the innermost block outwards, which is faster for deep nesting.
+  blk = None
+  for i in reversed(range(depth)):
+    outer = container.Block()
+    outer._add_item(comments.Banner(f"level {i}"))
+    outer._add_item(comments.Comment(f"comment {i}"))
+    if blk is not None:
+      outer._add_item(blk)
+    blk = outer
+
+  m = modules.Module(module_name="nested")
+  m.localparam(name="p0", dtype=datatypes.IntType(), value=1)
+  m._add_item(blk)
+  m.comment("done")
+  return m
+
+
+def test_iterative_tokenizer_matches_recursive():
+  m = _nested_module(depth=10)
+  recursive = systemverilog_tokenizer.SystemVerilogTokenizer()
+  iterative = systemverilog_tokenizer.IterativeSystemVerilogTokenizer()
+
+  def values(tokenizer):
+    return [(type(t), t.value) for t in tokenizer.tokenize(m)]
+
+  assert values(iterative) == values(recursive)
+
+
+def test_iterative_tokenizer_deep_hierarchy():
+  m = _nested_module(depth=1200)
+  iterative = systemverilog_tokenizer.IterativeSystemVerilogTokenizer()
+
+  values = [t.value for t in iterative.tokenize(m)]
+  assert values.count("comment 1199") == 1
+  assert values[-2:] == ["endmodule", None]